@@ -0,0 +1,298 @@
+"""
+Parse a directory of PDF resumes into newline-delimited ResumeParsingResponse JSON.
+
+Run from the `resume_parser` directory:
+    python batch.py ./resumes -o parsed.ndjson
+"""
+
+import io
+import os
+import sys
+import logging
+import zipfile
+import argparse
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+from config import Config
+from deadlines import Deadline
+from data_models import ResumeParsingResponse
+from metrics import MetricsRegistry, StageTrace
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+
+def iter_directory(directory_path: str) -> Iterator[tuple[str, bytes]]:
+    """
+    Iterate over the PDF files of a directory, in file name order.
+
+    Args:
+        directory_path (str): The directory holding the PDF files.
+
+    Yields:
+        tuple[str, bytes]: The file name and content of each PDF file.
+    """
+    for file_name in sorted(os.listdir(directory_path)):
+        path = os.path.join(directory_path, file_name)
+        if file_name.lower().endswith(".pdf") and os.path.isfile(path):
+            with open(path, "rb") as f:
+                yield file_name, f.read()
+
+
+class ZipLimitError(Exception):
+    """Raised for a zip archive holding too many files, or decompressing to too many bytes."""
+
+    pass
+
+
+def iter_zip(
+    zip_bytes: bytes,
+    max_files: int = Config.ZIP_MAX_FILES,
+    max_size: int = Config.ZIP_MAX_UNCOMPRESSED_SIZE,
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Iterate over the PDF files of a zip archive, in archive order.
+
+    Args:
+        zip_bytes (bytes): The content of the zip archive.
+        max_files (int, optional): Maximum number of PDF files in the archive.
+        max_size (int, optional): Maximum size of the decompressed PDF files, in bytes.
+
+    Yields:
+        tuple[str, bytes]: The file name and content of each PDF file.
+
+    Raises:
+        ZipLimitError: If the archive exceeds `max_files` or `max_size`.
+    """
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as archive:
+        members = [
+            member
+            for member in archive.infolist()
+            if not member.is_dir() and member.filename.lower().endswith(".pdf")
+        ]
+        if len(members) > max_files:
+            raise ZipLimitError(
+                f"The zip archive holds {len(members)} PDF files, more than {max_files}"
+            )
+
+        # the sizes declared by the archive may be forged, the reads are bounded too
+        remaining_size = max_size
+        if sum(member.file_size for member in members) > remaining_size:
+            raise ZipLimitError(
+                f"The zip archive decompresses to more than {max_size} bytes"
+            )
+        for member in members:
+            with archive.open(member) as f:
+                content = f.read(remaining_size + 1)
+            if len(content) > remaining_size:
+                raise ZipLimitError(
+                    f"The zip archive decompresses to more than {max_size} bytes"
+                )
+            remaining_size -= len(content)
+            yield member.filename, content
+
+
+class BatchParser:
+    """
+    Parse many resumes with pipelined stages.
+
+    Results cache lookups and PDF text extraction run in a thread pool, up to
+    `prefetch` documents ahead, while the calling thread runs the segmentation and
+    model-backed parsers (ONNX Runtime releases the GIL during inference). Cached
+    resumes are not parsed again. Results keep the input order.
+
+    The headlines of the parsed document and of the documents already extracted
+    after it are run through the NER model together, `headline_batch` at most.
+
+    Each document is parsed within `Config.PARSING_DEADLINE`, counted from the start of
+    its parsing, as its extraction ran ahead in the background. A headlines batch runs
+    within the headline stage budget of the parsed document, and is discarded if it
+    runs out of time, each resume then parsing its own headline in its own budget.
+
+    Attributes:
+        resume_parser (ResumeParser): The resume parsing pipeline.
+        extraction_workers (int): Number of threads extracting PDF text.
+        prefetch (int): Maximum number of documents extracted ahead of the parsed one.
+        metrics (MetricsRegistry | None): Registry the parsing timings are added to.
+        headline_batch (int): Maximum number of headlines recognized in a single NER batch.
+    """
+
+    def __init__(
+        self,
+        resume_parser,
+        extraction_workers: int = Config.BATCH_EXTRACTION_WORKERS,
+        prefetch: int = Config.BATCH_PREFETCH,
+        metrics: MetricsRegistry | None = None,
+        headline_batch: int = Config.BATCH_HEADLINES,
+    ):
+        self.resume_parser = resume_parser
+        self.extraction_workers = extraction_workers
+        self.prefetch = prefetch
+        self.metrics = metrics
+        self.headline_batch = headline_batch
+
+    def _extract(self, pdf_bytes: bytes, file_name: str, trace: StageTrace) -> tuple:
+        # the cached response, or the extracted document to parse
+        _, cache_key, response = self.resume_parser.lookup_result(
+            pdf_bytes, file_name, trace
+        )
+        if response is not None:
+            return cache_key, response, None
+        cuts = []
+        lines, language = self.resume_parser.extract_document(pdf_bytes, trace, cuts)
+        return cache_key, None, (lines, language, cuts)
+
+    def _parse_headlines(
+        self, pending: deque, headlines: dict, deadline: Deadline
+    ) -> None:
+        # the next document, and the following ones already extracted without error
+        _, trace, next_document = pending[0]
+        documents = [next_document] + [
+            document
+            for _, _, document in list(pending)[1:]
+            if document.done()
+            and document.exception() is None
+            and document.result()[1] is None
+            and document not in headlines
+        ]
+        documents = documents[: self.headline_batch]
+
+        headline_deadline = deadline.sub(dict(Config.STAGE_DEADLINES).get("headline"))
+        try:
+            with trace.stage("headline"):
+                parsed_headlines = self.resume_parser.parse_headlines(
+                    [document.result()[2][0] for document in documents],
+                    deadline=headline_deadline,
+                )
+        except Exception as e:
+            # each resume parses its own headline, or reports its failure
+            logging.error(f"Batched headlines parsing failed : {e}")
+            return
+        if headline_deadline.exceeded:
+            # some headlines were cut, each resume parses its own in its own budget
+            logging.warning(f"Batch of {len(documents)} headlines ran out of time")
+            return
+        headlines.update(zip(documents, parsed_headlines))
+
+    def _parse(
+        self, pending: deque, headlines: dict
+    ) -> tuple[ResumeParsingResponse, StageTrace]:
+        file_name, trace, document = pending[0]
+        cache_key, response, extracted = document.result()
+        if response is None:
+            deadline = Deadline(Config.PARSING_DEADLINE)
+            if document not in headlines:
+                self._parse_headlines(pending, headlines, deadline)
+            lines, language, cuts = extracted
+            response = self.resume_parser.store_result(
+                cache_key,
+                self.resume_parser.parse_resume(
+                    lines,
+                    file_name=file_name,
+                    trace=trace,
+                    deadline=deadline,
+                    language=language,
+                    headline=headlines.pop(document, None),
+                    cuts=cuts,
+                ),
+            )
+        pending.popleft()
+        if self.metrics is not None:
+            self.metrics.observe(trace)
+        return response, trace
+
+    def parse(
+        self, documents: Iterable[tuple[str, bytes]]
+    ) -> Iterator[ResumeParsingResponse]:
+        """
+        Parse documents, yielding each response as soon as it is ready.
+
+        Args:
+            documents (Iterable[tuple[str, bytes]]): File names and PDF contents.
+
+        Yields:
+            ResumeParsingResponse: The parsed resumes, in input order.
+        """
+        for response, _ in self.parse_traced(documents):
+            yield response
+
+    def parse_traced(
+        self, documents: Iterable[tuple[str, bytes]]
+    ) -> Iterator[tuple[ResumeParsingResponse, StageTrace]]:
+        """
+        Parse documents, yielding each response and its StageTrace as soon as it is ready.
+
+        Args:
+            documents (Iterable[tuple[str, bytes]]): File names and PDF contents.
+
+        Yields:
+            tuple[ResumeParsingResponse, StageTrace]: The parsed resumes and their traces,
+                in input order.
+        """
+        with ThreadPoolExecutor(max_workers=self.extraction_workers) as executor:
+            pending, headlines = deque(), {}
+            for file_name, pdf_bytes in documents:
+                trace = StageTrace()
+                pending.append(
+                    (
+                        file_name,
+                        trace,
+                        executor.submit(self._extract, pdf_bytes, file_name, trace),
+                    )
+                )
+                if len(pending) > self.prefetch:
+                    yield self._parse(pending, headlines)
+
+            while pending:
+                yield self._parse(pending, headlines)
+
+    def parse_ndjson(self, documents: Iterable[tuple[str, bytes]]) -> Iterator[str]:
+        """
+        Parse documents into newline-delimited JSON.
+
+        Args:
+            documents (Iterable[tuple[str, bytes]]): File names and PDF contents.
+
+        Yields:
+            str: One ResumeParsingResponse JSON line per document.
+        """
+        for response in self.parse(documents):
+            yield response.json() + "\n"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("input_directory", help="directory of PDF resumes")
+    arg_parser.add_argument(
+        "-o", "--output", help="output NDJSON file, defaults to stdout"
+    )
+    arg_parser.add_argument(
+        "--extraction-workers", type=int, default=Config.BATCH_EXTRACTION_WORKERS
+    )
+    arg_parser.add_argument("--prefetch", type=int, default=Config.BATCH_PREFETCH)
+    args = arg_parser.parse_args()
+
+    from models import Models
+    from pipeline import ResumeParser
+
+    batch_parser = BatchParser(
+        ResumeParser(Models()),
+        extraction_workers=args.extraction_workers,
+        prefetch=args.prefetch,
+    )
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for line in batch_parser.parse_ndjson(iter_directory(args.input_directory)):
+            output.write(line)
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
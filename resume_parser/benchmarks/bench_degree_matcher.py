@@ -0,0 +1,76 @@
+"""
+Compare the per-line cost of degree matching before and after precompiling the abbreviations.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_degree_matcher
+"""
+
+import re
+import argparse
+
+from config import Config
+from utils import read_csv_list
+from matchers import compile_degrees_pattern
+from benchmarks.common import sample_lines, time_calls, report
+
+
+def parse_degree_name_rebuilt(txt_line, degree_abbreviations):
+    # previous implementation, rebuilding the alternation for every line
+    abbreviations_pattern = "|".join(
+        re.escape(abbreviation) for abbreviation in degree_abbreviations
+    )
+    return (
+        abbreviations[0]
+        if (abbreviations := re.findall(abbreviations_pattern, txt_line))
+        else ""
+    )
+
+
+def parse_degree_name_precompiled(txt_line, degrees_pattern):
+    return match.group() if (match := degrees_pattern.search(txt_line)) else ""
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--lines", type=int, default=2000)
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    degrees = read_csv_list(Config.DEGREES_ABBREVIATIONS_CSV)
+    lines = sample_lines(args.lines)
+
+    stats = time_calls(
+        lambda: [parse_degree_name_rebuilt(line, degrees) for line in lines],
+        repeat=args.repeat,
+    )
+    report(
+        "degree_matcher_rebuilt",
+        {
+            "lines": args.lines,
+            "us_per_line": stats["mean_ms"] * 1000 / args.lines,
+            **stats,
+        },
+    )
+
+    stats = time_calls(lambda: compile_degrees_pattern(degrees), repeat=args.repeat)
+    report("degree_matcher_compile_once", stats)
+
+    degrees_pattern = compile_degrees_pattern(degrees)
+    stats = time_calls(
+        lambda: [
+            parse_degree_name_precompiled(line, degrees_pattern) for line in lines
+        ],
+        repeat=args.repeat,
+    )
+    report(
+        "degree_matcher_precompiled",
+        {
+            "lines": args.lines,
+            "us_per_line": stats["mean_ms"] * 1000 / args.lines,
+            **stats,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the headline NER over whole texts, as when the segmenter finds no header and the
+headline is most of the document, with the bounded and windowed NER, resume by resume
+and batched across resumes.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_headline_ner
+"""
+
+import argparse
+
+from config import Config
+from models import Models
+from parsers import Parsers
+from segmenter import SegmentMap, line_starts_of
+from benchmarks.common import time_calls, report
+from benchmarks.corpus import generate_corpus
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--per-variant", type=int, default=2)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    models, parsers = Models(), Parsers()
+    resumes = generate_corpus(per_variant=args.per_variant)
+    # the whole resume as headline, as when no section header is found
+    whole_texts = [" ".join(resume.lines) for resume in resumes]
+    headlines = [
+        SegmentMap(
+            text, {"headline": (0, len(text))}, line_starts_of(resume.lines)
+        ).head("headline", Config.HEADLINE_MAX_LINES)
+        for text, resume in zip(whole_texts, resumes)
+    ]
+
+    cases = {
+        "whole_text": lambda: [
+            models.ner_pipeline(text, aggregation_strategy="simple")
+            for text in whole_texts
+        ],
+        "windowed": lambda: [
+            parsers.parse_headline(headline, models.ner_pipeline)
+            for headline in headlines
+        ],
+        "windowed_batched": lambda: parsers.parse_headlines(
+            headlines, models.ner_pipeline
+        ),
+    }
+    for name, function in cases.items():
+        stats = time_calls(function, repeat=args.repeat)
+        report(
+            f"headline_ner_{name}",
+            {
+                "resumes": len(resumes),
+                "mean_chars": sum(map(len, whole_texts)) / len(resumes),
+                "ms_per_resume": stats["mean_ms"] / len(resumes),
+                **stats,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the time and peak memory of splitting a document into normalized lines, with the
+previous implementation rewriting the whole text before splitting it, and with the single
+pass generator.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_line_normalization
+"""
+
+import re
+import argparse
+import tracemalloc
+
+from utils import normalize_string, iter_normalized_lines
+from benchmarks.common import time_calls, report
+from benchmarks.corpus import generate_corpus
+
+# pdftotext output details the corpus lacks: accents, tabs, CRLF and form feeds
+EXTRA_LINES: tuple[str] = (
+    "Ingénieur Développement\tSociété Générale\r",
+    "Université Paris-Saclay, Orsay\r",
+    "München, Deutschland\x0c",
+    "\tCompétences : Python, Go, Kafka\r",
+)
+
+
+def clean_lines_rewritten(text, min_line_length=2):
+    # previous implementation, copying the text once per rewrite
+    text = re.sub(r"\n+", "\n", text)
+    text = text.replace("\r", "\n")
+    text = text.replace("\t", " ")
+    lines = text.splitlines(True)
+    return [
+        cleaned_line
+        for line in lines
+        if len(cleaned_line := normalize_string(line)) > min_line_length
+    ]
+
+
+def peak_memory_kib(function) -> float:
+    """Peak memory allocated by a call, in KiB."""
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--copies", type=int, default=50)
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    lines = [line for resume in generate_corpus() for line in resume.lines]
+    text = "\n".join([*lines, *EXTRA_LINES] * args.copies)
+
+    assert clean_lines_rewritten(text) == list(
+        iter_normalized_lines(text, mode="ascii")
+    )
+
+    implementations = {
+        "rewritten": lambda: clean_lines_rewritten(text),
+        "single_pass": lambda: list(iter_normalized_lines(text, mode="ascii")),
+        # consumed line by line, as a stream of pages would be
+        "single_pass_streamed": lambda: sum(
+            1 for _ in iter_normalized_lines(text, mode="ascii")
+        ),
+    }
+    for name, function in implementations.items():
+        stats = time_calls(function, repeat=args.repeat)
+        report(
+            f"line_normalization_{name}",
+            {
+                "text_kib": len(text) / 1024,
+                "peak_kib": peak_memory_kib(function),
+                **stats,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
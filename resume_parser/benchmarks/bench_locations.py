@@ -0,0 +1,83 @@
+"""
+Compare the gazetteer location resolver with locationtagger, on accuracy and speed.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_locations
+"""
+
+import argparse
+
+from lookups import get_gazetteer
+from benchmarks.common import time_calls, report
+
+# (text, expected cities, expected countries), as found around experience and education dates
+LOCATION_FIXTURES: tuple[tuple[str, set[str], set[str]]] = (
+    ("Paris, France", {"Paris"}, {"France"}),
+    ("Software Engineer at Google, Mountain View, CA", {"Mountain View"}, set()),
+    ("London, United Kingdom", {"London"}, {"United Kingdom"}),
+    ("Ecole Polytechnique, Palaiseau", {"Palaiseau"}, set()),
+    ("University of California, Berkeley", {"Berkeley"}, set()),
+    ("New York, USA", {"New York"}, {"United States"}),
+    ("Berlin, Germany", {"Berlin"}, {"Germany"}),
+    ("Senior Data Scientist", set(), set()),
+    ("Capgemini Technology Services", set(), set()),
+    ("Lyon - Auvergne-Rhone-Alpes, France", {"Lyon"}, {"France"}),
+    ("Toronto, Ontario, Canada", {"Toronto"}, {"Canada"}),
+    ("Amazon Web Services, Seattle, WA", {"Seattle"}, set()),
+    ("Madrid, Spain", {"Madrid"}, {"Spain"}),
+    ("Led a team of 5 engineers on the search relevance project", set(), set()),
+    ("Master of Science in Computer Science, Boston", {"Boston"}, set()),
+    ("Bangalore, India", {"Bangalore"}, {"India"}),
+    ("Tokyo, Japan", {"Tokyo"}, {"Japan"}),
+    ("Machine Learning Engineer - Intern", set(), set()),
+)
+
+
+def score(resolver, fixtures=LOCATION_FIXTURES) -> dict[str, float]:
+    true_positives, predicted, expected = 0, 0, 0
+    for text, cities, countries in fixtures:
+        locations = resolver(text)
+        found = set(locations.cities) | set(locations.countries)
+        wanted = cities | countries
+        true_positives += len(found & wanted)
+        predicted += len(found)
+        expected += len(wanted)
+
+    precision = true_positives / predicted if predicted else 0.0
+    recall = true_positives / expected if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    resolvers = {"gazetteer": get_gazetteer().find_locations}
+    try:
+        import locationtagger
+
+        resolvers["locationtagger"] = lambda text: locationtagger.find_locations(
+            text=text
+        )
+    except ImportError:
+        print("locationtagger is not installed, skipping it")
+
+    for name, resolver in resolvers.items():
+        stats = time_calls(
+            lambda: [resolver(text) for text, _, _ in LOCATION_FIXTURES],
+            repeat=args.repeat,
+        )
+        report(
+            f"locations_{name}",
+            {
+                **score(resolver),
+                "ms_per_text": stats["mean_ms"] / len(LOCATION_FIXTURES),
+                **stats,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare per-line and batched zero-shot classification on the bundled quantized NLI model.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_nli_batching --lines 10 40 --batch-sizes 8 16 32
+"""
+
+import argparse
+
+from config import Config
+from models import Models
+from classifier import classify_lines
+from benchmarks.common import sample_lines, time_calls, report
+
+
+def classify_per_line(lines, candidate_labels, zero_shot_classifier):
+    classifications = {}
+    for line in lines:
+        classification = zero_shot_classifier(line, candidate_labels)
+        classifications[line] = (
+            classification["labels"][0],
+            classification["scores"][0],
+        )
+    return classifications
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--lines", type=int, nargs="+", default=[10, 40])
+    arg_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 16, 32])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    zero_shot_classifier = Models().zero_shot_classifier_pipeline
+    candidate_labels = Config.EMPLOYMENT_NLI_CLASSES
+
+    for count in args.lines:
+        lines = sample_lines(count)
+
+        stats = time_calls(
+            lambda: classify_per_line(lines, candidate_labels, zero_shot_classifier),
+            repeat=args.repeat,
+        )
+        report(
+            "nli_per_line",
+            {
+                "lines": count,
+                "lines_per_s": count / (stats["mean_ms"] / 1000),
+                **stats,
+            },
+        )
+
+        for batch_size in args.batch_sizes:
+            stats = time_calls(
+                lambda: classify_lines(
+                    lines, candidate_labels, zero_shot_classifier, batch_size
+                ),
+                repeat=args.repeat,
+            )
+            report(
+                "nli_batched",
+                {
+                    "lines": count,
+                    "batch_size": batch_size,
+                    "lines_per_s": count / (stats["mean_ms"] / 1000),
+                    **stats,
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
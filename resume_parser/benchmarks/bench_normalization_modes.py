@@ -0,0 +1,85 @@
+"""
+Compare the per-line cost and the text kept by the normalization modes, against the
+previous ASCII only `normalize_string`, on English, accented Latin, Cyrillic and CJK lines.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_normalization_modes
+"""
+
+import time
+import argparse
+
+from utils import NORMALIZERS, get_transliteration_table
+from benchmarks.common import sample_lines, time_calls, report
+
+# resume lines of other languages, the English ones come from sample_lines
+FOREIGN_LINES: dict[str, tuple[str]] = {
+    "latin": (
+        "Łukasz Kowalski, Inżynier oprogramowania",
+        "Zoë Müller, Straße 12, München",
+        "Ingénieur d’études – Société Générale",
+        "Ørsted A/S, København",
+    ),
+    "cyrillic": (
+        "Иван Петров, инженер-программист",
+        "Яндекс, Москва, 2019 – 2023",
+    ),
+    "cjk": (
+        "王小明 软件工程师",
+        "北京大学 计算机科学 硕士 2015 - 2018",
+    ),
+}
+
+
+def kept_ratio(lines: list[str], normalized: list[str]) -> float:
+    """The share of the non-space characters kept by a normalization."""
+    total = sum(len("".join(line.split())) for line in lines)
+    return sum(len("".join(line.split())) for line in normalized) / total
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--lines", type=int, default=2000)
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    for keep_scripts in (False, True):
+        start = time.perf_counter()
+        table = get_transliteration_table(keep_scripts=keep_scripts)
+        report(
+            "normalization_table",
+            {
+                "keep_scripts": keep_scripts,
+                "entries": len(table),
+                "build_ms": (time.perf_counter() - start) * 1000,
+            },
+        )
+
+    line_sets = {
+        "english": sample_lines(args.lines),
+        **{
+            script: [lines[i % len(lines)] for i in range(args.lines)]
+            for script, lines in FOREIGN_LINES.items()
+        },
+    }
+    for script, lines in line_sets.items():
+        for mode, normalizer in NORMALIZERS.items():
+            normalized = [normalizer(line) for line in lines]
+            stats = time_calls(
+                lambda: [normalizer(line) for line in lines], repeat=args.repeat
+            )
+            report(
+                f"normalization_{mode}",
+                {
+                    "script": script,
+                    "lines": args.lines,
+                    "us_per_line": stats["mean_ms"] * 1000 / args.lines,
+                    "kept_ratio": kept_ratio(lines, normalized),
+                    "empty_lines": sum(not line for line in normalized),
+                    **stats,
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare ONNX Runtime session settings on the bundled quantized NLI and NER models.
+
+Each setting loads the models anew (without the optimized graph cache), then
+reports the loading time, and the latency and throughput of both models.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_onnx_settings --levels basic extended all --threads 1 4
+"""
+
+import time
+import argparse
+import itertools
+
+from config import Config
+from models import Models, GRAPH_OPTIMIZATION_LEVELS, EXECUTION_MODES
+from classifier import classify_lines
+from benchmarks.common import SAMPLE_RESUME_LINES, sample_lines, time_calls, report
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--levels",
+        nargs="+",
+        choices=list(GRAPH_OPTIMIZATION_LEVELS),
+        default=list(GRAPH_OPTIMIZATION_LEVELS),
+    )
+    arg_parser.add_argument(
+        "--execution-modes",
+        nargs="+",
+        choices=list(EXECUTION_MODES),
+        default=[Config.ORT_EXECUTION_MODE],
+    )
+    arg_parser.add_argument(
+        "--threads", type=int, nargs="+", default=[Config.ORT_INTRA_OP_NUM_THREADS]
+    )
+    arg_parser.add_argument("--mem-arena", choices=["on", "off", "both"], default="on")
+    arg_parser.add_argument("--lines", type=int, default=32)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    mem_arenas = {"on": [True], "off": [False], "both": [True, False]}[args.mem_arena]
+    lines = sample_lines(args.lines)
+    headlines = [" ".join(SAMPLE_RESUME_LINES[:4])] * args.lines
+
+    for level, execution_mode, threads, mem_arena in itertools.product(
+        args.levels, args.execution_modes, args.threads, mem_arenas
+    ):
+        setting = {
+            "graph_optimization_level": level,
+            "execution_mode": execution_mode,
+            "intra_op_num_threads": threads,
+            "enable_cpu_mem_arena": mem_arena,
+        }
+        start = time.perf_counter()
+        models = Models(
+            intra_op_num_threads=threads,
+            graph_optimization_level=level,
+            execution_mode=execution_mode,
+            enable_cpu_mem_arena=mem_arena,
+            cache_optimized_model=False,
+        )
+        load_ms = (time.perf_counter() - start) * 1000
+        # bypass the NLI results cache, to time the model itself
+        zero_shot_classifier = getattr(
+            models.zero_shot_classifier_pipeline,
+            "zero_shot_classifier",
+            models.zero_shot_classifier_pipeline,
+        )
+
+        stats = time_calls(
+            lambda: classify_lines(
+                lines, Config.EMPLOYMENT_NLI_CLASSES, zero_shot_classifier
+            ),
+            repeat=args.repeat,
+        )
+        report(
+            "onnx_settings_nli",
+            {
+                **setting,
+                "load_ms": load_ms,
+                "lines": args.lines,
+                "lines_per_s": args.lines / (stats["mean_ms"] / 1000),
+                **stats,
+            },
+        )
+
+        stats = time_calls(lambda: models.ner_pipeline(headlines), repeat=args.repeat)
+        report(
+            "onnx_settings_ner",
+            {
+                **setting,
+                "load_ms": load_ms,
+                "texts": len(headlines),
+                "texts_per_s": len(headlines) / (stats["mean_ms"] / 1000),
+                **stats,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Benchmark the full parsing pipeline and each parser, on the synthetic resume corpus
+and the bundled quantized models, offline.
+
+Reports throughput, latency percentiles and peak memory for every benchmark and resume
+size, as JSON lines, and optionally as a JSON file to compare with another commit's
+results. Each benchmark and size runs in a fresh process, so that its peak resident memory,
+models, ONNX Runtime and pdftotext included, is its own.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.bench_suite --output results.json
+    python -m benchmarks.bench_suite --output new.json --compare results.json
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+from dataclasses import dataclass
+
+from config import Config
+from headers import Headers
+from segmenter import SegmentMap
+from benchmarks.common import latency_stats, report
+from benchmarks.corpus import SIZES, LAYOUTS, generate_corpus, text_to_pdf
+
+
+@dataclass
+class Document:
+    """A corpus resume, with the inputs of every benchmarked function."""
+
+    name: str
+    size: str
+    pdf: bytes
+    lines: list[str]
+    full_text: str
+    segments: SegmentMap
+
+
+# Benchmarks of build_cases, listed without loading the models
+CASES: tuple[str] = (
+    "pipeline_pdf",
+    "pipeline_lines",
+    "extract_lines",
+    "segmenter",
+    "parse_skills",
+    "parse_contact_data",
+    "parse_headline",
+    "parse_personal_data",
+    "parse_languages",
+    "parse_dates",
+    "parse_location",
+    "parse_education_and_trainings",
+    "parse_work_experience",
+    "parse_with_fallback",
+)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far, in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def peak_traced_memory_mb(function, documents: list[Document]) -> float:
+    """
+    Largest Python allocations peak of a single call over documents, above the memory
+    allocated before the call, in megabytes.
+
+    Measured with tracemalloc, in a pass of its own as tracing slows the calls down. Only
+    Python allocations are traced, not those of ONNX Runtime, the tokenizers or pdftotext:
+    see peak_rss_mb for those.
+    """
+    peak = 0
+    tracemalloc.start()
+    try:
+        for doc in documents:
+            allocated = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function(doc)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - allocated)
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def build_cases(resume_parser) -> dict:
+    """Map each benchmark name to a function parsing a Document."""
+    parsers, models = resume_parser.parsers, resume_parser.models
+    zero_shot_classifier = models.zero_shot_classifier_pipeline
+
+    return {
+        "pipeline_pdf": lambda doc: resume_parser.parse_pdf(doc.pdf),
+        "pipeline_lines": lambda doc: resume_parser.parse_resume(doc.lines),
+        "extract_lines": lambda doc: resume_parser.extract_lines(doc.pdf),
+        "segmenter": lambda doc: resume_parser.segmenter.segment_lines(doc.lines),
+        "parse_skills": lambda doc: parsers.parse_skills(
+            doc.segments.get("skills", "")
+        ),
+        "parse_contact_data": lambda doc: parsers.parse_contact_data(
+            doc.segments.get("headline", "")
+        ),
+        "parse_headline": lambda doc: parsers.parse_headline(
+            doc.segments.head("headline", Config.HEADLINE_MAX_LINES),
+            models.ner_pipeline,
+        ),
+        "parse_personal_data": lambda doc: parsers.parse_personal_data(doc.lines[0]),
+        "parse_languages": lambda doc: parsers.parse_languages(doc.full_text),
+        "parse_dates": lambda doc: parsers.parse_dates(doc.lines),
+        "parse_location": lambda doc: [
+            parsers.parse_location(line) for line in doc.lines[:20]
+        ],
+        "parse_education_and_trainings": lambda doc: parsers.parse_education_and_trainings(
+            doc.lines, doc.segments.segment("education"), zero_shot_classifier
+        ),
+        "parse_work_experience": lambda doc: parsers.parse_work_experience(
+            doc.lines, doc.segments.segment("experience"), zero_shot_classifier
+        ),
+        "parse_with_fallback": lambda doc: parsers.parse_with_fallback(
+            parsers.parse_work_experience,
+            doc.lines,
+            doc.segments.segment("experience"),
+            doc.segments.segment(Headers.DEFAULT_SEGMENT),
+            zero_shot_classifier,
+        ),
+    }
+
+
+def run_case(function, documents: list[Document], repeat: int) -> dict:
+    """
+    Time a benchmark over documents, after one untimed warmup pass.
+
+    Returns:
+        dict: Throughput, latency statistics, the peak resident memory of the process and
+            the peak Python allocations of a call.
+    """
+    for doc in documents:
+        function(doc)
+
+    timings = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for doc in documents:
+            call_start = time.perf_counter()
+            function(doc)
+            timings.append((time.perf_counter() - call_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "docs": len(documents),
+        "docs_per_s": len(timings) / elapsed,
+        **latency_stats(timings),
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_traced_mb": peak_traced_memory_mb(function, documents),
+    }
+
+
+def compare(results: list[dict], baseline: list[dict]) -> None:
+    """Print the p50 latency and throughput changes from a baseline."""
+    baseline = {(r["benchmark"], r["size"]): r for r in baseline if "p50_ms" in r}
+    for result in results:
+        if (old := baseline.get((result["benchmark"], result["size"]))) is None:
+            continue
+        report(
+            "compare",
+            {
+                "case": result["benchmark"],
+                "size": result["size"],
+                "p50_ms_change": result["p50_ms"] / old["p50_ms"] - 1,
+                "docs_per_s_change": result["docs_per_s"] / old["docs_per_s"] - 1,
+            },
+        )
+
+
+def run_in_process(args: argparse.Namespace) -> list[dict]:
+    """
+    Load the models, build the corpus and run the selected benchmarks in this process.
+
+    Returns:
+        list[dict]: The results of each benchmark and size.
+    """
+    if not args.nli_cache:
+        Config.NLI_CACHE_SIZE = 0
+    if not args.result_cache:
+        Config.RESULT_CACHE_BACKEND = None
+
+    from models import Models
+    from pipeline import ResumeParser
+
+    resume_parser = ResumeParser(Models())
+    cases = build_cases(resume_parser)
+
+    documents_by_size = {}
+    for resume in generate_corpus(
+        args.seed, args.per_variant, tuple(args.sizes), tuple(args.layouts)
+    ):
+        pdf = text_to_pdf(resume.lines)
+        lines = resume_parser.extract_lines(pdf)
+        segments = resume_parser.segmenter.segment_lines(lines)
+        documents_by_size.setdefault(resume.size, []).append(
+            Document(resume.name, resume.size, pdf, lines, segments.text, segments)
+        )
+    setup_rss_mb = peak_rss_mb()
+
+    results = []
+    for name, function in cases.items():
+        if args.cases and name not in args.cases:
+            continue
+        for size, documents in documents_by_size.items():
+            result = {
+                "benchmark": name,
+                "size": size,
+                **run_case(function, documents, args.repeat),
+                "setup_rss_mb": setup_rss_mb,
+            }
+            report(name, result)
+            results.append(result)
+    return results
+
+
+def run_in_subprocess(args: argparse.Namespace, name: str, size: str) -> dict:
+    """
+    Run a benchmark on a resume size in a fresh Python process.
+
+    Returns:
+        dict: The benchmark result, with the peak resident memory of its process.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        output = f"{directory}/result.json"
+        # fmt: off
+        command = [
+            sys.executable, "-m", "benchmarks.bench_suite", "--in-process",
+            "--seed", str(args.seed), "--per-variant", str(args.per_variant),
+            "--sizes", size, "--layouts", *args.layouts, "--cases", name,
+            "--repeat", str(args.repeat), "--output", output,
+        ]
+        # fmt: on
+        if args.nli_cache:
+            command.append("--nli-cache")
+        if args.result_cache:
+            command.append("--result-cache")
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        with open(output) as f:
+            return json.load(f)["results"][0]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--per-variant", type=int, default=3)
+    arg_parser.add_argument(
+        "--sizes", nargs="+", choices=list(SIZES), default=list(SIZES)
+    )
+    arg_parser.add_argument(
+        "--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS)
+    )
+    arg_parser.add_argument(
+        "--cases", nargs="+", help="benchmarks to run, all by default"
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument(
+        "--nli-cache",
+        action="store_true",
+        help="keep the NLI results cache, which makes repeated runs hit it",
+    )
+    arg_parser.add_argument(
+        "--result-cache",
+        action="store_true",
+        help="keep the parsed resumes cache, which makes repeated PDF parsing hit it",
+    )
+    arg_parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="run all benchmarks in this process, where peak_rss_mb only grows",
+    )
+    arg_parser.add_argument("-o", "--output", help="JSON file of the results")
+    arg_parser.add_argument("--compare", help="JSON results of a previous run")
+    args = arg_parser.parse_args()
+
+    unknown_cases = set(args.cases or []) - set(CASES)
+    if unknown_cases:
+        arg_parser.error(f"unknown benchmarks {sorted(unknown_cases)}")
+
+    if args.in_process:
+        results = run_in_process(args)
+    else:
+        results = []
+        for name in args.cases or CASES:
+            for size in args.sizes:
+                result = run_in_subprocess(args, name, size)
+                report(name, result)
+                results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "meta": {
+                        "commit": git_commit(),
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "seed": args.seed,
+                        "per_variant": args.per_variant,
+                        "layouts": args.layouts,
+                        "repeat": args.repeat,
+                        "nli_cache": args.nli_cache,
+                        "result_cache": args.result_cache,
+                        "in_process": args.in_process,
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
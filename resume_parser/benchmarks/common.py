@@ -0,0 +1,93 @@
+import json
+import time
+import statistics
+
+# Lines typically found around experience and education dates
+SAMPLE_RESUME_LINES: tuple[str] = (
+    "Software Engineer",
+    "Google, Mountain View, CA",
+    "Paris, France",
+    "Senior Data Scientist",
+    "Capgemini Technology Services",
+    "University of California, Berkeley",
+    "Master of Science in Computer Science",
+    "Developed REST APIs in Python and Go for the billing platform",
+    "Led a team of 5 engineers on the search relevance project",
+    "Ecole Polytechnique, Palaiseau",
+    "Bachelor of Engineering, Mechanical Engineering",
+    "Machine Learning Engineer - Intern",
+    "London, United Kingdom",
+    "Amazon Web Services",
+    "Built data pipelines with Spark and Airflow",
+    "Lycee Henri IV",
+)
+
+
+def sample_lines(count: int) -> list[str]:
+    """
+    Build a deterministic list of resume-like lines of a given size.
+
+    Args:
+        count (int): The number of lines to generate.
+
+    Returns:
+        list[str]: Lines cycling over SAMPLE_RESUME_LINES, suffixed to stay unique.
+    """
+    return [
+        f"{SAMPLE_RESUME_LINES[i % len(SAMPLE_RESUME_LINES)]} ({i})"
+        for i in range(count)
+    ]
+
+
+def time_calls(function, repeat: int = 5, warmup: int = 1) -> dict[str, float]:
+    """
+    Time repeated calls of a function.
+
+    Args:
+        function (Callable): A function without arguments.
+        repeat (int, optional): Number of timed calls. Defaults to 5.
+        warmup (int, optional): Number of untimed calls made first. Defaults to 1.
+
+    Returns:
+        dict[str, float]: Latency statistics in milliseconds.
+    """
+    for _ in range(warmup):
+        function()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return latency_stats(timings)
+
+
+def latency_stats(timings: list[float]) -> dict[str, float]:
+    """
+    Summarize latencies expressed in milliseconds.
+
+    Args:
+        timings (list[float]): The measured latencies.
+
+    Returns:
+        dict[str, float]: Mean, p50, p95, p99 and max latencies.
+    """
+    ordered = sorted(timings)
+
+    def percentile(q):
+        return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+    return {
+        "runs": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1],
+    }
+
+
+def report(name: str, results: dict) -> None:
+    """Print benchmark results as a single JSON line."""
+    print(json.dumps({"benchmark": name, **results}, sort_keys=True))
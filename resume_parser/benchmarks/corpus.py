@@ -0,0 +1,370 @@
+"""
+A deterministic corpus of synthetic resumes, as text and as PDF files.
+
+Write it to a directory, e.g. to feed `batch.py`, from the `resume_parser` directory:
+    python -m benchmarks.corpus ./synthetic_resumes --per-variant 5
+"""
+
+import os
+import random
+import argparse
+from dataclasses import dataclass, field
+
+# fmt: off
+FIRST_NAMES: tuple[str] = (
+    "John", "Emma", "Lucas", "Sofia", "Omar", "Mei", "Hugo", "Chloe", "Ravi",
+    "Anna", "Pierre", "Laura", "David", "Fatima", "Kenji", "Elena",
+)
+LAST_NAMES: tuple[str] = (
+    "Smith", "Martin", "Garcia", "Dubois", "Khan", "Chen", "Muller", "Rossi",
+    "Patel", "Novak", "Bernard", "Silva", "Brown", "Haddad", "Tanaka", "Ivanova",
+)
+JOB_TITLES: tuple[str] = (
+    "Software Engineer", "Data Scientist", "Product Manager", "DevOps Engineer",
+    "Machine Learning Engineer", "Backend Developer", "Data Analyst",
+    "Frontend Developer", "Project Manager", "Site Reliability Engineer",
+)
+COMPANIES: tuple[str] = (
+    "Google", "Capgemini", "Amazon Web Services", "Airbus", "Doctolib",
+    "Societe Generale", "Spotify", "Accenture", "Criteo", "Thales", "Ubisoft",
+    "Deloitte",
+)
+PLACES: tuple[tuple[str, str]] = (
+    ("Paris", "France"), ("Lyon", "France"), ("London", "United Kingdom"),
+    ("Berlin", "Germany"), ("Madrid", "Spain"), ("Toronto", "Canada"),
+    ("Seattle", "United States"), ("Bangalore", "India"), ("Tokyo", "Japan"),
+    ("Amsterdam", "Netherlands"),
+)
+SCHOOLS: tuple[str] = (
+    "Sorbonne University", "Ecole Polytechnique", "University of Cambridge",
+    "Technical University of Munich", "University of Toronto", "MIT",
+    "Indian Institute of Technology", "University of Tokyo",
+)
+DEGREES: tuple[str] = ("MSc", "BSc", "Master", "Bachelor", "PhD", "MBA", "BEng")
+MAJORS: tuple[str] = (
+    "Computer Science", "Applied Mathematics", "Data Science",
+    "Electrical Engineering", "Statistics", "Business Administration",
+)
+SKILLS: tuple[str] = (
+    "Python", "Java", "Go", "SQL", "Docker", "Kubernetes", "Spark", "Airflow",
+    "TensorFlow", "PyTorch", "React", "TypeScript", "AWS", "Terraform", "Git",
+    "PostgreSQL", "Kafka", "Scala", "Linux", "FastAPI",
+)
+LANGUAGES: tuple[str] = ("English", "French", "Spanish", "German", "Japanese", "Hindi")
+BULLETS: tuple[str] = (
+    "Developed REST APIs in {skill} for the billing platform",
+    "Led a team of {count} engineers on the search relevance project",
+    "Built data pipelines with {skill} and {other_skill}",
+    "Reduced infrastructure costs by {count}0% with {skill}",
+    "Migrated legacy services to {skill}",
+    "Designed dashboards tracking {count} business metrics",
+    "Mentored {count} junior developers",
+    "Automated deployments with {skill} and {other_skill}",
+)
+INTERESTS: tuple[str] = ("Running", "Chess", "Photography", "Hiking", "Music")
+MONTHS: tuple[str] = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+# fmt: on
+
+# number of experiences, educations and bullets per experience
+SIZES: dict[str, tuple[int, int, int]] = {
+    "small": (2, 1, 2),
+    "medium": (4, 2, 4),
+    "large": (8, 3, 6),
+    # about 30 PDF pages, like the longest CVs
+    "long": (20, 4, 90),
+}
+LAYOUTS: tuple[str] = ("classic", "compact", "two_column")
+
+# PDF page layout, in points, with a monospace font to keep the columns aligned
+PDF_FONT_SIZE = 9
+PDF_LEADING = 11
+PDF_MARGIN = 40
+PDF_PAGE_SIZE = (612, 792)
+PDF_LINES_PER_PAGE = (PDF_PAGE_SIZE[1] - 2 * PDF_MARGIN) // PDF_LEADING
+
+
+@dataclass
+class SyntheticResume:
+    """
+    A synthetic resume.
+
+    Attributes:
+        name (str): A unique name, also used as the file name stem.
+        size (str): One of SIZES.
+        layout (str): One of LAYOUTS.
+        lines (list[str]): The resume text lines, as laid out on the page.
+        headers (dict[str, tuple[int, int]]): The line index and the offset in the line
+            of each section title.
+    """
+
+    name: str
+    size: str
+    layout: str
+    lines: list[str]
+    headers: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _date(year: int, month: int, layout: str) -> str:
+    if layout == "compact":
+        return f"{MONTHS[month - 1]} {year}"
+    return f"{month:02d}/{year}"
+
+
+def _sections(rng: random.Random, size: str, layout: str) -> dict[str, list[str]]:
+    experiences, educations, bullets = SIZES[size]
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    city, country = rng.choice(PLACES)
+    title = rng.choice(JOB_TITLES)
+    skills = rng.sample(SKILLS, k=min(len(SKILLS), 4 + 2 * experiences))
+
+    header = [
+        f"{first_name} {last_name}",
+        title,
+        f"{first_name.lower()}.{last_name.lower()}@example.com",
+        f"+33 6 {rng.randint(10, 99)} {rng.randint(10, 99)} {rng.randint(10, 99)} {rng.randint(10, 99)}",
+        f"linkedin.com/in/{first_name.lower()}-{last_name.lower()}",
+        f"{city}, {country}",
+    ]
+
+    experience, year = [], 2024
+    for idx in range(experiences):
+        end = "Present" if idx == 0 else _date(year, rng.randint(1, 12), layout)
+        year -= rng.randint(1, 3)
+        start = _date(year, rng.randint(1, 12), layout)
+        job_title = title if idx == 0 else rng.choice(JOB_TITLES)
+        company = rng.choice(COMPANIES)
+        job_city, job_country = rng.choice(PLACES)
+        if layout == "compact":
+            experience.append(f"{job_title} | {company} | {start} - {end}")
+            experience.append(f"{job_city}, {job_country}")
+        else:
+            experience.extend(
+                [job_title, f"{company}, {job_city}, {job_country}", f"{start} - {end}"]
+            )
+        for _ in range(bullets):
+            skill, other_skill = rng.sample(skills, k=2)
+            bullet = rng.choice(BULLETS).format(
+                skill=skill, other_skill=other_skill, count=rng.randint(2, 9)
+            )
+            experience.append(f"- {bullet}")
+        year -= 1
+    experience_years = 2024 - year
+
+    education = []
+    for _ in range(educations):
+        end_year = year
+        year -= rng.randint(2, 5)
+        degree = f"{rng.choice(DEGREES)} in {rng.choice(MAJORS)}"
+        school_city, _ = rng.choice(PLACES)
+        dates = f"{_date(year, 9, layout)} - {_date(end_year, 6, layout)}"
+        if layout == "compact":
+            education.append(f"{degree} | {rng.choice(SCHOOLS)} | {dates}")
+        else:
+            education.extend([degree, f"{rng.choice(SCHOOLS)}, {school_city}", dates])
+
+    return {
+        "header": header,
+        "summary": [
+            f"{title} with {experience_years} years of experience in {skills[0]} and {skills[1]}."
+        ],
+        "experience": experience,
+        "education": education,
+        "skills": [", ".join(skills)],
+        "languages": [", ".join(rng.sample(LANGUAGES, k=2))],
+        "interests": [", ".join(rng.sample(INTERESTS, k=3))],
+    }
+
+
+def _layout_lines(
+    sections: dict[str, list[str]], layout: str
+) -> tuple[list[str], dict[str, tuple[int, int]]]:
+    titles = {
+        "summary": "Summary",
+        "experience": "Work Experience",
+        "education": "Education",
+        "skills": "Skills",
+        "languages": "Languages",
+        "interests": "Interests",
+    }
+    if layout == "classic":
+        titles = {key: title.upper() for key, title in titles.items()}
+
+    if layout != "two_column":
+        lines, headers = list(sections["header"]), {}
+        for key in titles:
+            headers[key] = (len(lines), 0)
+            lines.extend([titles[key], *sections[key]])
+        return lines, headers
+
+    # contact, skills and languages on the left, the rest on the right
+    left, left_headers = [*sections["header"][2:]], {}
+    for key in ("skills", "languages"):
+        left_headers[key] = len(left)
+        left.append(titles[key])
+        left.extend(item.strip() for line in sections[key] for item in line.split(","))
+    right, right_headers = [], {}
+    for key in ("summary", "experience", "education", "interests"):
+        right_headers[key] = len(right)
+        right.extend([titles[key], *sections[key]])
+    width = max(map(len, left)) + 4
+    lines = list(sections["header"][:2])
+    for idx in range(max(len(left), len(right))):
+        left_text = left[idx] if idx < len(left) else ""
+        right_text = right[idx] if idx < len(right) else ""
+        lines.append(f"{left_text:<{width}}{right_text}".rstrip())
+    headers = {
+        **{key: (2 + idx, 0) for key, idx in left_headers.items()},
+        **{key: (2 + idx, width) for key, idx in right_headers.items()},
+    }
+    return lines, headers
+
+
+def generate_resume(
+    seed: int = 0, size: str = "medium", layout: str = "classic", idx: int = 0
+) -> SyntheticResume:
+    """
+    Generate a synthetic resume, always the same for the same arguments.
+
+    Args:
+        seed (int, optional): The corpus seed.
+        size (str, optional): One of SIZES.
+        layout (str, optional): One of LAYOUTS.
+        idx (int, optional): The resume number among its variant.
+
+    Returns:
+        SyntheticResume: The resume.
+    """
+    rng = random.Random(f"{seed}-{size}-{layout}-{idx}")
+    lines, headers = _layout_lines(_sections(rng, size, layout), layout)
+    return SyntheticResume(f"{size}_{layout}_{idx:03d}", size, layout, lines, headers)
+
+
+def generate_corpus(
+    seed: int = 0,
+    per_variant: int = 3,
+    sizes: tuple[str] = tuple(SIZES),
+    layouts: tuple[str] = LAYOUTS,
+) -> list[SyntheticResume]:
+    """
+    Generate resumes of every size and layout.
+
+    Args:
+        seed (int, optional): The corpus seed.
+        per_variant (int, optional): Number of resumes of each size and layout.
+        sizes (tuple[str], optional): Sizes among SIZES.
+        layouts (tuple[str], optional): Layouts among LAYOUTS.
+
+    Returns:
+        list[SyntheticResume]: The resumes.
+    """
+    return [
+        generate_resume(seed, size, layout, idx)
+        for size in sizes
+        for layout in layouts
+        for idx in range(per_variant)
+    ]
+
+
+def _pdf_string(text: str) -> bytes:
+    encoded = text.encode("cp1252", errors="replace")
+    return (
+        b"("
+        + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        + b")"
+    )
+
+
+def text_to_pdf(lines: list[str]) -> bytes:
+    """
+    Write text lines into a minimal PDF document, in a monospace font.
+
+    Args:
+        lines (list[str]): The lines, paginated every PDF_LINES_PER_PAGE lines.
+
+    Returns:
+        bytes: The PDF file content.
+    """
+    pages = [
+        lines[start : start + PDF_LINES_PER_PAGE]
+        for start in range(0, max(len(lines), 1), PDF_LINES_PER_PAGE)
+    ]
+    width, height = PDF_PAGE_SIZE
+    # objects 1 to 3 are the catalog, the pages tree and the font,
+    # then each page is followed by its content stream
+    page_ids = [4 + 2 * idx for idx in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+        + b"] /Count %d >>" % len(pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        content = b"BT /F1 %d Tf %d TL %d %d Td\n" % (
+            PDF_FONT_SIZE,
+            PDF_LEADING,
+            PDF_MARGIN,
+            height - PDF_MARGIN,
+        )
+        content += b"".join(_pdf_string(line) + b" Tj T*\n" for line in page_lines)
+        content += b"ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (width, height, page_id + 1)
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+
+    pdf, offsets = b"%PDF-1.4\n", []
+    for object_id, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % object_id + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_offset,
+    )
+    return pdf
+
+
+def write_corpus(directory: str, corpus: list[SyntheticResume]) -> None:
+    """
+    Write each resume of a corpus as a PDF file and a text file.
+
+    Args:
+        directory (str): The output directory, created if needed.
+        corpus (list[SyntheticResume]): The resumes.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for resume in corpus:
+        with open(os.path.join(directory, f"{resume.name}.pdf"), "wb") as f:
+            f.write(text_to_pdf(resume.lines))
+        with open(os.path.join(directory, f"{resume.name}.txt"), "w") as f:
+            f.write(resume.text + "\n")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("output_directory")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--per-variant", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    corpus = generate_corpus(args.seed, args.per_variant)
+    write_corpus(args.output_directory, corpus)
+    print(f"Wrote {len(corpus)} resumes to {args.output_directory}")
+
+
+if __name__ == "__main__":
+    main()
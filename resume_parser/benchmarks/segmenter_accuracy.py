@@ -0,0 +1,187 @@
+"""
+Compare the accuracy and speed of the segmenter strategies, on the synthetic resume corpus
+and on a few hand-written fixtures, whose section titles positions are known.
+
+A section is found when its segment starts within its title.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.segmenter_accuracy
+"""
+
+import time
+import argparse
+from dataclasses import dataclass
+
+from benchmarks.common import report
+from benchmarks.corpus import SIZES, LAYOUTS, generate_corpus
+from segmenter import TextSegmenter, line_starts_of
+
+# the segments of the corpus section titles
+SECTIONS: dict[str, str] = {
+    "summary": "objective",
+    "experience": "experience",
+    "education": "education",
+    "skills": "skills",
+    "interests": "misc",
+}
+
+# layouts and titles missing from the corpus, whose titles are all header keywords,
+# with (line index, offset in the line) of the titles
+FIXTURES: tuple[tuple[str, list[str], dict[str, tuple[int, int]]]] = (
+    (
+        "inline_titles",
+        [
+            "Jane Doe",
+            "Summary: backend developer with an experience in payments",
+            "Experience:",
+            "Backend Developer, Stripe, 2019 - Present",
+            "Education:",
+            "MSc in Computer Science, 2014 - 2016",
+            "Skills: Python, Go, PostgreSQL",
+            "Interests: climbing, chess",
+        ],
+        {
+            "summary": (1, 0),
+            "experience": (2, 0),
+            "education": (4, 0),
+            "skills": (6, 0),
+            "interests": (7, 0),
+        },
+    ),
+    (
+        "titles_in_text",
+        [
+            "Paul Martin",
+            "Data engineer, experience with Spark, education technology background",
+            "Professional Experience",
+            "Data Engineer at Criteo, 03/2020 - now",
+            "- Built pipelines and trained the team on technical skills",
+            "Academic Qualifications",
+            "Master in Statistics, 2016 - 2018",
+            "Technical Skills",
+            "Spark, Airflow, Kafka",
+            "Volunteer Work",
+            "Teaching programming to kids",
+        ],
+        {
+            "experience": (2, 0),
+            "education": (5, 0),
+            "skills": (7, 0),
+            "interests": (9, 0),
+        },
+    ),
+    (
+        "titles_outside_keywords",
+        [
+            "Maria Garcia",
+            "Summary of Qualifications",
+            "Full-stack developer building web products for healthcare",
+            "Experience (selected)",
+            "Lead Developer, Doctolib, 2018 - Present",
+            "- Led the migration of the booking services to Kubernetes",
+            "EDUCATION AND CERTIFICATIONS",
+            "MSc Software Engineering, EPITA, 2012 - 2014",
+            "AWS Certified Solutions Architect, 2020",
+            "SKILLS & TOOLS",
+            "TypeScript, React, Node.js, Kubernetes, Terraform",
+            "Interests and Hobbies",
+            "Trail running, photography",
+        ],
+        {
+            "summary": (1, 0),
+            "experience": (3, 0),
+            "education": (6, 0),
+            "skills": (9, 0),
+            "interests": (11, 0),
+        },
+    ),
+)
+
+
+@dataclass
+class Fixture:
+    """A resume whose section titles positions are known."""
+
+    name: str
+    lines: list[str]
+    headers: dict[str, tuple[int, int]]
+
+
+def expected_spans(fixture: Fixture) -> dict[str, tuple[int, int]]:
+    """The span of each section title in the lines joined by spaces, by segment name."""
+    line_starts = line_starts_of(fixture.lines)
+    spans = {}
+    for section, (line_idx, offset) in fixture.headers.items():
+        if section not in SECTIONS:
+            continue
+        title = fixture.lines[line_idx][offset:].split("   ")[0].split(":")[0]
+        start = line_starts[line_idx] + offset
+        spans[SECTIONS[section]] = (start, start + len(title))
+    return spans
+
+
+def evaluate(segmenter: TextSegmenter, fixtures: list[Fixture]) -> dict:
+    """
+    Segment fixtures and count the sections found.
+
+    Returns:
+        dict: The accuracy, overall and of each section, and the mean time per resume.
+    """
+    found, total, elapsed = {}, {}, 0.0
+    for fixture in fixtures:
+        start = time.perf_counter()
+        segments = segmenter.segment_lines(fixture.lines)
+        elapsed += time.perf_counter() - start
+
+        for name, (title_start, title_end) in expected_spans(fixture).items():
+            total[name] = total.get(name, 0) + 1
+            if title_start <= segments.segment(name).start < title_end:
+                found[name] = found.get(name, 0) + 1
+
+    return {
+        "accuracy": sum(found.values()) / sum(total.values()),
+        **{f"{name}_accuracy": found.get(name, 0) / total[name] for name in total},
+        "mean_ms": elapsed * 1000 / len(fixtures),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--per-variant", type=int, default=5)
+    arg_parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=["fuzzy", "lines"],
+        default=["fuzzy", "lines"],
+    )
+    args = arg_parser.parse_args()
+
+    fixture_sets = {
+        "hand_written": [Fixture(*fixture) for fixture in FIXTURES],
+        **{
+            f"corpus_{size}": [
+                Fixture(resume.name, resume.lines, resume.headers)
+                for resume in generate_corpus(
+                    args.seed, args.per_variant, (size,), LAYOUTS
+                )
+            ]
+            for size in SIZES
+        },
+    }
+
+    for strategy in args.strategies:
+        segmenter = TextSegmenter(strategy=strategy)
+        for fixture_set, fixtures in fixture_sets.items():
+            report(
+                f"segmenter_{strategy}",
+                {
+                    "fixtures": fixture_set,
+                    "resumes": len(fixtures),
+                    **evaluate(segmenter, fixtures),
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Measure the import time of the API modules, and the startup time of its components,
+each in a fresh Python process.
+
+Run from the `resume_parser` directory:
+    python -m benchmarks.startup_report --repeat 3
+"""
+
+import re
+import sys
+import argparse
+import subprocess
+
+from benchmarks.common import latency_stats, report
+
+MODULES: tuple[str] = (
+    "utils",
+    "lookups",
+    "matchers",
+    "classifier",
+    "segmenter",
+    "parsers",
+    "reader",
+    "models",
+    "pipeline",
+    "main",
+)
+
+# a resume unlike the warmup one, so that the first request misses the NLI cache
+FIRST_REQUEST = (
+    "from config import Config\n"
+    "from models import Models\n"
+    "from pipeline import ResumeParser\n"
+    "from benchmarks.corpus import generate_resume, text_to_pdf\n"
+    "Config.RESULT_CACHE_BACKEND = None\n"
+    "pdf = text_to_pdf(generate_resume(1, 'medium', 'classic', 0).lines)\n"
+    "resume_parser = ResumeParser(Models())\n"
+)
+
+# code timed from the start of a fresh process, imports included, unless it sets
+# `elapsed_ms` itself
+STARTUP_STEPS: dict[str, str] = {
+    "parsers_prewarm": "from parsers import Parsers\nParsers(prewarm=True)",
+    "models_load": "from models import Models\nModels()",
+    "pipeline_warmup": (
+        "from models import Models\n"
+        "from pipeline import ResumeParser\n"
+        "ResumeParser(Models()).warmup()"
+    ),
+    # the latency of the first request, as served before and after the startup warmup
+    "first_request_cold": (
+        f"{FIRST_REQUEST}"
+        "request_start = time.perf_counter()\n"
+        "resume_parser.parse_pdf(pdf)\n"
+        "elapsed_ms = (time.perf_counter() - request_start) * 1000"
+    ),
+    "first_request_warm": (
+        f"{FIRST_REQUEST}"
+        "resume_parser.warmup()\n"
+        "request_start = time.perf_counter()\n"
+        "resume_parser.parse_pdf(pdf)\n"
+        "elapsed_ms = (time.perf_counter() - request_start) * 1000"
+    ),
+    # from the process start to the first response, startup included
+    "time_to_first_response_cold": f"{FIRST_REQUEST}resume_parser.parse_pdf(pdf)",
+    "time_to_first_response_warm": (
+        f"{FIRST_REQUEST}resume_parser.warmup()\nresume_parser.parse_pdf(pdf)"
+    ),
+}
+
+
+def run_timed(code: str) -> float:
+    """
+    Time some code in a fresh Python process, or get the time it measured itself.
+
+    Args:
+        code (str): The code to run, possibly setting `elapsed_ms`.
+
+    Returns:
+        float: The run time in milliseconds.
+
+    Raises:
+        RuntimeError: If the code failed, e.g. on a missing dependency or artifact.
+    """
+    timed_code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "print(globals().get('elapsed_ms', (time.perf_counter() - start) * 1000))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", timed_code], capture_output=True, text=True
+    )
+    if process.returncode:
+        # keep the final exception line, and the first line of its message
+        lines = [line for line in process.stderr.splitlines() if line.strip("* ")]
+        errors = [
+            i
+            for i, line in enumerate(lines)
+            if re.match(r"\w+(Error|Exception)\b", line)
+        ]
+        first = errors[-1] if errors else len(lines) - 1
+        raise RuntimeError(" ".join(line.strip() for line in lines[first : first + 2]))
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+def measure(name: str, code: str, repeat: int) -> None:
+    try:
+        timings = [run_timed(code) for _ in range(repeat)]
+    except RuntimeError as e:
+        report(name, {"error": str(e)})
+        return
+    report(name, latency_stats(timings))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument(
+        "--skip-startup", action="store_true", help="only measure the imports"
+    )
+    args = arg_parser.parse_args()
+
+    for module in MODULES:
+        measure(f"import_{module}", f"import {module}", args.repeat)
+
+    if not args.skip_startup:
+        for step, code in STARTUP_STEPS.items():
+            measure(f"startup_{step}", code, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Build, ahead of deployment, the artifacts the API loads at startup : the quantized
+ONNX models and their optimized graphs, the skills automaton, the gazetteer index
+and the nltk data.
+
+Run from the `resume_parser` directory:
+    python build_artifacts.py
+"""
+
+import os
+import logging
+import argparse
+import tempfile
+
+from config import Config
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+NLTK_PACKAGES: tuple[str] = ("stopwords", "punkt")
+
+
+def remove_optimized_graphs(save_dir: str) -> None:
+    """Remove the optimized graphs derived from the quantized model of a directory."""
+    if not os.path.isdir(save_dir):
+        return
+    for file_name in os.listdir(save_dir):
+        if "_optimized_" in file_name:
+            os.remove(os.path.join(save_dir, file_name))
+
+
+def build_quantized_models(force: bool = False) -> None:
+    """
+    Export the NLI and NER models to ONNX format and quantize them.
+
+    Models are quantized into a temporary directory, then moved over the previous ones,
+    so that a failed build never leaves a model missing or half written.
+
+    Args:
+        force (bool, optional): Whether to rebuild the models already quantized.
+
+    Raises:
+        ModelHandlingError: If a quantized model is missing, and so is its source model.
+    """
+    from optimum.onnxruntime import (
+        ORTModelForSequenceClassification,
+        ORTModelForTokenClassification,
+    )
+    from models import Models, ModelHandlingError
+
+    for model_name, ORTModel, save_dir, model_file_name in (
+        (
+            Config.NLI_MODEL_DIR,
+            ORTModelForSequenceClassification,
+            Config.QUANTIZED_NLI_MODEL_DIR,
+            Config.QUANTIZED_NLI_MODEL_ONNX,
+        ),
+        (
+            Config.NER_MODEL_DIR,
+            ORTModelForTokenClassification,
+            Config.QUANTIZED_NER_MODEL_DIR,
+            Config.QUANTIZED_NER_MODEL_ONNX,
+        ),
+    ):
+        model_path = os.path.join(save_dir, model_file_name)
+        if os.path.isfile(model_path) and not force:
+            logging.info(f"Quantized model ready : {model_path}")
+            continue
+        if not os.path.isdir(model_name):
+            if os.path.isfile(model_path):
+                logging.error(
+                    f"Missing source model {model_name}, keeping the quantized model {model_path}"
+                )
+                continue
+            raise ModelHandlingError(
+                f"Missing quantized model {model_path}, and its source model {model_name}"
+            )
+
+        parent_dir = os.path.dirname(os.path.normpath(save_dir))
+        os.makedirs(parent_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=parent_dir) as build_dir:
+            Models.quantize_and_save_model(
+                Models.load_model(model_name, ORTModel), build_dir
+            )
+            os.makedirs(save_dir, exist_ok=True)
+            for file_name in os.listdir(build_dir):
+                os.replace(
+                    os.path.join(build_dir, file_name),
+                    os.path.join(save_dir, file_name),
+                )
+        # the optimized graphs are derived from the previous quantized model
+        remove_optimized_graphs(save_dir)
+        logging.info(f"Quantized model ready : {model_path}")
+
+
+def build_optimized_graphs() -> None:
+    """Load the quantized models once, serializing their optimized graphs."""
+    from models import Models
+
+    Models(cache_optimized_model=True)
+
+
+def build_lookups() -> None:
+    """
+    Build and serialize the skills automaton and the gazetteer index.
+
+    Raises:
+        FileNotFoundError: If the cities and regions CSV of the gazetteer is missing.
+    """
+    from matchers import SkillMatcher
+    from lookups import Gazetteer, get_locationtagger_csv
+
+    SkillMatcher.load_or_build(Config.SKILLS_CSV, Config.SKILLS_AUTOMATON)
+    locations_csv = Config.GAZETTEER_LOCATIONS_CSV or get_locationtagger_csv()
+    if not locations_csv or not os.path.isfile(locations_csv):
+        raise FileNotFoundError(
+            f"Missing cities and regions CSV {locations_csv}, install locationtagger "
+            "or set Config.GAZETTEER_LOCATIONS_CSV"
+        )
+    Gazetteer.load_or_build(
+        Config.GAZETTEER_INDEX, locations_csv, Config.GAZETTEER_IGNORED_WORDS_CSV
+    )
+
+
+def download_nltk_data() -> None:
+    """Download the nltk data used to filter stopwords."""
+    import nltk
+
+    for package in NLTK_PACKAGES:
+        if not nltk.download(package, quiet=True):
+            logging.error(f"Failed to download nltk package {package}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--force", action="store_true", help="rebuild the quantized models"
+    )
+    arg_parser.add_argument(
+        "--skip-models",
+        action="store_true",
+        help="only build the lookups and download the nltk data",
+    )
+    args = arg_parser.parse_args()
+
+    if args.force:
+        for path in (Config.SKILLS_AUTOMATON, Config.GAZETTEER_INDEX):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    download_nltk_data()
+    build_lookups()
+    if not args.skip_models:
+        build_quantized_models(force=args.force)
+        if Config.ORT_CACHE_OPTIMIZED_MODEL:
+            build_optimized_graphs()
+    logging.info("Successfully built all artifacts ✔")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import os
+import time
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe LRU cache with an optional time-to-live and on-disk persistence.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept in memory.
+        ttl (float | None): The entries lifetime in seconds, None for no expiration.
+        persistence_path (str | None): The file the cache is loaded from and saved to.
+        hits (int): Number of lookups that found a valid entry.
+        misses (int): Number of lookups that found nothing or an expired entry.
+        evictions (int): Number of entries dropped because the cache was full.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float | None = None,
+        persistence_path: str | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.persistence_path = persistence_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if persistence_path and os.path.isfile(persistence_path):
+            self.load(persistence_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value, expires_at = self._entries.get(key, (_MISSING, None))
+            if value is _MISSING or (
+                expires_at is not None and expires_at < time.time()
+            ):
+                if value is not _MISSING:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path: str | None = None) -> None:
+        """
+        Save the non-expired entries to disk, replacing the file atomically.
+
+        Args:
+            path (str, optional): The destination file. Defaults to the persistence path.
+        """
+        path = path or self.persistence_path
+        if not path:
+            return
+        now = time.time()
+        with self._lock:
+            entries = [
+                (key, value, expires_at)
+                for key, (value, expires_at) in self._entries.items()
+                if expires_at is None or expires_at >= now
+            ]
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # a name of its own per process and thread, several may save at once
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            logging.info(f"Saved {len(entries)} cache entries into {path}")
+        except OSError as e:
+            logging.error(f"Failed to save cache into {path} : {e}")
+
+    def load(self, path: str) -> None:
+        """
+        Load entries previously written by `save`, skipping the expired ones.
+
+        Args:
+            path (str): The file to load the entries from.
+        """
+        # a disabled cache keeps nothing, while entries[-0:] would be every entry
+        if self.max_size <= 0:
+            return
+        try:
+            with open(path, "rb") as f:
+                entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logging.error(f"Failed to load cache from {path} : {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, value, expires_at in entries[-self.max_size :]:
+                if expires_at is None or expires_at >= now:
+                    self._entries[key] = (value, expires_at)
+        logging.info(f"Loaded {len(self._entries)} cache entries from {path}")
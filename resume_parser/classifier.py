@@ -0,0 +1,215 @@
+import copy
+import logging
+from typing import TYPE_CHECKING
+
+from config import Config
+from cache import LRUCache
+from metrics import record_nli_inferences
+from deadlines import Deadline
+
+if TYPE_CHECKING:
+    from transformers import pipeline
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+# pipeline arguments only changing how results are computed, left out of the cache keys
+UNKEYED_ARGUMENTS: tuple[str] = ("batch_size", "num_workers")
+
+
+def normalize_line(line: str) -> str:
+    """
+    Normalize a line for cache lookups by case-folding it and collapsing whitespaces.
+
+    Args:
+        line (str): The input line.
+
+    Returns:
+        str: The normalized line.
+    """
+    return " ".join(line.casefold().split())
+
+
+class CachedZeroShotClassifier:
+    """
+    A process-wide LRU cache in front of a zero-shot classification pipeline.
+
+    It is called exactly like the wrapped pipeline. Results are keyed on the
+    normalized line, the candidate labels and the arguments changing the results,
+    like `hypothesis_template` or `multi_label`, and only uncached lines are sent
+    to the pipeline, in a single call. Callers get copies of the cached results.
+
+    Attributes:
+        zero_shot_classifier (pipeline): The wrapped zero-shot classification pipeline.
+        cache (LRUCache): The cache of classification results.
+    """
+
+    def __init__(
+        self,
+        zero_shot_classifier: "pipeline",
+        max_size: int = Config.NLI_CACHE_SIZE,
+        ttl: float | None = Config.NLI_CACHE_TTL,
+        persistence_path: str | None = Config.NLI_CACHE_PATH,
+    ):
+        self.zero_shot_classifier = zero_shot_classifier
+        self.cache = LRUCache(max_size, ttl=ttl, persistence_path=persistence_path)
+
+    def __getattr__(self, name):
+        return getattr(self.zero_shot_classifier, name)
+
+    def __call__(self, sequences, candidate_labels, **kwargs):
+        single_input = isinstance(sequences, str)
+        sequences = [sequences] if single_input else list(sequences)
+        labels_key = (
+            (candidate_labels,)
+            if isinstance(candidate_labels, str)
+            else tuple(candidate_labels)
+        )
+        arguments_key = tuple(
+            sorted(
+                (name, repr(value))
+                for name, value in kwargs.items()
+                if name not in UNKEYED_ARGUMENTS
+            )
+        )
+
+        results, uncached = {}, {}
+        for sequence in sequences:
+            key = (normalize_line(sequence), labels_key, arguments_key)
+            if (result := self.cache.get(key)) is not None:
+                results[sequence] = {**copy.deepcopy(result), "sequence": sequence}
+            else:
+                uncached.setdefault(key, sequence)
+
+        if uncached:
+            record_nli_inferences(len(uncached))
+            outputs = self.zero_shot_classifier(
+                list(uncached.values()), candidate_labels, **kwargs
+            )
+            if isinstance(outputs, dict):
+                outputs = [outputs]
+            outputs = dict(zip(uncached, outputs))
+            for key, output in outputs.items():
+                self.cache.set(key, copy.deepcopy(output))
+
+            for sequence in sequences:
+                if sequence not in results:
+                    key = (normalize_line(sequence), labels_key, arguments_key)
+                    results[sequence] = {
+                        **copy.deepcopy(outputs[key]),
+                        "sequence": sequence,
+                    }
+
+        outputs = [results[sequence] for sequence in sequences]
+        return outputs[0] if single_input else outputs
+
+    def stats(self) -> dict[str, float]:
+        return self.cache.stats()
+
+    def save(self) -> None:
+        self.cache.save()
+
+
+class ClassificationMemo:
+    """
+    A request-scoped memo of line classifications.
+
+    It is shared by the experience and education parsers and by their fallback
+    re-runs, so that a line is classified at most once per label set and per resume.
+
+    Attributes:
+        hits (int): Number of line classifications served from the memo.
+        misses (int): Number of line classifications that required an NLI inference.
+    """
+
+    def __init__(self):
+        self._classifications: dict[tuple[str, tuple[str]], tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, line: str, candidate_labels: tuple[str]):
+        classification = self._classifications.get((line, tuple(candidate_labels)))
+        if classification is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return classification
+
+    def set(
+        self, line: str, candidate_labels: tuple[str], classification: tuple[str, float]
+    ) -> None:
+        self._classifications[(line, tuple(candidate_labels))] = classification
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def classify_lines(
+    lines: list[str],
+    candidate_labels: tuple[str],
+    zero_shot_classifier: "pipeline",
+    batch_size: int = Config.NLI_BATCH_SIZE,
+    memo: ClassificationMemo | None = None,
+    deadline: Deadline | None = None,
+) -> dict[str, tuple[str, float]]:
+    """
+    Classify a collection of lines with a single batched zero-shot inference.
+
+    Lines are deduplicated before inference, so a line appearing in several
+    date windows is only classified once. Lines already present in the memo
+    are not sent to the classifier at all.
+
+    With a bounded deadline, lines are classified `batch_size` at a time in order,
+    and the remaining lines are left out once the deadline is expired.
+
+    Args:
+        lines (list[str]): Candidate lines, possibly containing duplicates.
+        candidate_labels (tuple[str]): The NLI labels to score each line against.
+        zero_shot_classifier (pipeline): A zero-shot classifier pipeline.
+        batch_size (int, optional): Number of (line, hypothesis) pairs per ONNX forward pass.
+        memo (ClassificationMemo, optional): A request-scoped memo to read from and fill.
+        deadline (Deadline, optional): The time budget of the classification.
+
+    Returns:
+        dict[str, tuple[str, float]]: The best label and its score for each unique line,
+            only for the lines classified in time.
+    """
+    classifications, unique_lines = {}, []
+    for line in dict.fromkeys(lines):
+        if (
+            memo is not None
+            and (classification := memo.get(line, candidate_labels)) is not None
+        ):
+            classifications[line] = classification
+        else:
+            unique_lines.append(line)
+
+    if not unique_lines:
+        return classifications
+
+    chunk_size = (
+        batch_size if deadline is not None and deadline.bounded else len(unique_lines)
+    )
+    for chunk_start in range(0, len(unique_lines), chunk_size):
+        if deadline is not None and deadline.expired():
+            logging.warning(
+                f"Classified {chunk_start} of {len(unique_lines)} lines in the time budget"
+            )
+            break
+        chunk = unique_lines[chunk_start : chunk_start + chunk_size]
+
+        if not isinstance(zero_shot_classifier, CachedZeroShotClassifier):
+            # the cached classifier counts the lines it actually classifies
+            record_nli_inferences(len(chunk))
+        results = zero_shot_classifier(chunk, candidate_labels, batch_size=batch_size)
+        # the pipeline unwraps single-element inputs
+        if isinstance(results, dict):
+            results = [results]
+
+        for line, result in zip(chunk, results):
+            classifications[line] = (result["labels"][0], result["scores"][0])
+            if memo is not None:
+                memo.set(line, candidate_labels, classifications[line])
+
+    return classifications
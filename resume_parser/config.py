@@ -4,11 +4,64 @@ from dataclasses import dataclass
 
 @dataclass
 class Config:
-    # input dir
-    INPUT_DIRECTORY_PATH = "./inputs"
+    # API
+    # number of threads running the CPU-bound parsing of uploaded resumes
+    PARSING_WORKERS: int = 4
+    # parse in a pool of processes, each loading the models once, instead of threads
+    USE_WORKER_POOL: bool = False
+    # number of worker processes, defaults to the number of physical cores
+    WORKER_PROCESSES: int | None = None
+    # pin each worker process to its own physical cores (Linux only)
+    WORKER_CPU_AFFINITY: bool = True
+
+    # per-stage timings, served at /metrics
+    METRICS_LATENCY_BUCKETS: tuple[float] = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+    # add a Server-Timing header with the stages timings to /parse_resume/ responses
+    SERVER_TIMING_HEADER: bool = False
+
+    # batch parsing
+    # threads extracting PDF text ahead of the documents being parsed
+    BATCH_EXTRACTION_WORKERS: int = 2
+    # maximum number of documents extracted ahead of the one being parsed
+    BATCH_PREFETCH: int = 4
+    # bounds of each zip archive uploaded to /parse_resumes/, against zip bombs
+    ZIP_MAX_FILES: int = 200
+    ZIP_MAX_UNCOMPRESSED_SIZE: int = 256 * 1024 * 1024
+
+    # PDF text extraction
+    # "serial", or pages decoded concurrently in a pool of "threads" or "processes",
+    # "processes" falling back to "threads" in the worker pool processes
+    PDF_EXTRACTION_MODE: str = "serial"
+    PDF_EXTRACTION_WORKERS: int = 4
+    # documents with fewer pages are always decoded serially
+    PDF_PARALLEL_MIN_PAGES: int = 8
+    PDF_PAGES_PER_TASK: int = 4
+    # pages after the cap are ignored and listed in the remark (None for no cap)
+    PDF_MAX_PAGES: int | None = None
 
     # resume default language
     USED_LANGUAGE: str = "english"
+    # the language is detected early, on the start of the first page
+    LANGUAGE_DETECTION_CHARS: int = 5_000
+
+    # text normalization : "ascii" drops every non-ASCII character, "translit"
+    # transliterates the Latin letters (Ł -> L, ß -> ss) and drops the other scripts,
+    # "unicode" also keeps the letters of the other scripts, "auto" is "translit"
+    # for the languages below and resumes of unknown language, "unicode" otherwise
+    NORMALIZATION_MODE: str = "auto"
+    NORMALIZATION_ASCII_LANGUAGES: tuple[str] = ("en",)
     SPACY_LANGUAGE_MODEL = "en_core_web_sm"
 
     # models
@@ -21,15 +74,88 @@ class Config:
     QUANTIZED_NER_MODEL_DIR: str = os.path.join(MODELS_DIR, "quantized_model_ner/")
     QUANTIZED_NER_MODEL_ONNX: str = "model_quantized.onnx"
     NER_MODEL_SKILLS_DIR: str = os.path.join(MODELS_DIR, "ner_model_for_skills/")
+    # quantized models are built ahead with `python build_artifacts.py`,
+    # the API refuses to export and quantize them at startup unless allowed
+    ALLOW_RUNTIME_QUANTIZATION: bool = False
+
+    # ONNX Runtime threads (None lets ONNX Runtime decide)
+    ORT_INTRA_OP_NUM_THREADS: int | None = None
+    ORT_INTER_OP_NUM_THREADS: int | None = None
+    # graph optimization level : "disable", "basic", "extended" or "all"
+    # ("all" adds layout optimizations specific to the CPU the graph is optimized on)
+    ORT_GRAPH_OPTIMIZATION_LEVEL: str = "extended"
+    # operators execution mode : "sequential" or "parallel"
+    ORT_EXECUTION_MODE: str = "sequential"
+    ORT_ENABLE_CPU_MEM_ARENA: bool = True
+    ORT_ENABLE_MEM_PATTERN: bool = True
+    # serialize the optimized graph next to the quantized model on first load,
+    # so later startups skip the graph optimization
+    ORT_CACHE_OPTIMIZED_MODEL: bool = True
 
     # resources
     RESOURCES_DIR: str = "./resources"
     SKILLS_CSV = os.path.join(RESOURCES_DIR, "./skills.csv")
+    SKILLS_AUTOMATON = os.path.join(RESOURCES_DIR, "./skills_automaton.pkl")
     DEGREES_ABBREVIATIONS_CSV = os.path.join(
         RESOURCES_DIR, "./degrees_abbreviations.csv"
     )
+    # cities and regions CSV, defaults to the one shipped with locationtagger
+    GAZETTEER_LOCATIONS_CSV: str | None = None
+    GAZETTEER_IGNORED_WORDS_CSV = os.path.join(
+        RESOURCES_DIR, "./gazetteer_ignored_words.csv"
+    )
+    GAZETTEER_INDEX = os.path.join(RESOURCES_DIR, "./gazetteer.pkl")
+
+    # zero-shot classification
+    NLI_BATCH_SIZE: int = 16
+    # process-wide cache of NLI results (size 0 disables it, TTL in seconds)
+    NLI_CACHE_SIZE: int = 50_000
+    NLI_CACHE_TTL: float | None = 7 * 24 * 3600
+    NLI_CACHE_PATH: str | None = None
+
+    # headline NER : the headline is bounded to its first lines and tokens, and split
+    # into windows overlapping by HEADLINE_WINDOW_STRIDE tokens, run as a single batch
+    HEADLINE_MAX_LINES: int = 20
+    HEADLINE_MAX_TOKENS: int = 512
+    HEADLINE_WINDOW_TOKENS: int = 128
+    HEADLINE_WINDOW_STRIDE: int = 32
+    NER_BATCH_SIZE: int = 8
+    # number of resumes whose headlines are recognized together by the batch parser,
+    # and parsed by a single job of the worker pool
+    BATCH_HEADLINES: int = 8
+
+    # parsed resumes cache, keyed on the PDF content and the parser fingerprint :
+    # "memory" (per process), "sqlite" or "directory" (shared by processes), None to disable it
+    RESULT_CACHE_BACKEND: str | None = "memory"
+    # bump when a change to the parsing changes the results
+    RESULT_CACHE_VERSION: str = "3"
+    RESULT_CACHE_SIZE: int = 1_000
+    RESULT_CACHE_TTL: float | None = 30 * 24 * 3600
+    # the SQLite database file, or the directory of JSON files
+    RESULT_CACHE_PATH: str = "./cache/results"
+
+    # segmentation
+    # "lines" (header-like lines looked up in a keyword index)
+    # or "fuzzy" (the whole text fuzzy scored against every header keyword)
+    SEGMENTER_STRATEGY: str = "lines"
+
+    # time budgets in seconds (None for unbounded) of the parsing of a resume, and of
+    # its slowest stages; a stage running out of time returns what it parsed so far
+    PARSING_DEADLINE: float | None = 30.0
+    STAGE_DEADLINES: tuple[tuple[str, float]] = (
+        ("headline", 5.0),
+        ("education", 10.0),
+        ("experience", 15.0),
+    )
 
     # parsers
+    PREWARM_PARSERS: bool = True
+    # parse a small resume at startup, so the first request doesn't load anything
+    WARMUP_ON_STARTUP: bool = True
+    # "gazetteer" (offline index) or "locationtagger" (NER based)
+    LOCATION_RESOLVER: str = "gazetteer"
+    # directory holding a local "tlds-alpha-by-domain.txt", defaults to urlextract's own
+    URLEXTRACT_CACHE_DIR: str | None = None
     PRESENT_KEYWORDS = ["present", "now", "actual"]
     EMPLOYMENT_NLI_CLASSES: tuple[str] = (
         "institution name",
@@ -63,5 +189,10 @@ class Config:
     # messages
     MESSAGE_COMPLETED = "Parsing Complete"
     MESSAGE_UNCOMPLETED = "Parsing Uncomplete"
+    MESSAGE_TIME_BUDGET_EXCEEDED = "time budget exceeded"
+    MESSAGE_PAGE_LIMIT_REACHED = "page limit reached"
+    CACHE_STATUS_HIT = "hit"
+    CACHE_STATUS_MISS = "miss"
+    CACHE_STATUS_DISABLED = "disabled"
     MESSAGE_STATUS_SUCCESS = "succeeded"
     MESSAGE_STATUS_UNSUCCESS = "unsucceeded"
@@ -100,8 +100,10 @@ class MetaData(BaseModel):
     status: str = "unsucceeded"
     resume_pk: str = 0
     candidate_pk: int = 0
+    file_name: str = ""
     language_code: str = "en"
     language_confidence: float = 1.0
+    cache_status: str = ""
 
 
 class ResumeParsingResponse(BaseModel):
@@ -0,0 +1,172 @@
+import re
+import logging
+from datetime import datetime
+from functools import lru_cache
+from dataclasses import dataclass
+
+from dateutil import parser
+
+from config import Config
+from segmenter import Segment
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+# whole month names or their abbreviations, so that words such as "Marketing" aren't months
+RE_MONTHS = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|Sept?(?:ember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\b\.?"
+# for numerical and non_numerical months
+RE_DATES = rf"(\b\d{{1,2}}[-/](?:\d{{1,2}}|[a-zA-Z]+)[-/]\d{{2,4}}\b|\b\d{{1,2}}[-/]\d{{2,4}}\b|\b{RE_MONTHS}\s+(?:\d{{1,2}},?\s+)?\d{{2,4}}\b|\b\d{{4}}\b)"
+
+
+def compile_dates_pattern(present_keywords: list[str]) -> re.Pattern:
+    """
+    Compile the dates regex, along with the whole-word keywords meaning today.
+
+    Args:
+        present_keywords (list[str]): Keywords such as "present" or "now".
+
+    Returns:
+        re.Pattern: A case-insensitive pattern whose `present` group matches the keywords.
+    """
+    keywords = "|".join(map(re.escape, present_keywords))
+    return re.compile(rf"{RE_DATES}|\b(?P<present>{keywords})\b", re.IGNORECASE)
+
+
+DATES_PATTERN = compile_dates_pattern(Config.PRESENT_KEYWORDS)
+
+
+@lru_cache(maxsize=4096)
+def normalize_date(date_text: str, default: datetime) -> str | None:
+    """
+    Normalize a date as written in a resume to a month and a year.
+
+    Args:
+        date_text (str): The date, e.g. "03/2021", "Mar 2021" or "2021".
+        default (datetime): Where the day and month are taken from, when missing.
+
+    Returns:
+        str | None: The date as "%m/%Y", or None if it can't be parsed.
+    """
+    try:
+        return parser.parse(date_text, dayfirst=True, default=default).strftime("%m/%Y")
+    except (ValueError, OverflowError):
+        return None
+
+
+@dataclass(frozen=True)
+class DateMention:
+    """
+    A date found in a resume.
+
+    Attributes:
+        text (str): The date as written.
+        date (str | None): The normalized "%m/%Y" date, None if it can't be parsed.
+        line_idx (int): The index of its line.
+        start (int): Its start offset in the lines joined by spaces.
+        end (int): Its end offset in the lines joined by spaces.
+    """
+
+    text: str
+    date: str | None
+    line_idx: int
+    start: int
+    end: int
+
+
+class DateIndex:
+    """
+    The dates of a resume, found in a single pass over its lines.
+
+    It answers the date queries of every parser, and of their fallback re-runs.
+    Lines holding exactly two dates are read as a start and an end date.
+
+    Attributes:
+        full_text (str): The resume lines joined by spaces, the text segments are cut from.
+        mentions (list[DateMention]): All the dates, in reading order.
+        pairs (list[tuple[DateMention, DateMention]]): The start and end dates of each line holding two dates.
+    """
+
+    def __init__(
+        self,
+        resume_lines: list[str],
+        today: datetime | None = None,
+        dates_pattern: re.Pattern = DATES_PATTERN,
+    ):
+        self.full_text = " ".join(resume_lines)
+        today = today or datetime.today()
+        today_date = today.strftime("%m/%Y")
+        # the first of the month, which every month has, and the cache key for the month
+        default = datetime(today.year, today.month, 1)
+
+        self.mentions, self.pairs, line_start = [], [], 0
+        for line_idx, line in enumerate(resume_lines):
+            line_mentions = [
+                DateMention(
+                    text=match.group(),
+                    date=(
+                        today_date
+                        if match.group("present")
+                        else normalize_date(match.group(), default)
+                    ),
+                    line_idx=line_idx,
+                    start=line_start + match.start(),
+                    end=line_start + match.end(),
+                )
+                for match in dates_pattern.finditer(line)
+            ]
+            # unparseable mentions would pair a date with a wrong one
+            line_mentions = [mention for mention in line_mentions if mention.date]
+            self.mentions.extend(line_mentions)
+            if len(line_mentions) == 2:
+                self.pairs.append(tuple(line_mentions))
+            line_start += len(line) + 1
+
+    def find_segment(self, segment_text: str) -> tuple[int, int] | None:
+        """
+        Locate a text segment in the resume.
+
+        Args:
+            segment_text (str): A segment cut from the lines joined by spaces.
+
+        Returns:
+            tuple[int, int] | None: The segment start and end offsets, None if it is not found.
+        """
+        if not segment_text or (start := self.full_text.find(segment_text)) < 0:
+            return None
+        return start, start + len(segment_text)
+
+    def dates_for_segment(
+        self, segment: Segment | str
+    ) -> list[tuple[tuple[str, int], tuple[str, int]]]:
+        """
+        Select the start and end dates lying in a section of the resume.
+
+        Args:
+            segment (Segment | str): The section, or its text cut from the lines joined by spaces.
+
+        Returns:
+            list[tuple[tuple[str, int], tuple[str, int]]]: The "%m/%Y" start and end dates,
+                with the index of their line.
+        """
+        if not isinstance(segment, Segment):
+            if (span := self.find_segment(segment)) is not None:
+                segment = Segment("", *span, range(0))
+
+        if isinstance(segment, Segment):
+
+            def in_segment(mention):
+                return segment.contains_span(mention.start, mention.end)
+
+        else:
+            # not cut from these lines, match the dates as written instead
+            def in_segment(mention):
+                return bool(segment) and mention.text in segment
+
+        return [
+            ((start_date.date, start_date.line_idx), (end_date.date, end_date.line_idx))
+            for start_date, end_date in self.pairs
+            if start_date.date
+            and end_date.date
+            and (in_segment(start_date) or in_segment(end_date))
+        ]
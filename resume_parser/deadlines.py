@@ -0,0 +1,55 @@
+import math
+import time
+import logging
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+
+class Deadline:
+    """
+    A time budget of the parsing of a resume, or of one of its stages.
+
+    Long running parsers check it between units of work, e.g. between NLI batches,
+    and return what they parsed so far once it is expired, instead of raising.
+
+    Attributes:
+        expires_at (float): The `time.monotonic()` expiry time, infinite when unbounded.
+        exceeded (bool): Whether the deadline was found expired, i.e. some work was cut.
+        detail (str): What was cut, e.g. "first 12 of 340 experiences", set by the parsers.
+    """
+
+    def __init__(self, budget: float | None = None, parent: "Deadline | None" = None):
+        # budget in seconds from now, never outliving the enclosing deadline
+        self.expires_at = math.inf if budget is None else time.monotonic() + budget
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+        self.exceeded = False
+        self.detail = ""
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at != math.inf
+
+    def remaining(self) -> float:
+        """Remaining time in seconds, 0 once expired."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        """Whether the time budget is spent. Once it is, `exceeded` is set."""
+        if not self.exceeded and time.monotonic() >= self.expires_at:
+            self.exceeded = True
+        return self.exceeded
+
+    def sub(self, budget: float | None) -> "Deadline":
+        """
+        Get the deadline of a stage, bounded by this one.
+
+        Args:
+            budget (float | None): Time budget of the stage in seconds, None to only be bounded by this one.
+
+        Returns:
+            Deadline: The deadline of the stage.
+        """
+        return Deadline(budget, parent=self)
@@ -0,0 +1,432 @@
+import os
+import re
+import csv
+import pickle
+import logging
+import unicodedata
+import importlib.util
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+
+from config import Config
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+RE_WORDS = re.compile(r"\b\w+\b")
+
+# common country names, abbreviations and endonyms missing from pycountry
+COUNTRY_ALIASES: dict[str, str] = {
+    "usa": "US",
+    "u.s.": "US",
+    "u.s.a.": "US",
+    "america": "US",
+    "uk": "GB",
+    "u.k.": "GB",
+    "britain": "GB",
+    "great britain": "GB",
+    "england": "GB",
+    "scotland": "GB",
+    "wales": "GB",
+    "northern ireland": "GB",
+    "uae": "AE",
+    "deutschland": "DE",
+    "allemagne": "DE",
+    "holland": "NL",
+    "nederland": "NL",
+    "the netherlands": "NL",
+    "espana": "ES",
+    "italia": "IT",
+    "schweiz": "CH",
+    "suisse": "CH",
+    "svizzera": "CH",
+    "belgique": "BE",
+    "belgie": "BE",
+    "osterreich": "AT",
+    "polska": "PL",
+    "sverige": "SE",
+    "norge": "NO",
+    "danmark": "DK",
+    "suomi": "FI",
+    "brasil": "BR",
+    "turkey": "TR",
+    "russia": "RU",
+    "korea": "KR",
+    "czech republic": "CZ",
+    "ivory coast": "CI",
+    "macedonia": "MK",
+    "swaziland": "SZ",
+    "burma": "MM",
+    "laos": "LA",
+    "syria": "SY",
+    "tanzania": "TZ",
+    "moldova": "MD",
+    "venezuela": "VE",
+    "palestine": "PS",
+}
+
+
+def fold(text: str) -> str:
+    """
+    Case-fold a text and strip its accents, for accent and case insensitive lookups.
+
+    Args:
+        text (str): The input text.
+
+    Returns:
+        str: The folded text.
+    """
+    text = unicodedata.normalize("NFD", text.casefold())
+    return text.encode("ascii", "ignore").decode("utf-8")
+
+
+def fold_words(text: str) -> tuple[str]:
+    return tuple(RE_WORDS.findall(fold(text)))
+
+
+def fold_name(text: str) -> str:
+    return " ".join(fold_words(text))
+
+
+class LanguageIndex:
+    """
+    A frozen lookup index of language names, matched on case-folded word n-grams.
+
+    Attributes:
+        languages (dict[tuple[str], tuple[str, str]]): Folded name words to (name, alpha_3).
+        max_words (int): The number of words of the longest language name.
+    """
+
+    def __init__(self, languages: dict[str, str]):
+        self.languages = {}
+        for name, alpha_3 in languages.items():
+            if words := fold_words(name):
+                self.languages.setdefault(words, (name, alpha_3))
+        self.max_words = max(map(len, self.languages), default=0)
+
+    @staticmethod
+    def matches_casing(words: list[str], name: str) -> bool:
+        """Whether words are written title-cased or like in a name, e.g. not "MBA" for "Mba"."""
+        name_words = set(RE_WORDS.findall(name))
+        return all(word.istitle() or word in name_words for word in words)
+
+    def find(self, text: str) -> list[tuple[str, str]]:
+        """
+        Find language names in a text, in a single pass over its words.
+
+        Longest names win, and a name is only taken when each of its words is written
+        title-cased or like in the name, so lower-case words such as "even" and
+        acronyms such as "MBA" are not taken for languages. Capitalized common words,
+        e.g. "Even" starting a sentence, still are.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            list[tuple[str, str]]: The unique (name, alpha_3) found, in order of appearance.
+        """
+        words = RE_WORDS.findall(text)
+        folded_words = [fold(word) for word in words]
+        found, idx = {}, 0
+        while idx < len(words):
+            length = 0
+            if words[idx][:1].isupper():
+                for n in range(min(self.max_words, len(words) - idx), 0, -1):
+                    language = self.languages.get(tuple(folded_words[idx : idx + n]))
+                    if language and self.matches_casing(
+                        words[idx : idx + n], language[0]
+                    ):
+                        found.setdefault(language, None)
+                        length = n
+                        break
+            idx += max(length, 1)
+
+        return list(found)
+
+
+@lru_cache(maxsize=None)
+def get_language_index() -> LanguageIndex:
+    """Build the languages index once, from pycountry."""
+    import pycountry
+
+    index = LanguageIndex({lang.name: lang.alpha_3 for lang in pycountry.languages})
+    logging.info(f"Built languages index of {len(index.languages)} names")
+    return index
+
+
+class CountryResolver:
+    """
+    A lookup table resolving country names to their ISO 3166 alpha_2 codes.
+
+    Names are resolved by exact match first, then by their case-folded and
+    accent-stripped words, which also covers codes and common aliases
+    such as "USA", "UK" or "Deutschland".
+
+    Attributes:
+        exact_names (dict[str, str]): Exact country names to alpha_2.
+        folded_names (dict[str, str]): Folded names, codes and aliases to alpha_2.
+    """
+
+    def __init__(self, countries: list, aliases: dict[str, str] = COUNTRY_ALIASES):
+        self.exact_names, self.folded_names = {}, {}
+        for country in countries:
+            names = [
+                country.name,
+                getattr(country, "common_name", None),
+                getattr(country, "official_name", None),
+            ]
+            for name in filter(None, names):
+                self.exact_names.setdefault(name, country.alpha_2)
+            for name in filter(None, [*names, country.alpha_2, country.alpha_3]):
+                self.folded_names.setdefault(fold_name(name), country.alpha_2)
+        for alias, alpha_2 in aliases.items():
+            self.folded_names.setdefault(fold_name(alias), alpha_2)
+
+    def alpha_2(self, country_name: str) -> str:
+        """
+        Resolve a country name to its alpha_2 code.
+
+        Args:
+            country_name (str): The country name, code or alias.
+
+        Returns:
+            str: The alpha_2 code, or an empty string if the country is unknown.
+        """
+        if not country_name:
+            return ""
+        if alpha_2 := self.exact_names.get(country_name):
+            return alpha_2
+        return self.folded_names.get(fold_name(country_name), "")
+
+
+@lru_cache(maxsize=None)
+def get_country_resolver() -> CountryResolver:
+    """Build the countries lookup table once, from pycountry."""
+    import pycountry
+
+    resolver = CountryResolver(list(pycountry.countries))
+    logging.info(f"Built countries lookup of {len(resolver.folded_names)} names")
+    return resolver
+
+
+@dataclass
+class Locations:
+    """The places found in a text, in the shape of locationtagger's results."""
+
+    cities: list[str] = field(default_factory=list)
+    regions: list[str] = field(default_factory=list)
+    countries: list[str] = field(default_factory=list)
+
+
+class Gazetteer:
+    """
+    An offline index of cities, regions and countries, matched on case-folded word n-grams.
+
+    Attributes:
+        places (dict[str, tuple[str, str, str]]): Folded place names to their city, region
+            and country display names (None when the name is not of that kind).
+        ignored_words (frozenset[str]): Folded words never matched as a one-word city or region.
+        max_words (int): The number of words of the longest place name.
+        fingerprint (tuple): Identifies the sources the gazetteer was built from.
+    """
+
+    def __init__(
+        self,
+        places: dict[str, tuple[str, str, str]],
+        ignored_words: frozenset[str] = frozenset(),
+        fingerprint: tuple = (),
+    ):
+        self.places = places
+        self.ignored_words = ignored_words
+        self.max_words = max((name.count(" ") + 1 for name in places), default=0)
+        self.fingerprint = fingerprint
+
+    def find_locations(self, text: str, min_length: int = 3) -> Locations:
+        """
+        Find the places mentioned in a text, in a single pass over its words.
+
+        Longest names win, and only capitalized or upper-case words can start a
+        place name, so that common lower-case words are not taken for places.
+        A name which is a country is only reported as a country.
+
+        Args:
+            text (str): The input text.
+            min_length (int): Minimum length of a one-word city or region name.
+
+        Returns:
+            Locations: The unique cities, regions and countries, in order of appearance.
+        """
+        words = RE_WORDS.findall(text)
+        folded_words = [fold(word) for word in words]
+        cities, regions, countries = {}, {}, {}
+        idx = 0
+        while idx < len(words):
+            length = 0
+            if words[idx][:1].isupper():
+                for n in range(min(self.max_words, len(words) - idx), 0, -1):
+                    if not (
+                        place := self.places.get(" ".join(folded_words[idx : idx + n]))
+                    ):
+                        continue
+                    city, region, country = place
+                    if country:
+                        countries.setdefault(country, None)
+                    elif n > 1 or (
+                        len(words[idx]) >= min_length
+                        and folded_words[idx] not in self.ignored_words
+                    ):
+                        if city:
+                            cities.setdefault(city, None)
+                        if region:
+                            regions.setdefault(region, None)
+                    else:
+                        continue
+                    length = n
+                    break
+            idx += max(length, 1)
+
+        return Locations(
+            cities=list(cities), regions=list(regions), countries=list(countries)
+        )
+
+    @classmethod
+    def build(
+        cls,
+        locations_csv: str | None,
+        countries: list,
+        ignored_words: list[str] = (),
+        fingerprint: tuple = (),
+    ):
+        """
+        Build the gazetteer from a GeoNames-like locations CSV and a list of countries.
+
+        Args:
+            locations_csv (str, optional): CSV with "subdivision_name" and "city_name" columns.
+            countries (list): pycountry countries, whose names are the countries display names.
+            ignored_words (list[str], optional): Words never matched as a one-word city or region.
+            fingerprint (tuple, optional): Identifies the sources the gazetteer is built from.
+
+        Returns:
+            Gazetteer: The gazetteer.
+        """
+        import pycountry
+
+        places = {}
+
+        def add(name, kind, display_name=None):
+            if name and (key := fold_name(name)):
+                place = list(places.get(key, (None, None, None)))
+                place[kind] = place[kind] or display_name or name
+                places[key] = tuple(place)
+
+        if locations_csv:
+            try:
+                with open(locations_csv, encoding="utf-8") as f:
+                    for row in csv.DictReader(f):
+                        add(row.get("city_name"), 0)
+                        add(row.get("subdivision_name"), 1)
+            except OSError as e:
+                logging.error(f"Failed to load file {locations_csv} : {e}")
+
+        for country in countries:
+            for name in (
+                country.name,
+                getattr(country, "common_name", None),
+                getattr(country, "official_name", None),
+            ):
+                add(name, 2, country.name)
+        for alias, alpha_2 in COUNTRY_ALIASES.items():
+            if country := pycountry.countries.get(alpha_2=alpha_2):
+                add(alias, 2, country.name)
+
+        return cls(
+            places,
+            ignored_words=frozenset(map(fold_name, ignored_words)),
+            fingerprint=fingerprint,
+        )
+
+    @classmethod
+    def load_or_build(
+        cls, index_path: str, locations_csv: str | None, ignored_words_csv: str
+    ):
+        """
+        Load the serialized gazetteer, or build it and serialize it.
+
+        The gazetteer is rebuilt whenever one of its source CSVs changed.
+
+        Args:
+            index_path (str): The path of the serialized gazetteer.
+            locations_csv (str, optional): The locations CSV to build the gazetteer from.
+            ignored_words_csv (str): The CSV of words never matched as a one-word city or region.
+
+        Returns:
+            Gazetteer: The gazetteer.
+        """
+        sources = [
+            p for p in (locations_csv, ignored_words_csv) if p and os.path.isfile(p)
+        ]
+        fingerprint = tuple(
+            (path, (stat := os.stat(path)).st_size, stat.st_mtime_ns)
+            for path in sources
+        )
+
+        if os.path.isfile(index_path):
+            try:
+                with open(index_path, "rb") as f:
+                    gazetteer = pickle.load(f)
+                if isinstance(gazetteer, cls) and gazetteer.fingerprint == fingerprint:
+                    return gazetteer
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+                logging.error(f"Failed to load gazetteer {index_path} : {e}")
+
+        import pycountry
+
+        logging.info(f"Building gazetteer from {locations_csv}")
+        if locations_csv not in sources:
+            logging.error(
+                f"Missing locations CSV {locations_csv}, the gazetteer only has countries"
+            )
+        ignored_words = []
+        if ignored_words_csv in sources:
+            with open(ignored_words_csv, encoding="utf-8") as f:
+                ignored_words = next(csv.reader(f), [])
+        gazetteer = cls.build(
+            locations_csv if locations_csv in sources else None,
+            list(pycountry.countries),
+            ignored_words=ignored_words,
+            fingerprint=fingerprint,
+        )
+        try:
+            # a name of its own per process, several workers may build at once
+            tmp_path = f"{index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(gazetteer, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logging.error(f"Failed to save gazetteer {index_path} : {e}")
+
+        return gazetteer
+
+
+def get_locationtagger_csv() -> str | None:
+    """Locate the cities and regions CSV shipped with locationtagger, without importing it."""
+    spec = importlib.util.find_spec("locationtagger")
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return os.path.join(
+        spec.submodule_search_locations[0], "data", "City-Region-Locations.csv"
+    )
+
+
+@lru_cache(maxsize=None)
+def get_gazetteer() -> Gazetteer:
+    """Load the gazetteer once, from Config.GAZETTEER_LOCATIONS_CSV or locationtagger's data."""
+    gazetteer = Gazetteer.load_or_build(
+        Config.GAZETTEER_INDEX,
+        Config.GAZETTEER_LOCATIONS_CSV or get_locationtagger_csv(),
+        Config.GAZETTEER_IGNORED_WORDS_CSV,
+    )
+    logging.info(f"Loaded gazetteer of {len(gazetteer.places)} places")
+    return gazetteer
@@ -1,20 +1,24 @@
 import os
-import shutil
+import asyncio
 import logging
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from config import Config
 from data_models import ResumeParsingResponse
-from reader import Reader
-from segmenter import TextSegmenter
-from parsers import Parsers
-from models import Models
-from utils import (
-    cleaning_and_creating_tree,
-    generate_metadata,
+from batch import BatchParser, ZipLimitError, iter_zip
+from metrics import METRICS, run_traced
+from deadlines import Deadline
+from workers import (
+    create_worker_pool,
+    iter_parsed,
+    parse_pdf_job,
+    parse_pdfs_job,
+    physical_core_cpus,
 )
-from headers import Headers
 
 logging.basicConfig(
     format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
@@ -22,114 +26,156 @@ logging.basicConfig(
 
 app = FastAPI()
 
-# instanciate project main objects
-segmenter = TextSegmenter()
-parsers = Parsers()
+if Config.USE_WORKER_POOL:
+    # processes loading the models once each, running the parsing off the event loop
+    models, resume_parser = None, None
+    worker_processes = Config.WORKER_PROCESSES or len(physical_core_cpus())
+    executor = create_worker_pool(worker_processes)
+    parse_pdf = parse_pdf_job
+else:
+    from models import Models
+    from pipeline import ResumeParser
 
-# load models
-models = Models()
+    # load models and instanciate the parsing pipeline
+    models = Models()
+    resume_parser = ResumeParser(models)
 
+    # bounded pool running the CPU-bound parsing, off the event loop
+    executor = ThreadPoolExecutor(max_workers=Config.PARSING_WORKERS)
+    parse_pdf = partial(run_traced, resume_parser.parse_pdf)
 
-def parse_resume(resume_lines):
-    try:
-        # segment full text into distinct sections
-        full_text = " ".join(resume_lines)
-        segments = segmenter.segmenter(full_text)
 
-        # extract skills
-        skills = parsers.parse_skills(
-            segments.get("skills", ""),
-        )
+@app.on_event("startup")
+def startup():
+    if Config.USE_WORKER_POOL:
+        # start every worker now, so that the first requests don't load the models
+        for _ in range(worker_processes):
+            executor.submit(os.getpid)
+    elif Config.WARMUP_ON_STARTUP:
+        resume_parser.warmup()
 
-        # extract contact data
-        contact = parsers.parse_contact_data(
-            segments.get("headline", ""),
-        )
 
-        # parse name and current job designation
-        name, summary = parsers.parse_headline(
-            segments.get("headline", ""),
-            models.ner_pipeline,
-        )
+@app.on_event("shutdown")
+def shutdown():
+    executor.shutdown(wait=True)
+    if models is not None:
+        models.save_caches()
 
-        # extract personal data
-        personal = parsers.parse_personal_data(name)
 
-        # extract languages
-        languages = parsers.parse_languages(full_text)
-
-        # extract education
-        education = parsers.parse_with_fallback(
-            parsers.parse_education_and_trainings,
-            resume_lines,
-            segments.get("education", ""),
-            segments.get(Headers.DEFAULT_SEGMENT, ""),
-            models.zero_shot_classifier_pipeline,
-        )
+async def read_pdf_upload(upload_file: UploadFile) -> bytes:
+    file_name = upload_file.filename
+    _, extension = os.path.splitext(file_name)
+    if not extension.lower() == ".pdf":
+        logging.error(f"The file {file_name} is not a PDF")
+        raise HTTPException(status_code=400, detail="The given file is not a PDF")
 
-        # extract work experience
-        experience = parsers.parse_with_fallback(
-            parsers.parse_work_experience,
-            resume_lines,
-            segments.get("experience", ""),
-            segments.get(Headers.DEFAULT_SEGMENT, ""),
-            models.zero_shot_classifier_pipeline,
-        )
+    # keep the uploaded file in memory, no shared scratch directory
+    pdf_bytes = await upload_file.read()
+    await upload_file.close()
+    if not pdf_bytes:
+        logging.error(f"The file {file_name} is empty")
+        raise HTTPException(status_code=400, detail="The given file is empty")
 
-        # final part
-        metadata = generate_metadata(full_text)
-
-        return ResumeParsingResponse(
-            skills=skills,
-            contact=contact,
-            summary=summary,
-            metadata=metadata,
-            personal=personal,
-            education=education,
-            experience=experience,
-            languages=languages,
-        )
+    return pdf_bytes
 
-    except Exception as e:
-        logging.error(f"Resume Parsing failed : {e}")
-        metadata = generate_metadata(
-            "",
-            remark=Config.MESSAGE_UNCOMPLETED,
-            status=Config.MESSAGE_STATUS_UNSUCCESS,
-        )
-        return ResumeParsingResponse(
-            metadata=metadata,
-        )
 
+def iter_observed_ndjson(results):
+    """Format parsed resumes as NDJSON lines, adding their timings to the metrics."""
+    for parsed_resume, trace in results:
+        METRICS.observe(trace)
+        yield parsed_resume.json() + "\n"
 
-@app.post("/parse_resume/", response_model=ResumeParsingResponse)
-def parse_resume_endpoint(upload_file: UploadFile = File(...)):
-    reader = Reader()
 
-    # save uploaded file into inputs directory
-    logging.info("Cleaning and creating tree for input files")
-    cleaning_and_creating_tree(Config.INPUT_DIRECTORY_PATH)
-    file_name = upload_file.filename
-    _, extension = os.path.splitext(file_name)
-    if not extension.lower() == ".pdf":
-        logging.error(f"The file {file_name} is not a PDF")
-        raise HTTPException(status_code=400, detail="The given file is not a PDF")
-    input_file_saving_path = os.path.join(Config.INPUT_DIRECTORY_PATH, file_name)
-    with open(input_file_saving_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
-    upload_file.file.close()
+async def iter_in_executor(iterator):
+    """
+    Iterate a synchronous generator in the parsing executor, one item per job, so that
+    its CPU-bound work is bounded like the other requests.
+    """
+    loop, done = asyncio.get_running_loop(), object()
+    try:
+        while (
+            item := await loop.run_in_executor(executor, next, iterator, done)
+        ) is not done:
+            yield item
+    finally:
+        # e.g. the client went away, stops the generator and its extraction threads
+        await loop.run_in_executor(executor, iterator.close)
 
-    if not os.path.exists(input_file_saving_path):
-        logging.error("Could not save the PDF file")
-        raise HTTPException(status_code=500, detail="Could not save the PDF file")
 
-    # extract text from PDF file
-    text = reader.pdf_to_text(input_file_saving_path)
+@app.post("/parse_resume/", response_model=ResumeParsingResponse)
+async def parse_resume_endpoint(
+    response: Response, upload_file: UploadFile = File(...)
+):
+    # the time budget includes the upload and the wait for a free parsing worker
+    deadline = Deadline(Config.PARSING_DEADLINE)
+    pdf_bytes = await read_pdf_upload(upload_file)
+
+    loop = asyncio.get_running_loop()
+    parsed_resume, trace = await loop.run_in_executor(
+        executor,
+        partial(parse_pdf, pdf_bytes, upload_file.filename, deadline=deadline),
+    )
+    METRICS.observe(trace)
+    if Config.SERVER_TIMING_HEADER:
+        response.headers["Server-Timing"] = trace.server_timing()
+    return parsed_resume
+
+
+@app.post("/parse_resumes/")
+async def parse_resumes_endpoint(upload_files: list[UploadFile] = File(...)):
+    """
+    Parse several PDF resumes, or zip archives of PDF resumes, streaming one
+    ResumeParsingResponse JSON per line as soon as each resume is parsed.
+    """
+    documents = []
+    for upload_file in upload_files:
+        if upload_file.filename.lower().endswith(".zip"):
+            zip_bytes = await upload_file.read()
+            await upload_file.close()
+            try:
+                documents.extend(iter_zip(zip_bytes))
+            except ZipLimitError as e:
+                logging.error(f"The file {upload_file.filename} is too large : {e}")
+                raise HTTPException(
+                    status_code=413, detail="The given zip file is too large"
+                )
+            except Exception as e:
+                logging.error(
+                    f"The file {upload_file.filename} is not a valid zip : {e}"
+                )
+                raise HTTPException(
+                    status_code=400, detail="The given zip file is not valid"
+                )
+        else:
+            documents.append((upload_file.filename, await read_pdf_upload(upload_file)))
+
+    if Config.USE_WORKER_POOL:
+        # chunks of documents batching their headlines, spread over every worker
+        chunk_size = max(
+            min(Config.BATCH_HEADLINES, -(-len(documents) // worker_processes)), 1
+        )
+        # only waits for the worker processes, iterated in a thread by Starlette
+        ndjson_lines = iter_observed_ndjson(
+            iter_parsed(
+                executor,
+                parse_pdfs_job,
+                documents,
+                chunk_size=chunk_size,
+                window=2 * worker_processes,
+            )
+        )
+    else:
+        # parses in the bounded parsing threads, like single resumes
+        ndjson_lines = iter_in_executor(
+            BatchParser(resume_parser, metrics=METRICS).parse_ndjson(documents)
+        )
 
-    # extract and clean lines layout from doc
-    resume_lines = reader.get_document_lines(text)
+    return StreamingResponse(ndjson_lines, media_type="application/x-ndjson")
 
-    # parse info
-    resume_info = parse_resume(resume_lines)
 
-    return resume_info
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Per-stage parsing timings, in the Prometheus text format."""
+    return PlainTextResponse(
+        METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,168 @@
+import os
+import re
+import pickle
+import hashlib
+import logging
+from collections import deque
+
+from utils import read_csv_list
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def compile_degrees_pattern(degree_abbreviations: list[str]) -> re.Pattern:
+    """
+    Compile a single regex matching any of the given degree abbreviations as a whole word.
+
+    Abbreviations are tried longest first, so that "MHA-MBA" wins over "MHA".
+
+    Args:
+        degree_abbreviations (list[str]): The degree abbreviations.
+
+    Returns:
+        re.Pattern: The compiled alternation.
+    """
+    abbreviations = sorted(
+        set(filter(None, degree_abbreviations)), key=lambda a: (-len(a), a)
+    )
+    return re.compile(
+        r"(?<!\w)(?:" + "|".join(map(re.escape, abbreviations)) + r")(?!\w)"
+    )
+
+
+class SkillMatcher:
+    """
+    An Aho-Corasick automaton matching a list of skills in a single pass over a text.
+
+    Matching is case-insensitive and word-boundary aware: a skill starting
+    (resp. ending) with a word character only matches if it is not preceded
+    (resp. followed) by another word character, so "go" does not match in "google".
+
+    Attributes:
+        patterns (list[str]): The lowercased skills, indexed by their pattern id.
+        checksum (str): The checksum of the skills source the automaton was built from.
+    """
+
+    def __init__(self, patterns: list[str], checksum: str = ""):
+        self.patterns = list(
+            dict.fromkeys(p for skill in patterns if (p := skill.strip().lower()))
+        )
+        self.checksum = checksum
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+        self._build()
+
+    def _build(self) -> None:
+        # trie of all patterns
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if (next_state := self._goto[state].get(char)) is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append(pattern_id)
+
+        # failure links, breadth first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._outputs[next_state].extend(self._outputs[self._fail[next_state]])
+
+    def find_all(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        Find all skills occurring in the given text.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            list[tuple[int, int, str]]: (start, end, skill) offsets of each match, ordered by end offset.
+        """
+        text = text.lower()
+        goto, fail, outputs, patterns = (
+            self._goto,
+            self._fail,
+            self._outputs,
+            self.patterns,
+        )
+        matches, state = [], 0
+        for idx, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in outputs[state]:
+                pattern = patterns[pattern_id]
+                start, end = idx - len(pattern) + 1, idx + 1
+                if (
+                    is_word_char(pattern[0])
+                    and start > 0
+                    and is_word_char(text[start - 1])
+                ) or (
+                    is_word_char(pattern[-1])
+                    and end < len(text)
+                    and is_word_char(text[end])
+                ):
+                    continue
+                matches.append((start, end, pattern))
+
+        return matches
+
+    @classmethod
+    def load_or_build(cls, skills_csv_path: str, automaton_path: str):
+        """
+        Load the serialized automaton, or build it from the skills CSV and serialize it.
+
+        The automaton is rebuilt whenever the skills CSV content changed.
+
+        Args:
+            skills_csv_path (str): The path to the skills CSV.
+            automaton_path (str): The path of the serialized automaton.
+
+        Returns:
+            SkillMatcher: The skills matcher.
+        """
+        try:
+            with open(skills_csv_path, "rb") as f:
+                checksum = hashlib.sha1(f.read()).hexdigest()
+        except OSError as e:
+            logging.error(f"Failed to read file {skills_csv_path} : {e}")
+            checksum = ""
+
+        if os.path.isfile(automaton_path):
+            try:
+                with open(automaton_path, "rb") as f:
+                    matcher = pickle.load(f)
+                if isinstance(matcher, cls) and matcher.checksum == checksum:
+                    return matcher
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+                logging.error(f"Failed to load automaton {automaton_path} : {e}")
+
+        logging.info(f"Building skills automaton from {skills_csv_path}")
+        matcher = cls(read_csv_list(skills_csv_path), checksum=checksum)
+        try:
+            # a name of its own per process, several workers may build at once
+            tmp_path = f"{automaton_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, automaton_path)
+        except OSError as e:
+            logging.error(f"Failed to save automaton {automaton_path} : {e}")
+
+        return matcher
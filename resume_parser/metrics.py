@@ -0,0 +1,266 @@
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from config import Config
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+# the trace of the resume being parsed in the current thread or task
+_current_trace: ContextVar["StageTrace | None"] = ContextVar(
+    "current_trace", default=None
+)
+
+
+@dataclass
+class StageTiming:
+    """
+    The cumulated timings of a parsing stage, for one resume.
+
+    Attributes:
+        wall_ms (float): Elapsed time in milliseconds.
+        cpu_ms (float): CPU time of the calling thread in milliseconds
+            (ONNX Runtime's own threads are not included).
+        calls (int): Number of times the stage ran.
+        nli_inferences (int): Number of lines the NLI model classified during the stage.
+    """
+
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    calls: int = 0
+    nli_inferences: int = 0
+
+
+@dataclass
+class StageTrace:
+    """
+    The per-stage timings of the parsing of one resume.
+
+    It is filled by the pipeline, and picklable so that worker processes
+    can send it back along with the parsed resume.
+
+    Attributes:
+        stages (dict[str, StageTiming]): Timings of each stage, in running order.
+        failed_stage (str | None): The stage that raised, if any.
+    """
+
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+    failed_stage: str | None = None
+    _running: list[str] = field(default_factory=list, repr=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageTiming]:
+        """
+        Time a stage of the parsing.
+
+        Args:
+            name (str): The stage name.
+
+        Yields:
+            StageTiming: The cumulated timings of the stage.
+        """
+        timing = self.stages.setdefault(name, StageTiming())
+        self._running.append(name)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield timing
+        except Exception:
+            if self.failed_stage is None:
+                self.failed_stage = name
+            raise
+        finally:
+            timing.wall_ms += (time.perf_counter() - wall_start) * 1000
+            timing.cpu_ms += (time.thread_time() - cpu_start) * 1000
+            timing.calls += 1
+            self._running.pop()
+
+    def add_nli_inferences(self, count: int) -> None:
+        """Count NLI inferences in the innermost running stage."""
+        if self._running:
+            self.stages[self._running[-1]].nli_inferences += count
+
+    @property
+    def wall_ms(self) -> float:
+        """Total elapsed time of the stages, which run one after the other."""
+        return sum(timing.wall_ms for timing in self.stages.values())
+
+    def server_timing(self) -> str:
+        """
+        Format the stages wall times as a Server-Timing header value.
+
+        Returns:
+            str: e.g. "segmentation;dur=1.2, skills;dur=0.4"
+        """
+        return ", ".join(
+            f"{name};dur={timing.wall_ms:.1f}" for name, timing in self.stages.items()
+        )
+
+
+@contextmanager
+def tracing(trace: "StageTrace | None") -> Iterator["StageTrace | None"]:
+    """Make a trace the current one, within the block."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def record_nli_inferences(count: int) -> None:
+    """Count NLI inferences in the running stage of the current trace, if any."""
+    if count and (trace := _current_trace.get()) is not None:
+        trace.add_nli_inferences(count)
+
+
+def run_traced(function: Callable, *args, **kwargs) -> tuple[Any, StageTrace]:
+    """
+    Call a pipeline function with a new trace.
+
+    Args:
+        function (Callable): A function taking a `trace` keyword argument.
+
+    Returns:
+        tuple[Any, StageTrace]: The function result and the filled trace.
+    """
+    trace = StageTrace()
+    return function(*args, trace=trace, **kwargs), trace
+
+
+class MetricsRegistry:
+    """
+    Process-wide parsing metrics, rendered in the Prometheus text format.
+
+    Attributes:
+        buckets (tuple[float]): Upper bounds, in seconds, of the latency histograms buckets.
+    """
+
+    def __init__(self, buckets: tuple[float] = Config.METRICS_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._requests: dict[str, int] = {}
+        self._parse_histogram = self._new_histogram()
+        self._stage_histograms: dict[str, dict] = {}
+        self._stage_counters: dict[str, dict[str, float]] = {}
+        self._stage_failures: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _new_histogram(self) -> dict:
+        return {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+
+    def _observe(self, histogram: dict, seconds: float) -> None:
+        histogram["counts"][bisect_left(self.buckets, seconds)] += 1
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+    def observe(self, trace: StageTrace) -> None:
+        """
+        Add the timings of a parsed resume.
+
+        Args:
+            trace (StageTrace): The trace of the resume parsing.
+        """
+        status = (
+            Config.MESSAGE_STATUS_SUCCESS
+            if trace.failed_stage is None
+            else Config.MESSAGE_STATUS_UNSUCCESS
+        )
+        with self._lock:
+            self._requests[status] = self._requests.get(status, 0) + 1
+            self._observe(self._parse_histogram, trace.wall_ms / 1000)
+            for name, timing in trace.stages.items():
+                self._observe(
+                    self._stage_histograms.setdefault(name, self._new_histogram()),
+                    timing.wall_ms / 1000,
+                )
+                counters = self._stage_counters.setdefault(
+                    name, {"cpu_seconds": 0.0, "calls": 0, "nli_inferences": 0}
+                )
+                counters["cpu_seconds"] += timing.cpu_ms / 1000
+                counters["calls"] += timing.calls
+                counters["nli_inferences"] += timing.nli_inferences
+            if trace.failed_stage is not None:
+                self._stage_failures[trace.failed_stage] = (
+                    self._stage_failures.get(trace.failed_stage, 0) + 1
+                )
+
+    def _render_histogram(
+        self, name: str, histogram: dict, labels: str = ""
+    ) -> list[str]:
+        lines, cumulated = [], 0
+        separator = "," if labels else ""
+        for bound, count in zip((*self.buckets, "+Inf"), histogram["counts"]):
+            cumulated += count
+            lines.append(
+                f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulated}'
+            )
+        braces = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{braces} {histogram['sum']}")
+        lines.append(f"{name}_count{braces} {histogram['count']}")
+        return lines
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics.
+        """
+        with self._lock:
+            lines = [
+                "# HELP resume_parser_requests_total Parsed resumes, by status.",
+                "# TYPE resume_parser_requests_total counter",
+                *(
+                    f'resume_parser_requests_total{{status="{status}"}} {count}'
+                    for status, count in self._requests.items()
+                ),
+                "# HELP resume_parser_parse_duration_seconds Time spent parsing a resume.",
+                "# TYPE resume_parser_parse_duration_seconds histogram",
+                *self._render_histogram(
+                    "resume_parser_parse_duration_seconds", self._parse_histogram
+                ),
+                "# HELP resume_parser_stage_duration_seconds Time spent in a parsing stage.",
+                "# TYPE resume_parser_stage_duration_seconds histogram",
+            ]
+            for stage, histogram in self._stage_histograms.items():
+                lines.extend(
+                    self._render_histogram(
+                        "resume_parser_stage_duration_seconds",
+                        histogram,
+                        f'stage="{stage}"',
+                    )
+                )
+
+            for counter, help_text in (
+                ("cpu_seconds", "CPU time of the parsing thread in a parsing stage."),
+                ("calls", "Runs of a parsing stage."),
+                (
+                    "nli_inferences",
+                    "Lines classified by the NLI model in a parsing stage.",
+                ),
+            ):
+                name = f"resume_parser_stage_{counter}_total"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for stage, counters in self._stage_counters.items():
+                    lines.append(f'{name}{{stage="{stage}"}} {counters[counter]}')
+
+            lines.append(
+                "# HELP resume_parser_stage_failures_total Resumes whose parsing failed in a stage."
+            )
+            lines.append("# TYPE resume_parser_stage_failures_total counter")
+            for stage, count in self._stage_failures.items():
+                lines.append(
+                    f'resume_parser_stage_failures_total{{stage="{stage}"}} {count}'
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+# metrics of the resumes parsed by this process
+METRICS = MetricsRegistry()
@@ -1,7 +1,7 @@
 import os
 import logging
 from typing import Union
-import spacy
+import onnxruntime
 from transformers import AutoTokenizer, pipeline
 from optimum.onnxruntime import (
     ORTQuantizer,
@@ -10,12 +10,26 @@ from optimum.onnxruntime import (
 )
 from optimum.onnxruntime.configuration import AutoQuantizationConfig
 from config import Config
+from classifier import CachedZeroShotClassifier
 
 logging.basicConfig(
     format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
 )
 
 
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    "sequential": onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": onnxruntime.ExecutionMode.ORT_PARALLEL,
+}
+
+
 class ModelHandlingError(Exception):
     """Custom exception class for handling model loading/converting errors."""
 
@@ -30,8 +44,17 @@ class Models:
         nli_model_tag (str): The model tag for the NLI model.
         ner_model_skills_dir (str): The directory containing the NER model for skills.
         nli_model_onnx (ORTModelForSequenceClassification): The loaded NLI model.
-        zero_shot_classifier (pipeline): The zero-shot classification pipeline with the quantized NLI model.
+        zero_shot_classifier (pipeline): The zero-shot classification pipeline with the quantized NLI model,
+            behind a process-wide results cache unless Config.NLI_CACHE_SIZE is 0.
         ner_for_skills (spacy.Language): The loaded NER model for skills extraction.
+        intra_op_num_threads (int | None): ONNX Runtime threads used inside an operator, None for its default.
+        inter_op_num_threads (int | None): ONNX Runtime threads used across operators, None for its default.
+        graph_optimization_level (str): ONNX Runtime graph optimization level, one of GRAPH_OPTIMIZATION_LEVELS.
+        execution_mode (str): ONNX Runtime operators execution mode, one of EXECUTION_MODES.
+        enable_cpu_mem_arena (bool): Whether ONNX Runtime pre-allocates memory in an arena.
+        enable_mem_pattern (bool): Whether ONNX Runtime plans memory from the first run allocations.
+        cache_optimized_model (bool): Whether to serialize the optimized graphs on first load, and load them afterwards.
+        allow_quantization (bool): Whether to export and quantize missing models, instead of failing.
     """
 
     def __init__(
@@ -39,24 +62,41 @@ class Models:
         nli_model_name: str = Config.NLI_MODEL_DIR,
         ner_model_name: str = Config.NER_MODEL_DIR,
         ner_model_skills_dir: str = Config.NER_MODEL_SKILLS_DIR,
+        intra_op_num_threads: int | None = Config.ORT_INTRA_OP_NUM_THREADS,
+        inter_op_num_threads: int | None = Config.ORT_INTER_OP_NUM_THREADS,
+        graph_optimization_level: str = Config.ORT_GRAPH_OPTIMIZATION_LEVEL,
+        execution_mode: str = Config.ORT_EXECUTION_MODE,
+        enable_cpu_mem_arena: bool = Config.ORT_ENABLE_CPU_MEM_ARENA,
+        enable_mem_pattern: bool = Config.ORT_ENABLE_MEM_PATTERN,
+        cache_optimized_model: bool = Config.ORT_CACHE_OPTIMIZED_MODEL,
+        allow_quantization: bool = Config.ALLOW_RUNTIME_QUANTIZATION,
     ):
         self.nli_model_name = nli_model_name
         self.ner_model_name = ner_model_name
         self.ner_model_skills_dir = ner_model_skills_dir
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        if graph_optimization_level not in GRAPH_OPTIMIZATION_LEVELS:
+            raise ModelHandlingError(
+                f"Unknown graph optimization level {graph_optimization_level}"
+            )
+        if execution_mode not in EXECUTION_MODES:
+            raise ModelHandlingError(f"Unknown execution mode {execution_mode}")
+        self.graph_optimization_level = graph_optimization_level
+        self.execution_mode = execution_mode
+        self.enable_cpu_mem_arena = enable_cpu_mem_arena
+        self.enable_mem_pattern = enable_mem_pattern
+        self.cache_optimized_model = cache_optimized_model
 
         logging.info("Starting models loading...")
-        # Load the NLI model and quantize it (if not done already)
-        if not os.path.isfile(
-            os.path.join(
-                Config.QUANTIZED_NLI_MODEL_DIR, Config.QUANTIZED_NLI_MODEL_ONNX
-            )
-        ):
-            self.nli_model_onnx = self.load_model(
-                self.nli_model_name, ORTModelForSequenceClassification
-            )
-            self.quantize_and_save_model(
-                self.nli_model_onnx, Config.QUANTIZED_NLI_MODEL_DIR
-            )
+        # Check the NLI model is quantized (or quantize it, if allowed)
+        self.ensure_quantized_model(
+            self.nli_model_name,
+            ORTModelForSequenceClassification,
+            Config.QUANTIZED_NLI_MODEL_DIR,
+            Config.QUANTIZED_NLI_MODEL_ONNX,
+            allow_quantization,
+        )
 
         # Load the quantized NLI model as a zero-shot classifier
         self.zero_shot_classifier_pipeline = self.load_quantized_model(
@@ -65,19 +105,19 @@ class Models:
             ORTModelForSequenceClassification,
             "zero-shot-classification",
         )
-
-        if not os.path.isfile(
-            os.path.join(
-                Config.QUANTIZED_NER_MODEL_DIR, Config.QUANTIZED_NER_MODEL_ONNX
-            )
-        ):
-            self.ner_model_onnx = self.load_model(
-                self.ner_model_name, ORTModelForTokenClassification
-            )
-            self.quantize_and_save_model(
-                self.ner_model_onnx, Config.QUANTIZED_NER_MODEL_DIR
+        if Config.NLI_CACHE_SIZE > 0:
+            self.zero_shot_classifier_pipeline = CachedZeroShotClassifier(
+                self.zero_shot_classifier_pipeline
             )
 
+        self.ensure_quantized_model(
+            self.ner_model_name,
+            ORTModelForTokenClassification,
+            Config.QUANTIZED_NER_MODEL_DIR,
+            Config.QUANTIZED_NER_MODEL_ONNX,
+            allow_quantization,
+        )
+
         # Load generic NER pipeline
         self.ner_pipeline = self.load_quantized_model(
             Config.QUANTIZED_NER_MODEL_DIR,
@@ -90,7 +130,50 @@ class Models:
         # self.ner_for_skills = spacy.load(self.ner_model_skills_dir)
         logging.info("Successfully loaded all models ✔")
 
-    def load_model(self, model_name, ORTModel):
+    def save_caches(self) -> None:
+        """
+        Persist the NLI results cache to disk, if enabled.
+        """
+        if isinstance(self.zero_shot_classifier_pipeline, CachedZeroShotClassifier):
+            logging.info(
+                f"NLI cache stats : {self.zero_shot_classifier_pipeline.stats()}"
+            )
+            self.zero_shot_classifier_pipeline.save()
+
+    @classmethod
+    def ensure_quantized_model(
+        cls,
+        model_name: str,
+        ORTModel,
+        save_dir: str,
+        model_file_name: str,
+        allow_quantization: bool = True,
+    ) -> None:
+        """
+        Export and quantize a model, unless its quantized version already exists.
+
+        Args:
+            model_name (str): The model to export to ONNX format.
+            ORTModel (type): The ONNX Runtime model class.
+            save_dir (str): The directory of the quantized model.
+            model_file_name (str): The ONNX file name of the quantized model.
+            allow_quantization (bool, optional): Whether to quantize a missing model, instead of failing.
+
+        Raises:
+            ModelHandlingError: If the quantized model is missing and quantization is not allowed.
+        """
+        model_path = os.path.join(save_dir, model_file_name)
+        if os.path.isfile(model_path):
+            return
+        if not allow_quantization:
+            raise ModelHandlingError(
+                f"Missing quantized model {model_path}, build it first with `python build_artifacts.py`"
+            )
+
+        cls.quantize_and_save_model(cls.load_model(model_name, ORTModel), save_dir)
+
+    @staticmethod
+    def load_model(model_name, ORTModel):
         """
         Load model and convert it to ONNX format.
 
@@ -104,8 +187,8 @@ class Models:
         except Exception as e:
             raise ModelHandlingError(f"Failed to load NLI model: {e}")
 
+    @staticmethod
     def quantize_and_save_model(
-        self,
         model_onnx,
         save_dir,
     ) -> None:
@@ -133,21 +216,90 @@ class Models:
         except Exception as e:
             raise ModelHandlingError(f"Failed Quantization of model {model_onnx}: {e}")
 
+    def get_session_options(
+        self, graph_optimization_level: str | None = None
+    ) -> onnxruntime.SessionOptions:
+        """
+        Build the ONNX Runtime session options shared by the quantized models.
+
+        Args:
+            graph_optimization_level (str, optional): Overrides the graph optimization level of the models.
+
+        Returns:
+            onnxruntime.SessionOptions: The session options.
+        """
+        session_options = onnxruntime.SessionOptions()
+        if self.intra_op_num_threads:
+            session_options.intra_op_num_threads = self.intra_op_num_threads
+        if self.inter_op_num_threads:
+            session_options.inter_op_num_threads = self.inter_op_num_threads
+        session_options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[
+            graph_optimization_level or self.graph_optimization_level
+        ]
+        session_options.execution_mode = EXECUTION_MODES[self.execution_mode]
+        session_options.enable_cpu_mem_arena = self.enable_cpu_mem_arena
+        session_options.enable_mem_pattern = self.enable_mem_pattern
+        return session_options
+
+    def get_optimized_model_file_name(self, model_file_name: str) -> str:
+        """
+        Name the serialized optimized graph of a model, after the optimization level.
+
+        Args:
+            model_file_name (str): The ONNX file name of the model.
+
+        Returns:
+            str: The ONNX file name of the optimized graph, e.g. model_quantized_optimized_extended.onnx
+        """
+        stem, extension = os.path.splitext(model_file_name)
+        return f"{stem}_optimized_{self.graph_optimization_level}{extension}"
+
     def load_quantized_model(
         self, save_dir, model_file_name, ORTModel, type
     ) -> Union[pipeline, None]:
         """
         Load the quantized model and create a zero-shot classification pipeline.
 
+        With `cache_optimized_model`, the graph optimized on first load is serialized
+        next to the quantized model, then loaded as is on later startups. It is written
+        under a name of its own by each process, then renamed, so that worker processes
+        starting together never load a half written graph.
+
         Returns:
             pipeline: The zero-shot or token classification pipeline using quantized model
         """
         try:
             tokenizer = AutoTokenizer.from_pretrained(save_dir)
+            session_options = self.get_session_options()
+            optimized_file_name = self.get_optimized_model_file_name(model_file_name)
+            optimized_path = os.path.join(save_dir, optimized_file_name)
+            serialized_path = None
+            if (
+                self.cache_optimized_model
+                and self.graph_optimization_level != "disable"
+            ):
+                model_path = os.path.join(save_dir, model_file_name)
+                if os.path.isfile(optimized_path) and os.path.getmtime(
+                    optimized_path
+                ) >= os.path.getmtime(model_path):
+                    # the graph is already optimized, and newer than the quantized model
+                    logging.info(f"Loading optimized graph {optimized_path}")
+                    model_file_name = optimized_file_name
+                    session_options = self.get_session_options("disable")
+                else:
+                    logging.info(f"Serializing optimized graph to {optimized_path}")
+                    # ONNX Runtime picks the format from the extension, kept last
+                    stem, extension = os.path.splitext(optimized_path)
+                    serialized_path = f"{stem}.{os.getpid()}.tmp{extension}"
+                    session_options.optimized_model_filepath = serialized_path
+
             q_model = ORTModel.from_pretrained(
                 save_dir,
                 file_name=model_file_name,
+                session_options=session_options,
             )
+            if serialized_path is not None and os.path.isfile(serialized_path):
+                os.replace(serialized_path, optimized_path)
             nlp_pipeline = pipeline(type, model=q_model, tokenizer=tokenizer)
             return nlp_pipeline
         except Exception as e:
@@ -0,0 +1,183 @@
+import re
+import logging
+from typing import TYPE_CHECKING
+
+from config import Config
+from deadlines import Deadline
+
+if TYPE_CHECKING:
+    from transformers import pipeline
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+RE_WORDS = re.compile(r"\S+")
+
+
+def token_offsets(text: str, tokenizer=None) -> list[tuple[int, int]]:
+    """
+    Get the character spans of the tokens of a text.
+
+    Args:
+        text (str): The input text.
+        tokenizer (PreTrainedTokenizerFast, optional): The NER model tokenizer, the
+            text is split on whitespace without it.
+
+    Returns:
+        list[tuple[int, int]]: The (start, end) offsets of each token, special tokens excluded.
+    """
+    if tokenizer is None:
+        return [match.span() for match in RE_WORDS.finditer(text)]
+    encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+    return encoding["offset_mapping"]
+
+
+def window_spans(
+    text: str,
+    offsets: list[tuple[int, int]],
+    max_tokens: int = Config.HEADLINE_MAX_TOKENS,
+    window_tokens: int = Config.HEADLINE_WINDOW_TOKENS,
+    stride: int = Config.HEADLINE_WINDOW_STRIDE,
+) -> list[tuple[int, int]]:
+    """
+    Split the first tokens of a text into overlapping windows.
+
+    Windows are widened to whole words, so that a word split into sub-tokens is never
+    cut, and overlap by `stride` tokens, so that an entity cut at the end of a window
+    is whole in the next one.
+
+    Args:
+        text (str): The input text.
+        offsets (list[tuple[int, int]]): The character spans of its tokens.
+        max_tokens (int, optional): Tokens after the first ones are ignored.
+        window_tokens (int, optional): Number of tokens of each window.
+        stride (int, optional): Number of tokens shared by consecutive windows.
+
+    Returns:
+        list[tuple[int, int]]: The (start, end) character offsets of each window.
+    """
+    offsets = offsets[:max_tokens]
+    spans = []
+    for first in range(0, len(offsets), window_tokens - stride):
+        last = min(first + window_tokens, len(offsets)) - 1
+        start = text.rfind(" ", 0, offsets[first][0]) + 1
+        end = text.find(" ", offsets[last][1])
+        spans.append((start, len(text) if end == -1 else end))
+        if last == len(offsets) - 1:
+            break
+    return spans
+
+
+def merge_entities(entities: list[dict]) -> list[dict]:
+    """
+    Merge the entities found by overlapping windows.
+
+    An entity found twice by two windows is kept once, and an entity truncated by
+    the end of a window gives way to the longer one found by the next window.
+
+    Args:
+        entities (list[dict]): Aggregated entities, with offsets in the whole text.
+
+    Returns:
+        list[dict]: The entities, without overlaps, in text order.
+    """
+    merged = []
+    for entity in sorted(
+        entities, key=lambda e: (e["start"], e["start"] - e["end"], -e["score"])
+    ):
+        if merged and entity["start"] < merged[-1]["end"]:
+            if (
+                entity["end"] - entity["start"]
+                > merged[-1]["end"] - merged[-1]["start"]
+            ):
+                merged[-1] = entity
+            continue
+        merged.append(entity)
+    return merged
+
+
+def recognize_entities(
+    texts: list[str],
+    ner_pipeline: "pipeline",
+    max_tokens: int = Config.HEADLINE_MAX_TOKENS,
+    window_tokens: int = Config.HEADLINE_WINDOW_TOKENS,
+    stride: int = Config.HEADLINE_WINDOW_STRIDE,
+    batch_size: int = Config.NER_BATCH_SIZE,
+    deadline: Deadline | None = None,
+) -> list[list[dict]]:
+    """
+    Find the named entities of several texts with a single batched NER inference.
+
+    Each text is bounded to its first `max_tokens` tokens and split into windows short
+    enough to never be truncated by the model, the windows of all the texts being run
+    together, `batch_size` per ONNX forward pass.
+
+    With a bounded deadline, windows are run `batch_size` at a time in order, and the
+    remaining windows are left out once the deadline is expired.
+
+    Args:
+        texts (list[str]): The input texts, e.g. the headlines of several resumes.
+        ner_pipeline (pipeline): A token classification pipeline.
+        max_tokens (int, optional): Tokens after the first ones of a text are ignored.
+        window_tokens (int, optional): Number of tokens of each window.
+        stride (int, optional): Number of tokens shared by consecutive windows.
+        batch_size (int, optional): Number of windows per ONNX forward pass.
+        deadline (Deadline, optional): The time budget of the recognition.
+
+    Returns:
+        list[list[dict]]: The entities aggregated with the "simple" strategy, for each
+            text, with their offsets in the text, only from the windows run in time.
+    """
+    if not 0 <= stride < window_tokens:
+        raise ValueError(
+            f"The windows stride {stride} must be less than their size {window_tokens}"
+        )
+
+    tokenizer = getattr(ner_pipeline, "tokenizer", None)
+    windows = []
+    for text_idx, text in enumerate(texts):
+        offsets = token_offsets(text, tokenizer)
+        if len(offsets) > max_tokens:
+            logging.info(f"Headline of {len(offsets)} tokens cut to {max_tokens}")
+        windows.extend(
+            (text_idx, start, text[start:end])
+            for start, end in window_spans(
+                text, offsets, max_tokens, window_tokens, stride
+            )
+        )
+
+    entities = [[] for _ in texts]
+    if not windows:
+        return entities
+
+    chunk_size = (
+        batch_size if deadline is not None and deadline.bounded else len(windows)
+    )
+    for chunk_start in range(0, len(windows), chunk_size):
+        if deadline is not None and deadline.expired():
+            logging.warning(
+                f"Ran {chunk_start} of {len(windows)} NER windows in the time budget"
+            )
+            break
+        chunk = windows[chunk_start : chunk_start + chunk_size]
+
+        results = ner_pipeline(
+            [window for _, _, window in chunk],
+            aggregation_strategy="simple",
+            batch_size=batch_size,
+        )
+        # a single window may not come back wrapped in a list
+        if results and isinstance(results[0], dict):
+            results = [results]
+        for (text_idx, start, _), window_entities in zip(chunk, results):
+            entities[text_idx].extend(
+                {
+                    **entity,
+                    "start": entity["start"] + start,
+                    "end": entity["end"] + start,
+                }
+                for entity in window_entities
+            )
+
+    return [merge_entities(text_entities) for text_entities in entities]
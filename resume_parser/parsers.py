@@ -1,23 +1,35 @@
+import os
 import re
 import logging
-import pycountry
+import threading
 import phonenumbers
-from datetime import datetime
 from urlextract import URLExtract
 from nameparser import HumanName
-from transformers import pipeline
+from typing import TYPE_CHECKING
 import gender_guesser.detector as gender
 
 from config import Config
+from classifier import ClassificationMemo, classify_lines
+from matchers import SkillMatcher, compile_degrees_pattern
+from dates import DateIndex
+from segmenter import Segment
+from deadlines import Deadline
+from ner import recognize_entities
+from lookups import (
+    LanguageIndex,
+    get_language_index,
+    get_country_resolver,
+    get_gazetteer,
+)
 from utils import (
     get_max_element,
     find_location_entities,
     get_country_code,
     filter_stopwords,
+    get_stopwords,
+    get_transliteration_table,
     timedelta_in_months,
     # get_gender_from_firstname,
-    group_elements_by_index,
-    filter_dates_for_a_segment,
     merge_doubled_words,
     read_csv_list,
 )
@@ -33,23 +45,67 @@ from data_models import (
     SummaryData,
 )
 
+if TYPE_CHECKING:
+    from transformers import pipeline
+
 logging.basicConfig(
     format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
 )
 
 DEGREES = read_csv_list(Config.DEGREES_ABBREVIATIONS_CSV)
-SKILLS = read_csv_list(Config.SKILLS_CSV)
+DEGREES_PATTERN = compile_degrees_pattern(DEGREES)
+SKILLS_MATCHER = SkillMatcher.load_or_build(Config.SKILLS_CSV, Config.SKILLS_AUTOMATON)
 logging.info("Successfully loaded other resources ✔")
 
 RE_PHONE_NUMBERS = r"(\d{3}[-\.\s]??\d{3}[-\.\s]??\d{4}|\(\d{3}\)\s*\d{3}[-\.\s]??\d{4}|\d{3}[-\.\s]??\d{4})"
 RE_MAIL = r"([^@|\s]+@[^@]+\.[^@|\s]+)"
-# for numerical and non_numerical months
-RE_DATES = r"(\b\d{1,2}[-/](?:\d{1,2}|[a-zA-Z]+)[-/]\d{2,4}\b|\b\d{1,2}[-/]\d{2,4}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?:\d{1,2},?\s+)?\d{2,4}\b|\b\d{4}\b)"
 
 
 class Parsers:
-    # def __init__(self,):
-    # self.gender_detector = gender.Detector(case_sensitive=False)
+    # long-lived URL extractor, shared by all instances and threads
+    _url_extractor: URLExtract | None = None
+    _url_extractor_lock = threading.Lock()
+
+    def __init__(self, prewarm: bool = Config.PREWARM_PARSERS):
+        # self.gender_detector = gender.Detector(case_sensitive=False)
+        if prewarm:
+            self.prewarm()
+
+    def prewarm(self) -> None:
+        """
+        Load the resources lazily built by the parsers, so the first request doesn't pay for it.
+        """
+        self.get_url_extractor()
+        get_language_index()
+        get_country_resolver()
+        get_stopwords()
+        get_transliteration_table()
+        get_transliteration_table(keep_scripts=True)
+        if Config.LOCATION_RESOLVER == "gazetteer":
+            get_gazetteer()
+        logging.info("Successfully prewarmed parsers ✔")
+
+    @classmethod
+    def get_url_extractor(cls) -> URLExtract:
+        """
+        Get the shared URL extractor, creating it on first use.
+
+        Its TLD list is read once from Config.URLEXTRACT_CACHE_DIR if it holds one,
+        otherwise from the list bundled with urlextract. It is never updated from the network.
+
+        Returns:
+            URLExtract: The URL extractor.
+        """
+        if cls._url_extractor is None:
+            with cls._url_extractor_lock:
+                if cls._url_extractor is None:
+                    cache_dir = Config.URLEXTRACT_CACHE_DIR
+                    cls._url_extractor = (
+                        URLExtract(cache_dns=False, cache_dir=cache_dir)
+                        if cache_dir and os.path.isdir(cache_dir)
+                        else URLExtract(cache_dns=False)
+                    )
+        return cls._url_extractor
 
     def parse_phone_number(self, text: str, possible_country: str | None = None) -> str:
         """
@@ -94,6 +150,7 @@ class Parsers:
                 return [{"value": email.split()[0].strip(";")} for email in emails]
             except IndexError:
                 return [{"value": ""}]
+        return []
 
     def parse_url(self, text: str) -> str:
         """
@@ -105,12 +162,35 @@ class Parsers:
         Returns:
             List[str]: A list of extracted URLs.
         """
-        extractor = URLExtract()
+        extractor = self.get_url_extractor()
 
-        return urls[:1] if (urls := extractor.find_urls(text)) else ""
+        return extractor.find_urls(text)[:1]
 
-    def parse_headline(self, text, ner_pipeline):
-        entities = ner_pipeline(text, aggregation_strategy="simple")
+    def parse_headline(self, text, ner_pipeline, deadline: Deadline | None = None):
+        return self.parse_headlines([text], ner_pipeline, deadline=deadline)[0]
+
+    def parse_headlines(
+        self, texts: list[str], ner_pipeline, deadline: Deadline | None = None
+    ) -> list[tuple[str, SummaryData]]:
+        """
+        Find the name and current job designation of several resumes, with a single
+        batched NER inference over their bounded and windowed headlines.
+
+        Args:
+            texts (list[str]): The headline of each resume.
+            ner_pipeline (pipeline): The NER pipeline.
+            deadline (Deadline, optional): The time budget, after which only the entities
+                of the windows already run are kept.
+
+        Returns:
+            list[tuple[str, SummaryData]]: The name and summary of each resume.
+        """
+        return [
+            self.headline_from_entities(entities)
+            for entities in recognize_entities(texts, ner_pipeline, deadline=deadline)
+        ]
+
+    def headline_from_entities(self, entities):
         name, designation = "", ""
         for ent in entities:
             if ent["entity_group"] == Config.DESIGNATION_TAG:
@@ -150,114 +230,155 @@ class Parsers:
             website=website,
         )
 
-    def parse_languages(self, text: str, min_language_length=3):
-        # Get a list of language names
-        lang2code = {lang.name: lang.alpha_3 for lang in pycountry.languages}
-        languages = list(lang2code.keys())
+    def parse_languages(
+        self,
+        text: str,
+        min_language_length: int = 3,
+        language_index: LanguageIndex | None = None,
+    ) -> LanguagesData:
+        """
+        Detect the languages mentioned in a text.
 
-        # Tokenize the text into words
-        words = re.findall(r"\b\w+\b", text)
+        Args:
+            text (str): The input text.
+            min_language_length (int): Minimum length of a language name to be considered valid.
+            language_index (LanguageIndex, optional): Index of language names. Defaults to the pycountry one.
 
-        # Find the intersection of words and languages (case-insensitive)
-        detected_languages = list(
-            set(
-                word
-                for word in words
-                if word.lower() in (lang.lower() for lang in languages)
-            )
-        )
+        Returns:
+            LanguagesData: The detected languages.
+        """
+        language_index = language_index or get_language_index()
 
         return LanguagesData(
             languages=[
-                {"code": lang2code.get(lang, ""), "name": lang, "description": ""}
-                for lang in detected_languages
-                if lang2code.get(lang) and len(lang) >= min_language_length
+                {"code": code, "name": name, "description": ""}
+                for name, code in language_index.find(text)
+                if len(name) >= min_language_length
             ]
         )
 
-    def parse_dates(self, lines: list[str]) -> list[tuple[str, int]]:
+    def parse_dates(self, lines: list[str]) -> DateIndex:
         """
-        Parse dates from a list of text lines.
+        Find the dates of a resume, in a single pass over its lines.
 
         Args:
             lines (list[str]): List of text lines.
 
         Returns:
-            dates (list[tuple[str, int]]): A list of tuples containing parsed dates and their positions.
-        """
-        dates = []
-        for idx, line in enumerate(lines):
-            # Replace "Present" or other mentions with today's date
-            for now_word in Config.PRESENT_KEYWORDS:
-                line = line.lower().replace(
-                    now_word, datetime.today().strftime("%d/%m/%Y")
-                )
+            DateIndex: The normalized dates with their line and character positions.
+        """
+        return DateIndex(lines)
 
-            # Find all substrings that look like dates and their positions
-            potential_dates = [(m.group(), idx) for m in re.finditer(RE_DATES, line)]
-            dates.extend(potential_dates)
+    def get_dates_for_segment(
+        self,
+        resume_lines: list[str],
+        segment: Segment | str,
+        date_index: DateIndex | None = None,
+    ) -> list[tuple[tuple[str, int], tuple[str, int]]]:
+        """
+        Get the start and end dates lying in a segment of the resume.
 
-        # Sort the dates by their position in the input string
-        dates.sort(key=lambda x: x[1])
+        Args:
+            resume_lines (list[str]): List of text lines.
+            segment (Segment | str): The segment, or its text.
+            date_index (DateIndex, optional): The dates of the resume, found once for all segments.
 
-        return dates
+        Returns:
+            list[tuple[tuple[str, int], tuple[str, int]]]: The "%m/%Y" start and end dates,
+                with the index of their line.
+        """
+        date_index = date_index or self.parse_dates(resume_lines)
+        return date_index.dates_for_segment(segment)
+
+    def parse_location(self, text: str) -> tuple[str, str, str]:
+        """
+        Parse the cities, the country and its code from a location text.
 
-    def get_dates_for_segment(self, resume_lines, segment_text):
-        dates = self.parse_dates(resume_lines)
-        groups_of_dates = group_elements_by_index(dates) if dates else []
+        Args:
+            text (str): The input text.
+
+        Returns:
+            tuple[str, str, str]: The comma-separated cities, the first country and its alpha_2 code.
+        """
+        try:
+            place_entity = find_location_entities(text)
+            city = ", ".join(cities) if (cities := place_entity.cities) else ""
+            country = countries[0] if (countries := place_entity.countries) else ""
+            country_code = get_country_code(country)
+        except:
+            logging.info("No location found")
+            city, country, country_code = "", "", ""
 
-        return filter_dates_for_a_segment(segment_text, groups_of_dates)
+        return city, country, country_code
 
     def parse_work_experience(
         self,
         resume_lines: list[str],
-        segment_text: str,
-        zero_shot_classifier_pipeline: pipeline,
+        segment: Segment | str,
+        zero_shot_classifier_pipeline: "pipeline",
         window: int = 2,
+        batch_size: int = Config.NLI_BATCH_SIZE,
+        memo: ClassificationMemo | None = None,
+        date_index: DateIndex | None = None,
+        deadline: Deadline | None = None,
     ) -> list[ExperienceData]:
         """
         Parse work experience from a list of text lines using dates and a zero-shot classifier pipeline.
 
         Args:
-            dates (list[tuple[str, int]]): List of tuples containing parsed dates and their positions.
             resume_lines (list[str]): List of text lines.
+            segment (Segment | str): The experience segment, or its text.
             zero_shot_classifier_pipeline (pipeline): A zero-shot classifier pipeline.
             window (int, optional): The window size for selecting lines around a date. Defaults to 3.
+            batch_size (int, optional): Batch size of the zero-shot inference over all windows.
+            memo (ClassificationMemo, optional): Request-scoped memo of line classifications.
+            date_index (DateIndex, optional): The dates of the resume, found once for all segments.
+            deadline (Deadline, optional): The time budget, after which only the first entries are parsed.
 
         Returns:
             list[ExperienceData]: A list of dictionaries containing the parsed work experience.
         """
-        dates = self.get_dates_for_segment(resume_lines, segment_text)
+        dates = self.get_dates_for_segment(resume_lines, segment, date_index)
+
+        # collect the lines of every date window first, to classify them in one batch
+        windows = [
+            [
+                i
+                for i in range(
+                    max(idx - window, 0), min(idx + window, len(resume_lines) - 1) + 1
+                )
+                if i != idx
+            ]
+            for idx in (pair_of_dates[0][1] for pair_of_dates in dates)
+        ]
+        classifications = classify_lines(
+            [resume_lines[i] for window_idx in windows for i in window_idx],
+            Config.EMPLOYMENT_NLI_CLASSES,
+            zero_shot_classifier_pipeline,
+            batch_size=batch_size,
+            memo=memo,
+            deadline=deadline,
+        )
+
         experience = []
-        for pair_of_dates in dates:
-            idx = pair_of_dates[0][1]
-            lines = {}
-            for i in range(
-                max(idx - window, 0), min(idx + window, len(resume_lines)) + 1
-            ):
-                if i != idx:
-                    line = resume_lines[i]
-                    classification = zero_shot_classifier_pipeline(
-                        line, Config.EMPLOYMENT_NLI_CLASSES
+        for pair_of_dates, window_idx in zip(dates, windows):
+            # the time budget ran out before classifying this window
+            if any(resume_lines[i] not in classifications for i in window_idx):
+                if deadline is not None:
+                    deadline.detail = (
+                        f"first {len(experience)} of {len(dates)} experiences"
                     )
-                    label, score = (
-                        classification["labels"][0],
-                        classification["scores"][0],
-                    )
-                    lines[line] = (label, score)
+                break
+
+            lines = {
+                resume_lines[i]: classifications[resume_lines[i]] for i in window_idx
+            }
 
             # get location and parse it
             location = get_max_element(
                 lines, keywords=Config.EMPLOYMENT_LOCATION_NLI_CLASSES
             )
-            try:
-                place_entity = find_location_entities(location)
-                city = ", ".join(cities) if (cities := place_entity.cities) else ""
-                country = countries[0] if (countries := place_entity.countries) else ""
-                country_code = get_country_code(country)
-            except:
-                logging.info("No location found")
-                city, country, country_code = "", "", ""
+            city, country, country_code = self.parse_location(location)
 
             # get job title
             title = get_max_element(lines, keywords=Config.JOB_NLI_CLASSES)
@@ -286,25 +407,26 @@ class Parsers:
         return ExperienceData(experience=experience)
 
     def skills_parser_from_list(
-        self, txt_segment: str, skills_list: list[str], min_length: int = 2
+        self, txt_segment: str, skills_matcher: SkillMatcher, min_length: int = 2
     ) -> list[str]:
         """
         Extracts skills from the given text segment based on a list of known skills.
 
         Args:
             txt_segment (str): Text segment to extract skills from.
-            skills_list (list[str]): List of known skills.
+            skills_matcher (SkillMatcher): Automaton over the list of known skills.
             min_length (int): Minimum length of the skill string to be considered valid.
 
         Returns:
-            list[str]: List of extracted skills.
+            list[str]: List of extracted skills, in order of first appearance.
         """
-        skills = []
-        for skill in skills_list:
-            if skill in txt_segment.lower() and len(skill) > min_length:
-                skills.append(skill)
-
-        return skills
+        return list(
+            dict.fromkeys(
+                skill
+                for _, _, skill in skills_matcher.find_all(txt_segment)
+                if len(skill) > min_length
+            )
+        )
 
     def skills_parser_ner(
         self, txt_segment: str, ner_pipeline, min_length: int = 2
@@ -331,98 +453,123 @@ class Parsers:
         return list(filter(lambda x: len(x) > min_length, skills))
 
     def parse_skills(
-        self, txt_segment: str, all_skills: list[str] = SKILLS
+        self, txt_segment: str, skills_matcher: SkillMatcher = SKILLS_MATCHER
     ) -> SkillsData:
         """
         Extracts skills from the given text segment using both NER and a list of known skills.
 
         Args:
             txt_segment (str): Text segment to extract skills from.
-            all_skills (list[str]): List of known skills.
+            skills_matcher (SkillMatcher): Automaton over the list of known skills.
 
         Returns:
             SkillsData: List of extracted skills.
         """
         # not use here for performances reasons
         # skills_from_ner = self.skills_parser_ner(txt_segment, ner_pipeline)
-        skills_from_list = self.skills_parser_from_list(txt_segment, all_skills)
+        skills_from_list = self.skills_parser_from_list(txt_segment, skills_matcher)
 
         return SkillsData(skills=skills_from_list)
 
-    def parse_degree_name(self, txt_line: str, degree_abbreviations: list[str]) -> str:
+    def parse_degree_name(
+        self, txt_line: str, degrees_pattern: re.Pattern = DEGREES_PATTERN
+    ) -> str:
         """
         Parse the degree name from a given text line.
 
         Args:
             txt_line (str): Text line containing the degree name.
-            degree_abbreviations_file_path (str): File path to the degree abbreviations CSV.
+            degrees_pattern (re.Pattern): Precompiled alternation of the degree abbreviations.
 
         Returns:
             str: The parsed degree name.
         """
-        abbreviations_pattern = "|".join(
-            re.escape(abbreviation) for abbreviation in degree_abbreviations
-        )
-
-        return (
-            abbreviations[0]
-            if (abbreviations := re.findall(abbreviations_pattern, txt_line))
-            else ""
-        )
+        return match.group() if (match := degrees_pattern.search(txt_line)) else ""
 
     def parse_education_and_trainings(
         self,
         resume_lines: list[str],
-        segment_text: str,
+        segment: Segment | str,
         zero_shot_classifier,
-        degrees: list[str] = DEGREES,
+        degrees_pattern: re.Pattern = DEGREES_PATTERN,
         window_min: int = 3,
         window_max: int = 5,
         min_education_time: int = 12,
+        batch_size: int = Config.NLI_BATCH_SIZE,
+        memo: ClassificationMemo | None = None,
+        date_index: DateIndex | None = None,
+        deadline: Deadline | None = None,
     ) -> list[EducationData]:
         """
         Parse the education and training information from the resume lines.
 
         Args:
-            dates_education (list): List of pairs of education start and end dates.
             resume_lines (list[str]): List of text lines from the resume.
+            segment (Segment | str): The education segment, or its text.
             zero_shot_classifier: Zero-shot classifier pipeline.
-            degrees (list[str]): List of degrees abbreviations
+            degrees_pattern (re.Pattern): Precompiled alternation of the degrees abbreviations.
             window_min (int): Minimum window size for searching the information around the dates.
             window_max (int): Maximum window size for searching the information around the dates.
             min_education_time (int): Minimum education time in months to be considered as valid.
+            batch_size (int): Batch size of the zero-shot inference over all windows.
+            memo (ClassificationMemo, optional): Request-scoped memo of line classifications.
+            date_index (DateIndex, optional): The dates of the resume, found once for all segments.
+            deadline (Deadline, optional): The time budget, after which only the first entries are parsed.
 
         Returns:
             list[EducationData]: List of parsed education data.
         """
-        dates = self.get_dates_for_segment(resume_lines, segment_text)
-        education = []
-        for pair_of_dates in dates:
-            idx = pair_of_dates[0][1]
-            lines, flatten_lines, degree_name = {}, "", ""
-            for i in range(
+        dates = self.get_dates_for_segment(resume_lines, segment, date_index)
+
+        # collect the lines of every date window first, to classify them in one batch
+        windows = [
+            range(
                 max(idx - window_min, 0),
                 min(idx + window_min, len(resume_lines) - 1) + 1,
+            )
+            for idx in (pair_of_dates[0][1] for pair_of_dates in dates)
+        ]
+        classifications = classify_lines(
+            [
+                resume_lines[i]
+                for pair_of_dates, window_idx in zip(dates, windows)
+                for i in window_idx
+                if i != pair_of_dates[0][1]
+            ],
+            Config.EDUCATION_NLI_CLASSES,
+            zero_shot_classifier,
+            batch_size=batch_size,
+            memo=memo,
+            deadline=deadline,
+        )
+
+        education = []
+        for pair_of_dates, window_idx in zip(dates, windows):
+            idx = pair_of_dates[0][1]
+            # the time budget ran out before classifying this window
+            if any(
+                resume_lines[i] not in classifications for i in window_idx if i != idx
             ):
+                if deadline is not None:
+                    deadline.detail = (
+                        f"first {len(education)} of {len(dates)} educations"
+                    )
+                break
+
+            lines, flatten_lines, degree_name = {}, "", ""
+            for i in window_idx:
                 line = resume_lines[i]
                 flatten_lines += line
                 if i != idx:
                     degree_name = max(
-                        self.parse_degree_name(line, degrees), degree_name
+                        self.parse_degree_name(line, degrees_pattern), degree_name
                     )
                     cleaned_line = (
                         filter_stopwords(re.sub(degree_name, "", line).strip())
                         if degree_name
                         else line
                     )
-                    classification = zero_shot_classifier(
-                        line, Config.EDUCATION_NLI_CLASSES
-                    )
-                    label, score = (
-                        classification["labels"][0],
-                        classification["scores"][0],
-                    )
-                    lines[cleaned_line] = (label, score)
+                    lines[cleaned_line] = classifications[line]
 
             if not degree_name:
                 for i in range(
@@ -430,7 +577,8 @@ class Parsers:
                     min(idx + window_max, len(resume_lines) - 1) + 1,
                 ):
                     degree_name = max(
-                        self.parse_degree_name(resume_lines[i], degrees), degree_name
+                        self.parse_degree_name(resume_lines[i], degrees_pattern),
+                        degree_name,
                     )
 
             # get starting and ending dates
@@ -439,16 +587,7 @@ class Parsers:
             # filter dates
             if timedelta_in_months(start_date, end_date) >= min_education_time:
                 # parse location
-                try:
-                    place_entity = find_location_entities(flatten_lines)
-                    city = ", ".join(cities) if (cities := place_entity.cities) else ""
-                    country = (
-                        countries[0] if (countries := place_entity.countries) else ""
-                    )
-                    country_code = get_country_code(country)
-                except:
-                    logging.info("No location found")
-                    city, country, country_code = "", "", ""
+                city, country, country_code = self.parse_location(flatten_lines)
 
                 # get degree major
                 degree_major = get_max_element(
@@ -481,26 +620,29 @@ class Parsers:
         self,
         parsing_function,
         resume_lines,
-        init_segment_text,
-        fallback_segment_text,
+        init_segment,
+        fallback_segment,
         zero_shot_classifier,
         **kwargs,
     ):
         parsing_result = parsing_function(
             resume_lines,
-            init_segment_text,
+            init_segment,
             zero_shot_classifier,
             **kwargs,
         )
         field = fields[0] if (fields := list(parsing_result.__fields__)) else ""
 
-        return (
-            parsing_function(
-                resume_lines,
-                fallback_segment_text,
-                zero_shot_classifier,
-                **kwargs,
-            )
-            if not parsing_result.dict().get(field, [])
-            else parsing_result
+        if parsing_result.dict().get(field, []):
+            return parsing_result
+
+        # no time left for the fallback segment
+        if (deadline := kwargs.get("deadline")) is not None and deadline.expired():
+            return parsing_result
+
+        return parsing_function(
+            resume_lines,
+            fallback_segment,
+            zero_shot_classifier,
+            **kwargs,
         )
@@ -0,0 +1,440 @@
+import logging
+from typing import BinaryIO
+
+from config import Config
+from data_models import MetaData, ResumeParsingResponse, SummaryData
+from reader import Reader
+from segmenter import TextSegmenter
+from parsers import Parsers
+from models import Models
+from classifier import ClassificationMemo
+from metrics import StageTrace, tracing
+from deadlines import Deadline
+from result_cache import ResultCache, get_result_cache
+from utils import detect_language, generate_metadata, generate_primary_keys
+from headers import Headers
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+# a small resume parsed at startup, running every parser and model once
+WARMUP_RESUME_LINES: tuple[str] = (
+    "John Smith",
+    "Software Engineer",
+    "john.smith@example.com +33 6 12 34 56 78 https://github.com/jsmith",
+    "Experience",
+    "01/2020 - Present",
+    "Google, Paris, France",
+    "Developed REST APIs in Python",
+    "Education",
+    "09/2015 - 06/2019",
+    "MSc Computer Science, Sorbonne University, Paris",
+    "Skills",
+    "Python, Docker, SQL",
+    "Languages",
+    "English, French",
+)
+
+
+def time_budget_remark(
+    stage_deadlines: dict[str, Deadline], cuts: list[str] | None = None
+) -> str:
+    """
+    Write the response remark, listing what was cut before the parsing and the stages
+    cut by their time budget.
+
+    Args:
+        stage_deadlines (dict[str, Deadline]): The deadline of each stage.
+        cuts (list[str], optional): What was cut before the parsing, e.g. the pages
+            after `Config.PDF_MAX_PAGES`.
+
+    Returns:
+        str: e.g. "Parsing Complete : experience time budget exceeded (first 12 of 340 experiences)"
+    """
+    notes = list(cuts or []) + [
+        " ".join(
+            (stage, Config.MESSAGE_TIME_BUDGET_EXCEEDED)
+            + ((f"({deadline.detail})",) if deadline.detail else ())
+        )
+        for stage, deadline in stage_deadlines.items()
+        if deadline.exceeded
+    ]
+    if not notes:
+        return Config.MESSAGE_COMPLETED
+    return f"{Config.MESSAGE_COMPLETED} : {'; '.join(notes)}"
+
+
+class ResumeParser:
+    """
+    The full resume parsing pipeline, from a PDF file to a ResumeParsingResponse.
+
+    Attributes:
+        models (Models): The loaded NLI and NER models.
+        parsers (Parsers): The resume fields parsers.
+        segmenter (TextSegmenter): The resume sections segmenter.
+        reader (Reader): The PDF reader.
+        result_cache (ResultCache | None): The cache of parsed PDF files, None if disabled.
+    """
+
+    def __init__(
+        self,
+        models: Models,
+        parsers: Parsers | None = None,
+        segmenter: TextSegmenter | None = None,
+        reader: Reader | None = None,
+        result_cache: ResultCache | None = None,
+    ):
+        self.models = models
+        self.parsers = parsers or Parsers()
+        self.segmenter = segmenter or TextSegmenter()
+        self.reader = reader or Reader()
+        self.result_cache = result_cache or get_result_cache()
+
+    def warmup(self) -> None:
+        """
+        Load the lazily loaded resources and run the models once, before serving requests.
+        """
+        self.parsers.prewarm()
+        self.parse_resume(list(WARMUP_RESUME_LINES), file_name="warmup")
+        logging.info("Successfully warmed up the parsing pipeline ✔")
+
+    def extract_document(
+        self,
+        pdf_file: str | bytes | BinaryIO,
+        trace: StageTrace | None = None,
+        cuts: list[str] | None = None,
+    ) -> tuple[list[str], tuple[str, float]]:
+        """
+        Extract the cleaned lines of a PDF file, page after page, and detect its language
+        on the first page, before normalizing it.
+
+        Args:
+            pdf_file (str | bytes | BinaryIO): The path to the PDF file, its content or a binary buffer.
+            trace (StageTrace, optional): Records the timings of the extraction stages.
+            cuts (list[str], optional): Collects what was not read, e.g. the pages after
+                the page cap, to give to `parse_resume`.
+
+        Returns:
+            tuple[list[str], tuple[str, float]]: The cleaned lines of the document, and its
+                language code and probability.
+        """
+        trace = trace or StageTrace()
+        pages, lines, language = self.reader.iter_pages(pdf_file, cuts), [], None
+        while True:
+            # extract text from the next PDF page, possibly already decoded in a pool
+            with trace.stage("pdf_text"):
+                page = next(pages, None)
+            if page is None:
+                break
+
+            # the language chooses the normalization of non-Latin scripts, detected on
+            # the first page with text, e.g. not on a blank or scanned cover page
+            if not (language and language[0]):
+                with trace.stage("language"):
+                    language = detect_language(page[: Config.LANGUAGE_DETECTION_CHARS])
+
+            # extract and clean lines layout from the page
+            with trace.stage("document_lines"):
+                lines.extend(self.reader.clean_lines(page, language_code=language[0]))
+
+        logging.info(f"Successfully extracted {len(lines)} lines from document")
+        return lines, language or ("", 0.0)
+
+    def extract_lines(
+        self, pdf_file: str | bytes | BinaryIO, trace: StageTrace | None = None
+    ) -> list[str]:
+        """
+        Extract the cleaned lines of a PDF file, page after page.
+
+        Args:
+            pdf_file (str | bytes | BinaryIO): The path to the PDF file, its content or a binary buffer.
+            trace (StageTrace, optional): Records the timings of the extraction stages.
+
+        Returns:
+            list[str]: The cleaned lines of the document.
+        """
+        return self.extract_document(pdf_file, trace)[0]
+
+    def parse_headlines(
+        self, resumes_lines: list[list[str]], deadline: Deadline | None = None
+    ) -> list[tuple[str, SummaryData]]:
+        """
+        Parse the name and current job designation of several resumes at once, their
+        headlines being run through the NER model as a single batch.
+
+        Args:
+            resumes_lines (list[list[str]]): The cleaned lines of each resume.
+            deadline (Deadline, optional): The time budget of the batch, after which the
+                remaining NER windows are left out.
+
+        Returns:
+            list[tuple[str, SummaryData]]: The name and summary of each resume, to be
+                given to `parse_resume`.
+        """
+        return self.parsers.parse_headlines(
+            [
+                self.segmenter.segment_lines(resume_lines).head(
+                    "headline", Config.HEADLINE_MAX_LINES
+                )
+                for resume_lines in resumes_lines
+            ],
+            self.models.ner_pipeline,
+            deadline=deadline,
+        )
+
+    def lookup_result(
+        self,
+        pdf_file: str | bytes | BinaryIO,
+        file_name: str = "",
+        trace: StageTrace | None = None,
+    ) -> tuple[str | bytes | BinaryIO, str | None, ResumeParsingResponse | None]:
+        """
+        Look up a PDF file in the results cache.
+
+        Args:
+            pdf_file (str | bytes | BinaryIO): The path to the PDF file, its content or a binary buffer.
+            file_name (str, optional): The file name reported in the response metadata.
+            trace (StageTrace, optional): Records the timing of the lookup.
+
+        Returns:
+            tuple[str | bytes | BinaryIO, str | None, ResumeParsingResponse | None]: The PDF
+                file, read if it was hashed, its cache key, None if the cache is disabled,
+                and the cached response, None if not found.
+        """
+        if self.result_cache is None:
+            return pdf_file, None, None
+
+        trace = trace or StageTrace()
+        with trace.stage("result_cache"):
+            pdf_file = self.reader.read_bytes(pdf_file)
+            if not isinstance(pdf_file, bytes):
+                return pdf_file, None, None
+            cache_key = self.result_cache.key(pdf_file)
+            response = self.result_cache.get(cache_key)
+
+        if response is not None:
+            # a new resume for the caller, only its parsed content is shared
+            response.metadata = MetaData(
+                **{
+                    **response.metadata.dict(),
+                    **generate_primary_keys(),
+                    "file_name": file_name,
+                    "cache_status": Config.CACHE_STATUS_HIT,
+                }
+            )
+        return pdf_file, cache_key, response
+
+    def store_result(
+        self, cache_key: str | None, response: ResumeParsingResponse
+    ) -> ResumeParsingResponse:
+        """
+        Store a parsed resume in the results cache, if complete.
+
+        Args:
+            cache_key (str | None): The key given by `lookup_result`, None if the cache is disabled.
+            response (ResumeParsingResponse): The parsed resume.
+
+        Returns:
+            ResumeParsingResponse: The parsed resume, with its cache status.
+        """
+        if cache_key is None:
+            response.metadata.cache_status = Config.CACHE_STATUS_DISABLED
+            return response
+
+        response.metadata.cache_status = Config.CACHE_STATUS_MISS
+        # failed, partial or truncated results are parsed again next time
+        if (
+            response.metadata.status == Config.MESSAGE_STATUS_SUCCESS
+            and response.metadata.remark == Config.MESSAGE_COMPLETED
+        ):
+            self.result_cache.set(cache_key, response)
+        return response
+
+    def parse_pdf(
+        self,
+        pdf_file: str | bytes | BinaryIO,
+        file_name: str = "",
+        trace: StageTrace | None = None,
+        deadline: Deadline | None = None,
+    ) -> ResumeParsingResponse:
+        """
+        Parse a PDF resume, or get it from the results cache if the same file was parsed.
+
+        Args:
+            pdf_file (str | bytes | BinaryIO): The path to the PDF file, its content or a binary buffer.
+            file_name (str, optional): The file name reported in the response metadata.
+            trace (StageTrace, optional): Records the timings of every parsing stage.
+            deadline (Deadline, optional): The time budget of the parsing, including the
+                text extraction, e.g. started when the request arrived to count its time
+                in the queue. Defaults to `Config.PARSING_DEADLINE` from now.
+
+        Returns:
+            ResumeParsingResponse: The parsed resume.
+        """
+        trace = trace or StageTrace()
+        deadline = deadline or Deadline(Config.PARSING_DEADLINE)
+
+        pdf_file, cache_key, response = self.lookup_result(pdf_file, file_name, trace)
+        if response is not None:
+            return response
+
+        cuts = []
+        resume_lines, language = self.extract_document(pdf_file, trace=trace, cuts=cuts)
+        response = self.parse_resume(
+            resume_lines,
+            file_name=file_name,
+            trace=trace,
+            deadline=deadline,
+            language=language,
+            cuts=cuts,
+        )
+        return self.store_result(cache_key, response)
+
+    def parse_resume(
+        self,
+        resume_lines: list[str],
+        file_name: str = "",
+        trace: StageTrace | None = None,
+        deadline: Deadline | None = None,
+        language: tuple[str, float] | None = None,
+        headline: tuple[str, SummaryData] | None = None,
+        cuts: list[str] | None = None,
+    ) -> ResumeParsingResponse:
+        """
+        Parse the cleaned lines of a resume.
+
+        Args:
+            resume_lines (list[str]): The cleaned lines of the resume.
+            file_name (str, optional): The file name reported in the response metadata.
+            trace (StageTrace, optional): Records the timings of every parsing stage.
+            deadline (Deadline, optional): The time budget of the parsing, bounding the
+                `Config.STAGE_DEADLINES` of the slowest stages. Defaults to
+                `Config.PARSING_DEADLINE` from now. Stages running out of time return
+                partial results, listed in the metadata remark.
+            language (tuple[str, float], optional): The language code and probability
+                detected at the extraction, else detected on the cleaned lines.
+            headline (tuple[str, SummaryData], optional): The name and summary already
+                parsed, e.g. batched with other resumes by `parse_headlines`.
+            cuts (list[str], optional): What was cut before the parsing, e.g. the pages
+                after the page cap, listed in the metadata remark.
+
+        Returns:
+            ResumeParsingResponse: The parsed resume.
+        """
+        parsers, models = self.parsers, self.models
+        trace = trace or StageTrace()
+        deadline = deadline or Deadline(Config.PARSING_DEADLINE)
+        stage_budgets, stage_deadlines = dict(Config.STAGE_DEADLINES), {}
+
+        def stage_deadline(name: str) -> Deadline:
+            stage_deadlines[name] = deadline.sub(stage_budgets.get(name))
+            return stage_deadlines[name]
+
+        try:
+            with tracing(trace):
+                # segment full text into distinct sections
+                with trace.stage("segmentation"):
+                    segments = self.segmenter.segment_lines(resume_lines)
+                    full_text = segments.text
+
+                # extract skills
+                with trace.stage("skills"):
+                    skills = parsers.parse_skills(
+                        segments.get("skills", ""),
+                    )
+
+                # extract contact data
+                with trace.stage("contact"):
+                    contact = parsers.parse_contact_data(
+                        segments.get("headline", ""),
+                    )
+
+                # parse name and current job designation, unless given or out of time
+                with trace.stage("headline"):
+                    if headline is not None:
+                        name, summary = headline
+                    elif (headline_deadline := stage_deadline("headline")).expired():
+                        name, summary = "", SummaryData()
+                    else:
+                        name, summary = parsers.parse_headline(
+                            segments.head("headline", Config.HEADLINE_MAX_LINES),
+                            models.ner_pipeline,
+                            deadline=headline_deadline,
+                        )
+
+                # extract personal data
+                with trace.stage("personal"):
+                    personal = parsers.parse_personal_data(name)
+
+                # extract languages
+                with trace.stage("languages"):
+                    languages = parsers.parse_languages(full_text)
+
+                # line classifications and dates shared by the education and experience parsers
+                memo = ClassificationMemo()
+                with trace.stage("dates"):
+                    date_index = parsers.parse_dates(resume_lines)
+
+                # extract education
+                with trace.stage("education"):
+                    education = parsers.parse_with_fallback(
+                        parsers.parse_education_and_trainings,
+                        resume_lines,
+                        segments.segment("education"),
+                        segments.segment(Headers.DEFAULT_SEGMENT),
+                        models.zero_shot_classifier_pipeline,
+                        memo=memo,
+                        date_index=date_index,
+                        deadline=stage_deadline("education"),
+                    )
+
+                # extract work experience
+                with trace.stage("experience"):
+                    experience = parsers.parse_with_fallback(
+                        parsers.parse_work_experience,
+                        resume_lines,
+                        segments.segment("experience"),
+                        segments.segment(Headers.DEFAULT_SEGMENT),
+                        models.zero_shot_classifier_pipeline,
+                        memo=memo,
+                        date_index=date_index,
+                        deadline=stage_deadline("experience"),
+                    )
+                logging.info(f"Line classification memo : {memo.stats()}")
+
+                # final part
+                with trace.stage("metadata"):
+                    remark = time_budget_remark(stage_deadlines, cuts)
+                    if remark != Config.MESSAGE_COMPLETED:
+                        logging.warning(f"Partially parsed {file_name} : {remark}")
+                    metadata = generate_metadata(
+                        full_text,
+                        remark=remark,
+                        file_name=file_name,
+                        language=language,
+                    )
+
+            return ResumeParsingResponse(
+                skills=skills,
+                contact=contact,
+                summary=summary,
+                metadata=metadata,
+                personal=personal,
+                education=education,
+                experience=experience,
+                languages=languages,
+            )
+
+        except Exception as e:
+            trace.failed_stage = trace.failed_stage or "response"
+            logging.error(f"Resume Parsing failed at stage {trace.failed_stage} : {e}")
+            metadata = generate_metadata(
+                "",
+                remark=Config.MESSAGE_UNCOMPLETED,
+                status=Config.MESSAGE_STATUS_UNSUCCESS,
+                file_name=file_name,
+            )
+            return ResumeParsingResponse(
+                metadata=metadata,
+            )
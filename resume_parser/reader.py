@@ -1,64 +1,238 @@
-import re
+import io
 import logging
+import threading
+import multiprocessing
 import pdftotext
+from typing import BinaryIO, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
-from utils import normalize_string
+from config import Config
+from utils import iter_normalized_lines, resolve_normalization_mode
 
 logging.basicConfig(
-    format='%(levelname)s : %(funcName)s : %(message)s', level=logging.INFO
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
 )
 
+
+def extract_pages(content: bytes, start: int, stop: int) -> list[str]:
+    """
+    Decode a range of pages of a PDF file, with its own document, to run in a pool.
+
+    Args:
+        content (bytes): The PDF file content.
+        start (int): The first page index.
+        stop (int): The index after the last page.
+
+    Returns:
+        list[str]: The plain text of each page.
+    """
+    pdf = pdftotext.PDF(io.BytesIO(content))
+    return [pdf[idx] for idx in range(start, stop)]
+
+
 class Reader:
+    # long-lived pools decoding pages, shared by all instances and threads
+    _executors: dict[str, Executor] = {}
+    _executors_lock = threading.Lock()
 
+    def __init__(
+        self,
+        extraction_mode: str = Config.PDF_EXTRACTION_MODE,
+        extraction_workers: int = Config.PDF_EXTRACTION_WORKERS,
+        max_pages: int | None = Config.PDF_MAX_PAGES,
+        parallel_min_pages: int = Config.PDF_PARALLEL_MIN_PAGES,
+        pages_per_task: int = Config.PDF_PAGES_PER_TASK,
+        normalization_mode: str = Config.NORMALIZATION_MODE,
+    ):
+        if extraction_mode not in ("serial", "threads", "processes"):
+            raise ValueError(f"Unknown PDF extraction mode {extraction_mode!r}")
+        # raises on an unknown normalization mode
+        resolve_normalization_mode(normalization_mode)
+        self.extraction_mode = extraction_mode
+        self.extraction_workers = extraction_workers
+        self.max_pages = max_pages
+        self.parallel_min_pages = parallel_min_pages
+        self.pages_per_task = pages_per_task
+        self.normalization_mode = normalization_mode
 
-    def pdf_to_text(self, path_to_pdf: str) -> str:
+    def get_executor(self) -> Executor:
         """
-        Convert the content of a PDF file to plain text.
+        Get the shared pool of the extraction mode, creating it on first use.
+
+        Returns:
+            Executor: A thread or process pool.
+        """
+        mode = self.extraction_mode
+        if mode not in Reader._executors:
+            with Reader._executors_lock:
+                if mode not in Reader._executors:
+                    if mode == "threads":
+                        executor = ThreadPoolExecutor(
+                            max_workers=self.extraction_workers
+                        )
+                    else:
+                        # spawn, as forking a process with loaded ONNX Runtime sessions is unsafe
+                        executor = ProcessPoolExecutor(
+                            max_workers=self.extraction_workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    Reader._executors[mode] = executor
+        return Reader._executors[mode]
+
+    def read_bytes(self, pdf_file: str | bytes | BinaryIO) -> str | bytes:
+        """
+        Read the content of a PDF file, e.g. to hash it.
 
         Args:
-            path_to_pdf (str): The path to the PDF file.
+            pdf_file (str | bytes | BinaryIO): The path to the PDF file, its content or a binary buffer.
 
         Returns:
-            str: The plain text content of the PDF file. Empty string if an error occurs.
+            str | bytes: The content of the PDF file, or its path if it can't be read.
         """
+        if isinstance(pdf_file, (bytes, bytearray)):
+            return bytes(pdf_file)
         try:
-            with open(path_to_pdf, "rb") as f:
-                pdf = pdftotext.PDF(f)
-            return "".join(pdf)
+            if isinstance(pdf_file, str):
+                with open(pdf_file, "rb") as f:
+                    return f.read()
+            return pdf_file.read()
+        except OSError as e:
+            logging.error(f"Error in PDF file reading : {e}")
+            return pdf_file
+
+    def iter_pages(
+        self, pdf_file: str | bytes | BinaryIO, cuts: list[str] | None = None
+    ) -> Iterator[str]:
+        """
+        Decode the pages of a PDF file, in order, up to the page cap.
+
+        Long documents are decoded concurrently, in ranges of pages each opening
+        the document in the pool, and yielded as soon as the previous ones are.
+
+        Args:
+            pdf_file (str | bytes | BinaryIO): The path to the PDF file, its content or a binary buffer.
+            cuts (list[str], optional): Collects what was not read, e.g.
+                "page limit reached (first 30 of 120 pages)", to report in the response.
+
+        Yields:
+            str: The plain text of each page. Nothing more if an error occurs.
+        """
+        content = self.read_bytes(pdf_file)
+        if not isinstance(content, bytes):
+            return
+        try:
+            pdf = pdftotext.PDF(io.BytesIO(content))
+            num_pages = len(pdf)
+            if self.max_pages is not None and num_pages > self.max_pages:
+                logging.warning(
+                    f"Only reading the first {self.max_pages} of {num_pages} pages"
+                )
+                if cuts is not None:
+                    cuts.append(
+                        f"{Config.MESSAGE_PAGE_LIMIT_REACHED} (first {self.max_pages} of {num_pages} pages)"
+                    )
+                num_pages = self.max_pages
+
+            if self.extraction_mode == "serial" or num_pages < self.parallel_min_pages:
+                for idx in range(num_pages):
+                    yield pdf[idx]
+                return
+
+            ranges = [
+                (start, min(start + self.pages_per_task, num_pages))
+                for start in range(0, num_pages, self.pages_per_task)
+            ]
+            futures = [
+                self.get_executor().submit(extract_pages, content, start, stop)
+                for start, stop in ranges
+            ]
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
         except Exception as e:
-            logging.error(f"Error in PDF file ({path_to_pdf}) reading : {e}")
-            return ""
+            source = pdf_file if isinstance(pdf_file, str) else "in-memory buffer"
+            logging.error(f"Error in PDF file ({source}) reading : {e}")
 
+    def pdf_to_text(self, pdf_file: str | bytes | BinaryIO) -> str:
+        """
+        Convert the content of a PDF file to plain text.
 
-    def get_document_lines(self, doc_text: str, min_line_length: int = 2) -> list[str]:
+        Args:
+            pdf_file (str | bytes | BinaryIO): The path to the PDF file, its content or a binary buffer.
+
+        Returns:
+            str: The plain text content of the PDF file. Empty string if an error occurs.
+        """
+        return "".join(self.iter_pages(pdf_file))
+
+    def clean_lines(
+        self, text: str, min_line_length: int = 2, language_code: str = ""
+    ) -> list[str]:
+        """
+        Split a text, e.g. a page, into a list of cleaned lines.
+
+        Args:
+            text (str): The input text.
+            min_line_length (int, optional): The minimum length of a line to be included in the output. Defaults to 2.
+            language_code (str, optional): The detected language of the document, choosing the "auto" normalization.
+
+        Returns:
+            List[str]: A list of cleaned lines from the input text.
+        """
+        mode = resolve_normalization_mode(self.normalization_mode, language_code)
+        return list(iter_normalized_lines(text, min_line_length, mode))
+
+    def iter_document_lines(
+        self,
+        doc_text: str | Iterable[str],
+        min_line_length: int = 2,
+        language_code: str = "",
+    ) -> Iterator[str]:
+        """
+        Split the input document text into cleaned lines, lazily.
+
+        Args:
+            doc_text (str | Iterable[str]): The input document text, or its pages streamed in order.
+            min_line_length (int, optional): The minimum length of a line to be included in the output. Defaults to 2.
+            language_code (str, optional): The detected language of the document, choosing the "auto" normalization.
+
+        Yields:
+            str: The cleaned lines of the input document text.
+        """
+        mode = resolve_normalization_mode(self.normalization_mode, language_code)
+        for page in [doc_text] if isinstance(doc_text, str) else doc_text:
+            yield from iter_normalized_lines(page, min_line_length, mode)
+
+    def get_document_lines(
+        self,
+        doc_text: str | Iterable[str],
+        min_line_length: int = 2,
+        language_code: str = "",
+    ) -> list[str]:
         """
         Preprocess the input document text and split it into a list of cleaned lines.
 
         Args:
-            doc_text (str): The input document text.
+            doc_text (str | Iterable[str]): The input document text, or its pages streamed in order.
             min_line_length (int, optional): The minimum length of a line to be included in the output. Defaults to 2.
+            language_code (str, optional): The detected language of the document, choosing the "auto" normalization.
 
         Returns:
             List[str]: A list of cleaned lines from the input document text.
         """
         resume_lines = []
         try:
-            # Replace multiple newlines with a single newline, and tabs with spaces
-            doc_text = re.sub(r'\n+', '\n', doc_text)
-            doc_text = doc_text.replace("\r", "\n")
-            doc_text = doc_text.replace("\t", " ")
-
-            # Split text blob into individual lines
-            resume_lines = doc_text.splitlines(True)
-
-            # Clean and filter lines
-            resume_lines = [cleaned_line for line in resume_lines
-                            if (cleaned_line := normalize_string(line)) and len(cleaned_line) > min_line_length]
-            
-            logging.info(f"Successfully extracted {len(resume_lines)} lines from document")
+            resume_lines.extend(
+                self.iter_document_lines(doc_text, min_line_length, language_code)
+            )
+
+            logging.info(
+                f"Successfully extracted {len(resume_lines)} lines from document"
+            )
         except Exception as e:
             logging.error(f"Resume lines extraction failed : {e}")
 
         return resume_lines
-    
-
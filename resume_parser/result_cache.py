@@ -0,0 +1,270 @@
+import os
+import abc
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from config import Config
+from cache import LRUCache
+from data_models import ResumeParsingResponse
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 hex digest of a file content."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def parser_fingerprint(
+    version: str = Config.RESULT_CACHE_VERSION,
+    model_files: tuple[str] = (
+        os.path.join(Config.QUANTIZED_NLI_MODEL_DIR, Config.QUANTIZED_NLI_MODEL_ONNX),
+        os.path.join(Config.QUANTIZED_NER_MODEL_DIR, Config.QUANTIZED_NER_MODEL_ONNX),
+    ),
+) -> str:
+    """
+    Identify the parser and models a result was produced by.
+
+    Args:
+        version (str, optional): The parser version, bumped when parsing changes.
+        model_files (tuple[str], optional): The model files, identified by their size
+            and modification time.
+
+    Returns:
+        str: A short hex digest, changing with the version, the models or the settings
+            changing the results.
+    """
+    fingerprint = hashlib.sha256(version.encode())
+    for path in model_files:
+        try:
+            stat = os.stat(path)
+            fingerprint.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            fingerprint.update(f"{path}:missing".encode())
+    settings = (
+        Config.SEGMENTER_STRATEGY,
+        Config.LOCATION_RESOLVER,
+        Config.NORMALIZATION_MODE,
+        Config.NORMALIZATION_ASCII_LANGUAGES,
+        Config.PDF_MAX_PAGES,
+        Config.HEADLINE_MAX_LINES,
+        Config.HEADLINE_MAX_TOKENS,
+    )
+    fingerprint.update(":".join(map(str, settings)).encode())
+    return fingerprint.hexdigest()[:16]
+
+
+class ResultCache(abc.ABC):
+    """
+    A cache of parsed resumes, keyed on the PDF content and the parser fingerprint.
+
+    Responses are stored as JSON by the backends, `_read` and `_write`.
+
+    Attributes:
+        fingerprint (str): The parser fingerprint, part of every key.
+        ttl (float | None): The entries lifetime in seconds, None for no expiration.
+        hits (int): Number of lookups that found a valid entry.
+        misses (int): Number of lookups that found nothing or an expired entry.
+    """
+
+    def __init__(
+        self,
+        fingerprint: str | None = None,
+        ttl: float | None = Config.RESULT_CACHE_TTL,
+    ):
+        self.fingerprint = fingerprint or parser_fingerprint()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # lookups run concurrently from the parsing threads
+        self._stats_lock = threading.Lock()
+
+    def key(self, content: bytes) -> str:
+        """
+        Get the cache key of a PDF file.
+
+        Args:
+            content (bytes): The PDF file content.
+
+        Returns:
+            str: The key, made of the parser fingerprint and of the content hash.
+        """
+        return f"{self.fingerprint}-{content_hash(content)}"
+
+    def get(self, key: str) -> ResumeParsingResponse | None:
+        """
+        Look up a parsed resume.
+
+        Args:
+            key (str): The key of the PDF file.
+
+        Returns:
+            ResumeParsingResponse | None: A copy of the stored response, None if not found.
+        """
+        try:
+            value = self._read(key)
+        except (OSError, sqlite3.Error) as e:
+            logging.error(f"Failed to read the results cache : {e}")
+            value = None
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if value is None else ResumeParsingResponse.parse_raw(value)
+
+    def set(self, key: str, response: ResumeParsingResponse) -> None:
+        """
+        Store a parsed resume.
+
+        Args:
+            key (str): The key of the PDF file.
+            response (ResumeParsingResponse): The parsed resume.
+        """
+        try:
+            self._write(key, response.json())
+        except (OSError, sqlite3.Error) as e:
+            logging.error(f"Failed to write the results cache : {e}")
+
+    def stats(self) -> dict[str, float]:
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    @abc.abstractmethod
+    def _read(self, key: str) -> str | None:
+        """The stored JSON response of a key, None if not found or expired."""
+
+    @abc.abstractmethod
+    def _write(self, key: str, value: str) -> None:
+        """Store the JSON response of a key."""
+
+
+class MemoryResultCache(ResultCache):
+    """A bounded in-memory LRU cache of parsed resumes, private to the process."""
+
+    def __init__(
+        self,
+        max_size: int = Config.RESULT_CACHE_SIZE,
+        fingerprint: str | None = None,
+        ttl: float | None = Config.RESULT_CACHE_TTL,
+    ):
+        super().__init__(fingerprint, ttl)
+        self.cache = LRUCache(max_size, ttl=ttl)
+
+    def _read(self, key: str) -> str | None:
+        return self.cache.get(key)
+
+    def _write(self, key: str, value: str) -> None:
+        self.cache.set(key, value)
+
+
+class SQLiteResultCache(ResultCache):
+    """A cache of parsed resumes in a local SQLite database, shared by processes."""
+
+    def __init__(
+        self,
+        path: str = Config.RESULT_CACHE_PATH,
+        fingerprint: str | None = None,
+        ttl: float | None = Config.RESULT_CACHE_TTL,
+    ):
+        super().__init__(fingerprint, ttl)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results"
+                " (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _read(self, key: str) -> str | None:
+        min_created_at = time.time() - self.ttl if self.ttl else 0.0
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM results WHERE key = ? AND created_at >= ?",
+                (key, min_created_at),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, key: str, value: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+
+
+class DirectoryResultCache(ResultCache):
+    """A cache of parsed resumes as JSON files in a directory, shared by processes."""
+
+    def __init__(
+        self,
+        directory: str = Config.RESULT_CACHE_PATH,
+        fingerprint: str | None = None,
+        ttl: float | None = Config.RESULT_CACHE_TTL,
+    ):
+        super().__init__(fingerprint, ttl)
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        # the content hash spreads the files over 256 subdirectories
+        return os.path.join(self.directory, key[-2:], f"{key}.json")
+
+    def _read(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            if self.ttl and os.path.getmtime(path) < time.time() - self.ttl:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, value: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+
+RESULT_CACHE_BACKENDS: dict[str, type[ResultCache]] = {
+    "memory": MemoryResultCache,
+    "sqlite": SQLiteResultCache,
+    "directory": DirectoryResultCache,
+}
+
+
+def get_result_cache(
+    backend: str | None = Config.RESULT_CACHE_BACKEND,
+) -> ResultCache | None:
+    """
+    Create the parsed resumes cache configured in Config.
+
+    Args:
+        backend (str | None, optional): "memory", "sqlite", "directory", or None to disable it.
+
+    Returns:
+        ResultCache | None: The cache, None if disabled.
+    """
+    if backend is None:
+        return None
+    if backend not in RESULT_CACHE_BACKENDS:
+        raise ValueError(
+            f"Unknown results cache backend {backend!r}, expected one of {list(RESULT_CACHE_BACKENDS)}"
+        )
+    return RESULT_CACHE_BACKENDS[backend]()
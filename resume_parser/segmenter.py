@@ -1,11 +1,284 @@
 import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from collections.abc import Mapping
 from fuzzywuzzy import fuzz, process
 
+from config import Config
 from utils import get_next_value
 from headers import Headers
 
 
+@dataclass(frozen=True)
+class Segment:
+    """
+    A section of a resume, as offsets over the resume text.
+
+    Attributes:
+        name (str): The section name, one of `Headers.HEADERS`.
+        start (int): The start offset of the section in the resume text.
+        end (int): The end offset of the section in the resume text.
+        lines (range): The indexes of the resume lines overlapping the section.
+    """
+
+    name: str
+    start: int
+    end: int
+    lines: range
+
+    def __bool__(self) -> bool:
+        return self.end > self.start
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def contains_line(self, line_idx: int) -> bool:
+        """Whether a resume line overlaps the section."""
+        return line_idx in self.lines
+
+    def contains_span(self, start: int, end: int) -> bool:
+        """Whether a span of the resume text lies within the section."""
+        return self.start <= start and end <= self.end
+
+
+class SegmentMap(Mapping):
+    """
+    The sections of a resume, over a single shared text.
+
+    It reads like the former dict of sections texts: `segments.get("skills", "")`
+    slices the text of a section on access, while `segments.segment("skills")`
+    gives its offsets and line range without copying anything.
+
+    Attributes:
+        text (str): The resume text, its lines joined by spaces.
+        segments (dict[str, Segment]): The sections, by name.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        spans: dict[str, tuple[int, int]],
+        line_starts: list[int] | None = None,
+    ):
+        self.text = text
+        # a text given without its lines is a single line
+        self._line_starts = line_starts or [0]
+        self.segments = {
+            name: Segment(name, start, end, self._line_range(start, end))
+            for name, (start, end) in spans.items()
+        }
+
+    def _line_of(self, offset: int) -> int:
+        return bisect_right(self._line_starts, offset) - 1
+
+    def _line_range(self, start: int, end: int) -> range:
+        if end <= start:
+            return range(self._line_of(start), self._line_of(start))
+        return range(self._line_of(start), self._line_of(end - 1) + 1)
+
+    def __getitem__(self, name: str) -> str:
+        segment = self.segments[name]
+        return self.text[segment.start : segment.end]
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def segment(self, name: str) -> Segment:
+        """
+        Get the offsets and line range of a section.
+
+        Args:
+            name (str): The section name.
+
+        Returns:
+            Segment: The section, empty if the name is unknown.
+        """
+        if (segment := self.segments.get(name)) is None:
+            return Segment(name, 0, 0, range(0))
+        return segment
+
+    def head(self, name: str, max_lines: int | None = None) -> str:
+        """
+        Get the text of the first lines of a section.
+
+        Args:
+            name (str): The section name.
+            max_lines (int | None, optional): Lines after the first ones are left out,
+                None to get the whole section.
+
+        Returns:
+            str: The text of the section start, empty if the name is unknown.
+        """
+        segment = self.segment(name)
+        end = segment.end
+        if max_lines is not None and len(segment.lines) > max_lines:
+            # the line after the last one kept starts after its joining space
+            end = min(end, self._line_starts[segment.lines.start + max_lines] - 1)
+        return self.text[segment.start : end]
+
+
+def line_starts_of(lines: list[str]) -> list[int]:
+    """
+    Get the offset of each line in the lines joined by spaces.
+
+    Args:
+        lines (list[str]): The lines.
+
+    Returns:
+        list[int]: The start offsets.
+    """
+    starts, offset = [], 0
+    for line in lines:
+        starts.append(offset)
+        offset += len(line) + 1
+    return starts
+
+
+# a header is a short column of a line, or the short text before a colon
+MAX_HEADER_WORDS = 5
+MAX_HEADER_LENGTH = 40
+# minimal share of words in common between a header and a keyword, also the score of
+# a header starting with a keyword, like "skills & tools"
+MIN_HEADER_SCORE = 0.8
+RE_COLUMN_GAP = re.compile(r"\s{3,}")
+RE_NON_LETTERS = re.compile(r"[^a-z]+")
+
+
+def normalize_header(text: str) -> str:
+    """Lowercase a header and keep only its words, e.g. "WORK EXPERIENCE :" -> "work experience"."""
+    return " ".join(RE_NON_LETTERS.split(text.lower())).strip()
+
+
+class HeaderIndex:
+    """
+    The header keywords of every resume section, indexed for lookups of candidate header lines.
+
+    Attributes:
+        keywords (dict[str, str]): The section name of each normalized keyword.
+        keywords_by_word (dict[str, list[tuple[frozenset[str], str]]]): The words and section
+            name of the keywords holding each word.
+    """
+
+    def __init__(self, headers: dict[str, tuple[str]] = Headers.HEADERS):
+        self.keywords, self.keywords_by_word = {}, {}
+        for header_title, header_keywords in headers.items():
+            for keyword in header_keywords:
+                keyword = normalize_header(keyword)
+                if keyword in self.keywords:
+                    continue
+                self.keywords[keyword] = header_title
+                words = frozenset(keyword.split())
+                for word in words:
+                    self.keywords_by_word.setdefault(word, []).append(
+                        (words, header_title)
+                    )
+
+    def match(self, candidate: str) -> tuple[str, float] | None:
+        """
+        Score a candidate header against the keywords.
+
+        Args:
+            candidate (str): A normalized candidate header.
+
+        Returns:
+            tuple[str, float] | None: The section name and the score (1.0 for a keyword),
+                None if no keyword scores at least MIN_HEADER_SCORE.
+        """
+        if (header_title := self.keywords.get(candidate)) is not None:
+            return header_title, 1.0
+
+        # the longest keyword the header starts with, for headers like "experience selected"
+        best_match = None
+        candidate_words = candidate.split()
+        for prefix_length in range(len(candidate_words) - 1, 0, -1):
+            prefix = " ".join(candidate_words[:prefix_length])
+            if (header_title := self.keywords.get(prefix)) is not None:
+                best_match = header_title, MIN_HEADER_SCORE
+                break
+
+        # share of words in common, for headers like "technical skills summary"
+        words = frozenset(candidate_words)
+        for word in words:
+            for keyword_words, header_title in self.keywords_by_word.get(word, ()):
+                score = (
+                    2 * len(words & keyword_words) / (len(words) + len(keyword_words))
+                )
+                if score >= MIN_HEADER_SCORE and (
+                    best_match is None or score > best_match[1]
+                ):
+                    best_match = header_title, score
+        return best_match
+
+
+def header_casing_score(text: str) -> int:
+    """Rank how header-like a text is written, "SKILLS" or "Skills:" over "Skills" over "skills"."""
+    if text.isupper() or text.endswith(":"):
+        return 2
+    return 1 if text[:1].isupper() else 0
+
+
+def candidate_headers(line: str) -> list[tuple[int, str]]:
+    """
+    Cut the header-like texts of a line: its short columns, or its short text before a colon.
+
+    Args:
+        line (str): A resume line.
+
+    Returns:
+        list[tuple[int, str]]: The offset of each candidate in the line, and the candidate.
+    """
+    candidates, column_start = [], 0
+    for gap in (*RE_COLUMN_GAP.finditer(line), None):
+        column_end = gap.start() if gap else len(line)
+        column = line[column_start:column_end]
+        if (colon := column.find(":")) > 0:
+            column = column[: colon + 1]
+        if (
+            column
+            and len(column) <= MAX_HEADER_LENGTH
+            and len(column.split()) <= MAX_HEADER_WORDS
+            and not any(char.isdigit() or char == "@" for char in column)
+        ):
+            candidates.append((column_start, column))
+        if gap:
+            column_start = gap.end()
+    return candidates
+
+
+# built once, shared by all segmenters
+HEADER_INDEX = HeaderIndex()
+
+
+def strip_span(text: str, start: int, end: int) -> tuple[int, int]:
+    """Narrow a span of a text like `str.strip` would, without slicing it."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
 class TextSegmenter:
+    """
+    Segment resumes into sections, from their headers.
+
+    Attributes:
+        strategy (str): "lines" looks up the header-like lines of the resume in a keyword index,
+            "fuzzy" scores the whole text against every header keyword.
+        header_index (HeaderIndex): The keywords index of the "lines" strategy.
+    """
+
+    def __init__(
+        self,
+        strategy: str = Config.SEGMENTER_STRATEGY,
+        header_index: HeaderIndex = HEADER_INDEX,
+    ):
+        self.strategy = strategy
+        self.header_index = header_index
+
     def find_best_match(self, text: str, search_phrases: tuple[str]) -> int:
         """
         Find the best match for a given text among the provided search phrases.
@@ -27,35 +300,93 @@ class TextSegmenter:
         else:
             return -1
 
-    def segmenter(self, text: str) -> dict[str, str]:
+    def find_headers_fuzzy(self, text: str) -> dict[str, int]:
         """
-        Segment the input text into sections based on provided headers.
+        Find the start of each section, from the best fuzzy match of its keywords in the text.
 
         Args:
-            text (str): The input text to segment.
-            headers (Dict[str, List[str]]): A dictionary of header titles and their corresponding keywords.
+            text (str): The input text.
 
         Returns:
-            Dict[str, str]: A dictionary containing the segmented sections of the input text.
+            dict[str, int]: The start offset of each section, 0 if not found.
         """
-
         searchable_text = text.lower()
-
         indexes = {k: 0 for k, _ in Headers.HEADERS.items()}
-        segments = {k: "" for k, _ in Headers.HEADERS.items()}
 
-        # Find starting indexes
         for header_title, header_keywords in Headers.HEADERS.items():
             if header_keywords:
                 start_idx = self.find_best_match(searchable_text, header_keywords)
                 if start_idx > 0:
                     indexes[header_title] = start_idx
 
+        return indexes
+
+    def find_headers_in_lines(
+        self, text: str, line_starts: list[int]
+    ) -> dict[str, int]:
+        """
+        Find the start of each section, from the header-like lines found in the keywords index.
+
+        Only short line columns without digits are scored, in a single pass. When a section
+        has several headers, the closest to a keyword wins, then the most header-like
+        written, then the first.
+
+        Args:
+            text (str): The input text, its lines joined by spaces.
+            line_starts (list[int]): The offset of each line in the text.
+
+        Returns:
+            dict[str, int]: The start offset of each section, 0 if not found.
+        """
+        best_headers = {}
+        line_ends = [*(start - 1 for start in line_starts[1:]), len(text)]
+        # the first line is the name of the candidate
+        for line_start, line_end in zip(line_starts[1:], line_ends[1:]):
+            for offset, candidate in candidate_headers(text[line_start:line_end]):
+                if (
+                    match := self.header_index.match(normalize_header(candidate))
+                ) is None:
+                    continue
+                header_title, score = match
+                rank = (score, header_casing_score(candidate), -(line_start + offset))
+                if (
+                    header_title not in best_headers
+                    or rank > best_headers[header_title]
+                ):
+                    best_headers[header_title] = rank
+
+        indexes = {k: 0 for k, _ in Headers.HEADERS.items()}
+        for header_title, (_, _, start_idx) in best_headers.items():
+            indexes[header_title] = -start_idx
+        return indexes
+
+    def segmenter(self, text: str, line_starts: list[int] | None = None) -> SegmentMap:
+        """
+        Segment the input text into sections based on provided headers.
+
+        Args:
+            text (str): The input text to segment.
+            line_starts (list[int], optional): The offset of each line in the text,
+                to give the line range of each section. Without it, the "fuzzy" strategy is used.
+
+        Returns:
+            SegmentMap: The sections of the input text.
+        """
+        # Find starting indexes
+        if self.strategy == "lines" and line_starts is not None:
+            indexes = self.find_headers_in_lines(text, line_starts)
+        else:
+            indexes = self.find_headers_fuzzy(text)
+
+        spans = {k: (0, 0) for k, _ in Headers.HEADERS.items()}
+
         # Sort indexes
         sorted_indexes = dict(sorted(indexes.items(), key=lambda item: item[1]))
 
-        # Get first and last non-null indexes
-        first_non_null_index = min([v for _, v in sorted_indexes.items() if v > 0])
+        # Get first and last non-null indexes (the whole text when no header is found)
+        first_non_null_index = min(
+            [v for _, v in sorted_indexes.items() if v > 0], default=len(text)
+        )
         last_non_null_index = max([v for _, v in sorted_indexes.items()])
 
         # Find consecutive segments (assuming there are not overlapping between each other)
@@ -65,19 +396,31 @@ class TextSegmenter:
                     next_index = sorted_indexes[
                         get_next_value(sorted_indexes, header_title)
                     ]
-                    segments[header_title] = text[index:next_index].strip()
+                    spans[header_title] = strip_span(text, index, next_index)
                 except:
-                    segments[header_title] = text[index:].strip()
+                    spans[header_title] = strip_span(text, index, len(text))
             else:
-                segments[header_title] = text[index:].strip()
+                spans[header_title] = strip_span(text, index, len(text))
 
         # Treat special cases assuming a certain order among Resume's sections
         for segment_name in Headers.TOP_SEGMENTS:
             if indexes[segment_name] == 0:
-                segments[segment_name] = text[:first_non_null_index].strip()
+                spans[segment_name] = strip_span(text, 0, first_non_null_index)
 
         for segment_name in Headers.BOTTOM_SEGMENTS:
             if indexes[segment_name] == 0:
-                segments[segment_name] = text[last_non_null_index:].strip()
+                spans[segment_name] = strip_span(text, last_non_null_index, len(text))
+
+        return SegmentMap(text, spans, line_starts)
 
-        return segments
+    def segment_lines(self, lines: list[str]) -> SegmentMap:
+        """
+        Segment the lines of a resume into sections, over the lines joined by spaces.
+
+        Args:
+            lines (list[str]): The resume lines.
+
+        Returns:
+            SegmentMap: The sections, with the range of lines of each.
+        """
+        return self.segmenter(" ".join(lines), line_starts_of(lines))
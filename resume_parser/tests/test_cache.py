@@ -0,0 +1,49 @@
+import os
+import time
+
+from cache import LRUCache
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b", "missing") == "missing"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    cache = LRUCache(2, ttl=10)
+    cache.set("a", 1)
+
+    now = time.time()
+    monkeypatch.setattr("cache.time.time", lambda: now + 11)
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1 and len(cache) == 0
+
+
+def test_saved_entries_are_loaded(tmp_path):
+    path = str(tmp_path / "cache.pkl")
+    cache = LRUCache(10)
+    for i in range(5):
+        cache.set(i, i * i)
+    cache.save(path)
+
+    assert os.listdir(tmp_path) == ["cache.pkl"]
+    assert LRUCache(10, persistence_path=path).get(4) == 16
+    # the most recent entries only
+    assert sorted(LRUCache(2, persistence_path=path)._entries) == [3, 4]
+
+
+def test_cache_of_size_zero_loads_nothing(tmp_path):
+    path = str(tmp_path / "cache.pkl")
+    cache = LRUCache(10)
+    cache.set("a", 1)
+    cache.save(path)
+
+    assert len(LRUCache(0, persistence_path=path)) == 0
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from dates import DateIndex
+from segmenter import Segment
+
+TODAY = datetime(2024, 6, 15)
+
+
+def test_month_names_and_years_are_normalized():
+    index = DateIndex(["Engineer Jan 2020 - March 2022", "Intern 2019"], today=TODAY)
+
+    assert [(mention.text, mention.date) for mention in index.mentions] == [
+        ("Jan 2020", "01/2020"),
+        ("March 2022", "03/2022"),
+        ("2019", "06/2019"),
+    ]
+
+
+def test_lines_with_two_dates_are_paired():
+    index = DateIndex(["Engineer 01/2020 - present", "Intern 2019"], today=TODAY)
+
+    assert [(start.date, end.date) for start, end in index.pairs] == [
+        ("01/2020", "06/2024")
+    ]
+
+
+def test_words_starting_like_months_are_not_dates():
+    index = DateIndex(["Marketing 2020 Decision 2021"], today=TODAY)
+
+    assert [mention.text for mention in index.mentions] == ["2020", "2021"]
+
+
+def test_unparseable_dates_are_skipped_before_pairing():
+    index = DateIndex(["Engineer 31/02/2020 01/2021 - 03/2022"], today=TODAY)
+
+    assert [(start.date, end.date) for start, end in index.pairs] == [
+        ("01/2021", "03/2022")
+    ]
+
+
+def test_dates_are_selected_by_segment():
+    lines = ["Experience", "Engineer 01/2020 - 03/2022", "Education", "MSc 2015 2017"]
+    index = DateIndex(lines, today=TODAY)
+    start = index.full_text.index("Education")
+    education = Segment("education", start, len(index.full_text), range(2, 4))
+
+    assert index.dates_for_segment(education) == [(("06/2015", 3), ("06/2017", 3))]
+    assert index.dates_for_segment("Engineer 01/2020 - 03/2022") == [
+        (("01/2020", 1), ("03/2022", 1))
+    ]
+    assert index.dates_for_segment("") == []
@@ -0,0 +1,31 @@
+import math
+import time
+
+from deadlines import Deadline
+
+
+def test_unbounded_deadline_never_expires():
+    deadline = Deadline()
+
+    assert not deadline.bounded
+    assert deadline.remaining() == math.inf
+    assert not deadline.expired() and not deadline.exceeded
+
+
+def test_expired_deadline_is_exceeded():
+    deadline = Deadline(0)
+
+    assert deadline.remaining() == 0.0
+    assert deadline.expired() and deadline.exceeded
+
+
+def test_stage_deadline_is_bounded_by_its_parent():
+    parent = Deadline(0.05)
+
+    stage = parent.sub(10)
+    assert stage.expires_at == parent.expires_at
+    assert parent.sub(None).expires_at == parent.expires_at
+    assert parent.sub(0.01).expires_at < parent.expires_at
+
+    time.sleep(0.06)
+    assert stage.expired() and not parent.exceeded
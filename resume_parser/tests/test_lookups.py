@@ -0,0 +1,43 @@
+from lookups import LanguageIndex
+
+LANGUAGES = {
+    "English": "eng",
+    "French": "fra",
+    "Greek": "ell",
+    "Ancient Greek": "grc",
+    "Even": "eve",
+    "Mba": "mfc",
+}
+
+
+def test_languages_are_found_once_in_order_of_appearance():
+    index = LanguageIndex(LANGUAGES)
+
+    found = index.find("French (native), English (fluent), French again")
+
+    assert found == [("French", "fra"), ("English", "eng")]
+
+
+def test_longest_language_name_wins():
+    index = LanguageIndex(LANGUAGES)
+
+    assert index.find("Reads Ancient Greek") == [("Ancient Greek", "grc")]
+
+
+def test_lower_case_words_are_not_languages():
+    index = LanguageIndex(LANGUAGES)
+
+    assert index.find("even english speakers") == []
+
+
+def test_acronyms_are_not_languages():
+    index = LanguageIndex(LANGUAGES)
+
+    assert index.find("MBA, INSEAD") == []
+    assert index.find("Mba speakers") == [("Mba", "mfc")]
+
+
+def test_names_are_matched_accent_and_case_folded():
+    index = LanguageIndex({"Norwegian Bokmål": "nob"})
+
+    assert index.find("Norwegian Bokmal") == [("Norwegian Bokmål", "nob")]
@@ -0,0 +1,58 @@
+import os
+
+from matchers import SkillMatcher, compile_degrees_pattern
+
+
+def test_skills_are_matched_case_insensitively_on_word_boundaries():
+    matcher = SkillMatcher(["Go", "Python", "machine learning", "C++"])
+
+    matches = matcher.find_all("Python, C++ and Machine Learning at Google")
+
+    assert [skill for _, _, skill in matches] == ["python", "c++", "machine learning"]
+
+
+def test_overlapping_skills_are_all_matched_with_their_offsets():
+    matcher = SkillMatcher(["data", "data science", "science"])
+    text = "Data Science"
+
+    matches = matcher.find_all(text)
+
+    assert sorted(matches) == [
+        (0, 4, "data"),
+        (0, 12, "data science"),
+        (5, 12, "science"),
+    ]
+    assert all(text[start:end].lower() == skill for start, end, skill in matches)
+
+
+def test_skills_are_deduplicated_and_stripped():
+    assert SkillMatcher([" SQL", "sql", "", "Sql "]).patterns == ["sql"]
+
+
+def test_automaton_is_rebuilt_when_the_skills_change(tmp_path):
+    skills_csv, automaton = tmp_path / "skills.csv", tmp_path / "skills.pkl"
+    skills_csv.write_text("python,sql\n")
+
+    matcher = SkillMatcher.load_or_build(str(skills_csv), str(automaton))
+    assert matcher.patterns == ["python", "sql"]
+    # written through a temporary file, moved over the final path
+    assert set(os.listdir(tmp_path)) == {"skills.csv", "skills.pkl"}
+
+    skills_csv.write_text("rust\n")
+    assert SkillMatcher.load_or_build(str(skills_csv), str(automaton)).patterns == [
+        "rust"
+    ]
+
+
+def test_degrees_pattern_prefers_the_longest_abbreviation():
+    pattern = compile_degrees_pattern(["MHA", "MHA-MBA", "BS", ""])
+
+    assert pattern.search("Graduated MHA-MBA in 2010").group() == "MHA-MBA"
+    assert pattern.search("MHA, 2008").group() == "MHA"
+
+
+def test_degrees_pattern_matches_whole_words_only():
+    pattern = compile_degrees_pattern(["BS", "M.Sc."])
+
+    assert pattern.search("JOBS and BSc") is None
+    assert pattern.search("M.Sc. Physics").group() == "M.Sc."
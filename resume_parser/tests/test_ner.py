@@ -0,0 +1,78 @@
+from deadlines import Deadline
+from ner import merge_entities, recognize_entities, token_offsets, window_spans
+
+TEXT = " ".join(f"word{i}" for i in range(10))
+
+
+def test_windows_overlap_and_cover_the_first_tokens():
+    spans = window_spans(
+        TEXT, token_offsets(TEXT), max_tokens=8, window_tokens=4, stride=1
+    )
+
+    assert [TEXT[start:end] for start, end in spans] == [
+        "word0 word1 word2 word3",
+        "word3 word4 word5 word6",
+        "word6 word7",
+    ]
+
+
+def test_windows_keep_words_split_into_sub_tokens_whole():
+    text = "Jean-Pierre Dupont"
+    # sub-tokens "Jean", "-", "Pierre", "Dupont"
+    offsets = [(0, 4), (4, 5), (5, 11), (12, 18)]
+
+    spans = window_spans(text, offsets, window_tokens=2, stride=0)
+
+    assert [text[start:end] for start, end in spans] == [
+        "Jean-Pierre",
+        "Jean-Pierre Dupont",
+    ]
+
+
+def test_empty_text_has_no_windows():
+    assert window_spans("", []) == []
+
+
+def test_entities_found_by_two_windows_are_merged():
+    entity = {"entity_group": "PER", "start": 0, "end": 8, "score": 0.9}
+    truncated = {"entity_group": "ORG", "start": 10, "end": 14, "score": 0.8}
+    longer = {"entity_group": "ORG", "start": 10, "end": 20, "score": 0.7}
+
+    assert merge_entities([longer, entity, truncated, dict(entity)]) == [
+        entity,
+        longer,
+    ]
+
+
+def ner_pipeline(windows, **kwargs):
+    # one entity on the first word of each window
+    return [
+        [
+            {
+                "entity_group": "PER",
+                "word": w.split()[0],
+                "start": 0,
+                "end": 5,
+                "score": 1,
+            }
+        ]
+        for w in windows
+    ]
+
+
+def test_entities_are_recognized_per_text_with_offsets_in_the_text():
+    texts = [TEXT, "Jane Doe"]
+
+    entities = recognize_entities(texts, ner_pipeline, window_tokens=4, stride=1)
+
+    assert [e["word"] for e in entities[0]] == ["word0", "word3", "word6"]
+    assert all(TEXT[e["start"] : e["end"]] == e["word"] for e in entities[0])
+    assert [e["word"] for e in entities[1]] == ["Jane"]
+
+
+def test_no_window_is_run_once_the_deadline_is_expired():
+    deadline = Deadline(0)
+
+    entities = recognize_entities([TEXT], ner_pipeline, deadline=deadline)
+
+    assert entities == [[]] and deadline.exceeded
@@ -0,0 +1,57 @@
+import pytest
+
+from parsers import Parsers
+from data_models import ContactData
+from segmenter import TextSegmenter
+
+
+def zero_shot_classifier(lines, candidate_labels, **kwargs):
+    # the first label for every line, unwrapped for a single line like the pipeline
+    results = [
+        {"sequence": line, "labels": list(candidate_labels), "scores": [1.0]}
+        for line in ([lines] if isinstance(lines, str) else lines)
+    ]
+    return results[0] if len(results) == 1 else results
+
+
+@pytest.fixture
+def parsers(monkeypatch):
+    # no gazetteer to build
+    monkeypatch.setattr(Parsers, "parse_location", lambda self, text: ("", "", ""))
+    return Parsers(prewarm=False)
+
+
+def test_contact_data_without_email_or_website(parsers):
+    contact = parsers.parse_contact_data("John Doe, Software Engineer")
+
+    assert isinstance(contact, ContactData)
+    assert contact.email == [] and contact.website == []
+
+
+def test_contact_data_with_email_and_website(parsers):
+    contact = parsers.parse_contact_data("john@doe.com - https://doe.dev")
+
+    assert [email.value for email in contact.email] == ["john@doe.com"]
+    assert contact.website == ["https://doe.dev"]
+
+
+def test_experience_dated_on_the_last_line(parsers):
+    lines = ["John Doe", "EXPERIENCE", "Acme Corp", "Engineer 01/2019 - 03/2021"]
+    segments = TextSegmenter("lines").segment_lines(lines)
+
+    experience = parsers.parse_work_experience(
+        lines, segments.segment("experience"), zero_shot_classifier
+    ).experience
+
+    assert [(e.start_date, e.end_date) for e in experience] == [("01/2019", "03/2021")]
+
+
+def test_experience_without_dates(parsers):
+    lines = ["John Doe", "EXPERIENCE", "Acme Corp"]
+    segments = TextSegmenter("lines").segment_lines(lines)
+
+    experience = parsers.parse_work_experience(
+        lines, segments.segment("experience"), zero_shot_classifier
+    ).experience
+
+    assert experience == []
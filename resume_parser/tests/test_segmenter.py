@@ -0,0 +1,62 @@
+import pytest
+
+from segmenter import MIN_HEADER_SCORE, HeaderIndex, TextSegmenter, candidate_headers
+
+RESUME_LINES = [
+    "John Doe",
+    "EXPERIENCE",
+    "Acme Corp 2019 2020",
+    "Skills:   Python, SQL",
+]
+
+
+def test_keywords_match_exactly():
+    assert HeaderIndex().match("work experience") == ("experience", 1.0)
+
+
+def test_headers_starting_with_a_keyword_match():
+    assert HeaderIndex().match("skills tools") == ("skills", MIN_HEADER_SCORE)
+
+
+def test_headers_sharing_most_words_with_a_keyword_match():
+    header_title, score = HeaderIndex().match("technical skills summary")
+
+    assert header_title == "skills" and MIN_HEADER_SCORE <= score < 1.0
+
+
+def test_other_titles_do_not_match():
+    assert HeaderIndex().match("software engineer") is None
+
+
+def test_candidate_headers_are_short_columns_or_texts_before_a_colon():
+    assert candidate_headers("Skills:   Python, SQL") == [
+        (0, "Skills:"),
+        (10, "Python, SQL"),
+    ]
+    assert candidate_headers("Phone: 06 12 34 56 78") == [(0, "Phone:")]
+    assert candidate_headers("john@doe.com   06 12 34 56 78") == []
+
+
+@pytest.mark.parametrize("strategy", ["lines", "fuzzy"])
+def test_resume_without_headers_is_segmented(strategy):
+    segments = TextSegmenter(strategy).segment_lines(["John Doe", "Paris"])
+
+    assert segments["headline"] == "John Doe Paris"
+    assert segments.segment("headline").lines == range(0, 2)
+
+
+def test_sections_start_at_their_headers():
+    segments = TextSegmenter("lines").segment_lines(RESUME_LINES)
+
+    assert segments["headline"] == "John Doe"
+    assert segments["experience"] == "EXPERIENCE Acme Corp 2019 2020"
+    assert segments.segment("experience").lines == range(1, 3)
+    assert segments["skills"] == "Skills:   Python, SQL"
+
+
+def test_head_keeps_the_first_lines_of_a_section():
+    segments = TextSegmenter("lines").segment_lines(RESUME_LINES)
+
+    assert segments.head("experience", 1) == "EXPERIENCE"
+    assert segments.head("experience") == segments["experience"]
+    assert segments.head("unknown") == ""
@@ -0,0 +1,30 @@
+import pytest
+
+from utils import NORMALIZERS, iter_normalized_lines
+
+TEXT = (
+    "  John\tDoe  \r\nSoftware Engineer\x0cParis, France "
+    "Développeur à Zürich\n\nab\x85Straße ŒUVRE   \r"
+)
+
+
+@pytest.mark.parametrize("mode", list(NORMALIZERS))
+def test_lines_match_normalizing_every_line(mode):
+    normalizer = NORMALIZERS[mode]
+    expected = [
+        line
+        for line in (normalizer(line.replace("\t", " ")) for line in TEXT.splitlines())
+        if len(line) > 2
+    ]
+
+    assert list(iter_normalized_lines(TEXT, mode=mode)) == expected
+
+
+@pytest.mark.parametrize("mode", list(NORMALIZERS))
+def test_ascii_fast_path_matches_the_normalizer(mode):
+    for line in ("  Software Engineer ", "C++ / C#, 5 years", "~!@#$%^&*()_+", " "):
+        assert NORMALIZERS[mode](line) == line.strip()
+
+
+def test_short_lines_are_skipped():
+    assert list(iter_normalized_lines("ab\nabc\n  x  ", min_line_length=2)) == ["abc"]
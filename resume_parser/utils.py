@@ -1,21 +1,19 @@
-import os
-import shutil
 import re
+import csv
 import random
 import logging
-import pycountry
 import unicodedata
-import pandas as pd
-import locationtagger
-from dateutil import parser
 from datetime import datetime
+from itertools import chain
+from functools import lru_cache
+from typing import Callable, Iterator
 
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 from langdetect import detect_langs
+from langdetect.lang_detect_exception import LangDetectException
 
 from config import Config
 from data_models import MetaData
+from lookups import get_country_resolver, get_gazetteer
 
 
 def normalize_string(string: str) -> str:
@@ -34,65 +32,197 @@ def normalize_string(string: str) -> str:
     return string.encode("ascii", "ignore").decode("utf-8").strip()
 
 
-def get_next_value(elements: dict, current_key: str) -> str:
+# letters their Unicode decomposition does not transliterate
+TRANSLITERATIONS: dict[str, str] = {
+    "Æ": "AE",
+    "æ": "ae",
+    "Œ": "OE",
+    "œ": "oe",
+    "Ø": "O",
+    "ø": "o",
+    "Ł": "L",
+    "ł": "l",
+    "Đ": "D",
+    "đ": "d",
+    "Ð": "D",
+    "ð": "d",
+    "Ħ": "H",
+    "ħ": "h",
+    "Þ": "Th",
+    "þ": "th",
+    "ß": "ss",
+    "ẞ": "SS",
+    "ı": "i",
+    "‘": "'",
+    "’": "'",
+    "‚": "'",
+    "“": '"',
+    "”": '"',
+    "„": '"',
+    "‐": "-",
+    "‑": "-",
+    "‒": "-",
+    "–": "-",
+    "—": "-",
+    "−": "-",
+}
+
+
+# code points with a transliteration, or deleted unless letters, marks or digits when
+# keeping other scripts : up to the CJK punctuation, the presentation, halfwidth and
+# fullwidth forms, and the emojis
+TRANSLITERATED_RANGES: tuple[range] = (
+    range(0x80, 0x3040),
+    range(0xFB00, 0x10000),
+    range(0x1F000, 0x1FB00),
+)
+
+
+@lru_cache(maxsize=None)
+def get_transliteration_table(keep_scripts: bool = False) -> dict[int, str | None]:
     """
-    Get the next value in a dictionary based on the index of the current key.
+    Build the `str.translate` table of the characters having an ASCII equivalent, once.
+
+    Latin letters lose their diacritics, ligatures, compatibility forms (fullwidth,
+    superscripts) and spaces get their ASCII compatibility decomposition, and
+    invisible formatting characters (soft hyphen, zero width spaces) are deleted.
 
     Args:
-        elements (Dict): The input dictionary.
-        current_key (str): The current key in the dictionary.
+        keep_scripts (bool, optional): Also delete the symbols and punctuation without
+            ASCII equivalent, so that only the letters, marks and digits of other
+            scripts are left untranslated. Defaults to False.
 
     Returns:
-        str: The next value in the dictionary.
+        dict[int, str | None]: The ASCII replacement of each code point, None to delete it.
     """
-    return list(elements)[list(elements.keys()).index(current_key) + 1]
+    table = {}
+    for code_point in chain(*TRANSLITERATED_RANGES):
+        char = chr(code_point)
+        category = unicodedata.category(char)
+        decomposed = "".join(
+            c
+            for c in unicodedata.normalize("NFKD", char)
+            if not unicodedata.combining(c)
+        )
+        if category == "Cf":
+            table[code_point] = None
+        elif decomposed and decomposed.isascii():
+            table[code_point] = decomposed
+        elif keep_scripts and category[0] not in "LMN":
+            table[code_point] = None
+    table.update(
+        {ord(char): ascii_text for char, ascii_text in TRANSLITERATIONS.items()}
+    )
+    return table
 
 
-def group_elements_by_index(
-    elements: list[tuple[str, int]]
-) -> list[tuple[tuple[str, int], tuple[str, int]]]:
+def transliterate_string(string: str) -> str:
     """
-    Group elements based on their index value in the input list of tuples.
+    Normalize a given string to ASCII, transliterating Latin letters (Łukasz -> Lukasz)
+    and dropping the characters of other scripts.
 
     Args:
-        elements (List[Tuple[str, int]]): A list of tuples where the second element is an index.
+        string (str): The input string to be normalized.
 
     Returns:
-        List[Tuple[str, str]]: A list of tuples containing the grouped elements.
+        str: The normalized string.
     """
+    if string.isascii():
+        return string.strip()
+    string = string.translate(get_transliteration_table())
+    return string.encode("ascii", "ignore").decode("utf-8").strip()
+
 
-    # Create an empty dictionary to store elements based on their index
-    index_dict = {}
+def normalize_unicode_string(string: str) -> str:
+    """
+    Normalize a given string, transliterating Latin letters but keeping the letters,
+    marks and digits of other scripts (Cyrillic, CJK, Arabic...).
 
-    # Iterate through elements and group them by index
-    for element in elements:
-        index = element[1]
-        if index not in index_dict:
-            index_dict[index] = []
+    Args:
+        string (str): The input string to be normalized.
+
+    Returns:
+        str: The normalized string.
+    """
+    if string.isascii():
+        return string.strip()
+    string = unicodedata.normalize("NFC", string)
+    return string.translate(get_transliteration_table(keep_scripts=True)).strip()
+
+
+NORMALIZERS: dict[str, Callable[[str], str]] = {
+    "ascii": normalize_string,
+    "translit": transliterate_string,
+    "unicode": normalize_unicode_string,
+}
+
+
+def resolve_normalization_mode(
+    mode: str = Config.NORMALIZATION_MODE, language_code: str = ""
+) -> str:
+    """
+    Get the normalization of a resume.
+
+    Args:
+        mode (str, optional): "ascii", "translit", "unicode" or "auto".
+        language_code (str, optional): The detected language of the resume, e.g. "ru".
+
+    Returns:
+        str: The mode itself, or for "auto", "unicode" if the resume is detected in
+            a language missing from `Config.NORMALIZATION_ASCII_LANGUAGES`, else "translit".
+    """
+    if mode == "auto":
+        ascii_language = language_code in ("", *Config.NORMALIZATION_ASCII_LANGUAGES)
+        return "translit" if ascii_language else "unicode"
+    if mode not in NORMALIZERS:
+        raise ValueError(
+            f"Unknown normalization mode {mode!r}, expected one of {[*NORMALIZERS, 'auto']}"
+        )
+    return mode
+
+
+# the lines of a text, split on every boundary of str.splitlines
+RE_LINES = re.compile(r"[^\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]+")
+
+
+def iter_normalized_lines(
+    text: str, min_line_length: int = 2, mode: str = "translit"
+) -> Iterator[str]:
+    """
+    Split a text into normalized lines, in a single pass.
+
+    Tabs become spaces and each line goes through the normalizer of the mode, except
+    ASCII lines which it would leave unchanged but stripped, so they skip the Unicode
+    handling.
+
+    Args:
+        text (str): The input text.
+        min_line_length (int, optional): Shorter or equal lines are skipped. Defaults to 2.
+        mode (str, optional): "ascii", "translit" or "unicode", see `NORMALIZERS`.
 
-        index_dict[index].append(element)
+    Yields:
+        str: The normalized lines.
+    """
+    normalizer = NORMALIZERS[mode]
+    for match in RE_LINES.finditer(text):
+        line = match.group().replace("\t", " ")
+        line = line.strip() if line.isascii() else normalizer(line)
+        if len(line) > min_line_length:
+            yield line
 
-    # Return grouped elements as a list of tuples
-    return [tuple(pair) for pair in index_dict.values() if len(pair) == 2]
 
+def get_next_value(elements: dict, current_key: str) -> str:
+    """
+    Get the next value in a dictionary based on the index of the current key.
 
-def filter_dates_for_a_segment(text, groups_of_dates):
-    selected_dates = []
-    for dates in groups_of_dates:
-        try:
-            date_start = parser.parse(dates[0][0], dayfirst=True)
-            date_end = parser.parse(dates[1][0], dayfirst=True)
-            if dates[0][0] in text or dates[1][0] in text:
-                selected_dates.append(
-                    (
-                        (date_start.strftime("%m/%Y"), dates[0][1]),
-                        (date_end.strftime("%m/%Y"), dates[1][1]),
-                    )
-                )
-        except ValueError:
-            pass  # Skip if parsing failed
+    Args:
+        elements (Dict): The input dictionary.
+        current_key (str): The current key in the dictionary.
 
-    return selected_dates
+    Returns:
+        str: The next value in the dictionary.
+    """
+    return list(elements)[list(elements.keys()).index(current_key) + 1]
 
 
 def get_max_element(lines, keywords):
@@ -101,16 +231,15 @@ def get_max_element(lines, keywords):
 
 
 def get_country_code(country_name):
-    if country_name:
-        country2code = {
-            country.name: country.alpha_2 for country in pycountry.countries
-        }
-        return country2code.get(country_name)
-    else:
-        return ""
+    return get_country_resolver().alpha_2(country_name)
+
+
+def find_location_entities(text_input, resolver=Config.LOCATION_RESOLVER):
+    if resolver == "gazetteer":
+        return get_gazetteer().find_locations(text_input)
 
+    import locationtagger
 
-def find_location_entities(text_input):
     # keyword text is necessary here ! (otherwise URL as input)
     return locationtagger.find_locations(text=text_input)
 
@@ -153,14 +282,26 @@ def merge_doubled_words(text: str) -> str:
 def read_csv_list(file_path):
     result = []
     try:
-        df = pd.read_csv(file_path)
-        return list(df.columns.values)
+        # the resources CSVs hold their list on a single row
+        with open(file_path, encoding="utf-8", newline="") as f:
+            return next(csv.reader(f), result)
     except Exception as e:
         logging.error(f"Failed to load file {file_path} : {e}")
         return result
 
 
-def filter_stopwords(txt, stopwords=set(stopwords.words(Config.USED_LANGUAGE))):
+@lru_cache(maxsize=None)
+def get_stopwords(language=Config.USED_LANGUAGE):
+    # nltk is slow to import, so it is only loaded on first use
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words(language))
+
+
+def filter_stopwords(txt, stopwords=None):
+    from nltk.tokenize import word_tokenize
+
+    stopwords = get_stopwords() if stopwords is None else stopwords
     word_tokens = word_tokenize(txt)
     filtered_sentence = [w for w in word_tokens if not w.lower() in stopwords]
     return " ".join(filtered_sentence)
@@ -181,41 +322,51 @@ def get_gender_from_firstname(detector, first_name):
     return detector.get_gender(first_name) if first_name else ""
 
 
+def detect_language(text: str) -> tuple[str, float]:
+    """
+    Detect the language of a text.
+
+    Args:
+        text (str): The input text.
+
+    Returns:
+        tuple[str, float]: The most probable language code and its probability,
+            ("", 0.0) if the text has no letters to detect it from.
+    """
+    try:
+        if text and (langs := detect_langs(text)):
+            return langs[0].lang, langs[0].prob
+    except LangDetectException:
+        pass
+    return "", 0.0
+
+
+def generate_primary_keys() -> dict[str, int]:
+    """Generate new primary keys for the job, resume and candidate of a response."""
+    return {
+        "job_pk": random.getrandbits(16),
+        "resume_pk": random.getrandbits(16),
+        "candidate_pk": random.getrandbits(16),
+    }
+
+
 def generate_metadata(
-    text, remark=Config.MESSAGE_COMPLETED, status=Config.MESSAGE_STATUS_SUCCESS
+    text,
+    remark=Config.MESSAGE_COMPLETED,
+    status=Config.MESSAGE_STATUS_SUCCESS,
+    file_name="",
+    language=None,
 ):
-    # Generate primary keys for job, resume and candidate
-    job_pk = random.getrandbits(16)
-    resume_pk = random.getrandbits(16)
-    candidate_pk = random.getrandbits(16)
-    language_code, language_confidence = "", 0.0
-
-    if text:
-        detected_languages = langs[0] if (langs := detect_langs(text)) else ""
-        language_code = detected_languages.lang
-        language_confidence = detected_languages.prob
+    # the language may already be detected, e.g. to normalize the text
+    language_code, language_confidence = (
+        language if language and language[0] else detect_language(text)
+    )
 
     return MetaData(
-        job_pk=job_pk,
+        **generate_primary_keys(),
         remark=remark,
         status=status,
-        resume_pk=resume_pk,
-        candidate_pk=candidate_pk,
+        file_name=file_name,
         language_code=language_code,
         language_confidence=language_confidence,
     )
-
-
-def cleaning_and_creating_tree(
-    input_directory_path,
-):
-    """
-    Deletes the existing input directory and creates new empty one
-    Args:
-        input_directory_path (str): where the input file is stored
-    """
-
-    # Deleting the input directory if it exists, and creating a new one
-    if os.path.isdir(input_directory_path):
-        shutil.rmtree(input_directory_path)
-    os.mkdir(input_directory_path)
@@ -0,0 +1,182 @@
+import os
+import glob
+import atexit
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator
+
+from config import Config
+from metrics import run_traced
+
+logging.basicConfig(
+    format="%(levelname)s : %(funcName)s : %(message)s", level=logging.INFO
+)
+
+# the resume parsing pipeline of the current worker process
+_resume_parser = None
+
+
+def physical_core_cpus() -> list[int]:
+    """
+    List one logical CPU per physical core, among the CPUs this process may run on.
+
+    Returns:
+        list[int]: The first logical CPU id of each physical core.
+    """
+    allowed_cpus = (
+        sorted(os.sched_getaffinity(0))
+        if hasattr(os, "sched_getaffinity")
+        else list(range(os.cpu_count() or 1))
+    )
+    cores = {}
+    for cpu in allowed_cpus:
+        siblings_paths = glob.glob(
+            f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
+        )
+        try:
+            with open(siblings_paths[0]) as f:
+                siblings = f.read().strip()
+        except (IndexError, OSError):
+            siblings = str(cpu)
+        cores.setdefault(siblings, cpu)
+
+    return sorted(cores.values())
+
+
+def init_worker(cpus: list[int], workers: int, worker_counter, pin_cpus: bool):
+    """
+    Load the models once in a new worker process.
+
+    Each worker gets an equal share of the physical cores, and uses as many
+    ONNX Runtime intra-op threads, so that workers don't oversubscribe the machine.
+
+    Args:
+        cpus (list[int]): One logical CPU per physical core of the machine.
+        workers (int): The number of worker processes.
+        worker_counter (multiprocessing.Value): Shared counter numbering the workers.
+        pin_cpus (bool): Whether to pin the worker to its share of the cores.
+    """
+    global _resume_parser
+
+    with worker_counter.get_lock():
+        worker_idx = worker_counter.value
+        worker_counter.value += 1
+
+    cores_per_worker = max(len(cpus) // workers, 1)
+    first_cpu = (worker_idx * cores_per_worker) % len(cpus)
+    worker_cpus = cpus[first_cpu : first_cpu + cores_per_worker]
+    if pin_cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, worker_cpus)
+
+    # must be set before the heavy imports below
+    os.environ["OMP_NUM_THREADS"] = str(cores_per_worker)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    from models import Models
+    from pipeline import ResumeParser
+    from reader import Reader
+
+    models = Models(
+        intra_op_num_threads=cores_per_worker,
+        inter_op_num_threads=1,
+    )
+    # the workers already share the cores, no process pool of their own per worker
+    extraction_mode = Config.PDF_EXTRACTION_MODE
+    if extraction_mode == "processes":
+        logging.warning(
+            "PDF extraction in processes is not available in workers, using threads"
+        )
+        extraction_mode = "threads"
+    _resume_parser = ResumeParser(models, reader=Reader(extraction_mode))
+    if Config.WARMUP_ON_STARTUP:
+        _resume_parser.warmup()
+    atexit.register(models.save_caches)
+    logging.info(
+        f"Worker {worker_idx} ready on CPUs {worker_cpus} with {cores_per_worker} ONNX Runtime threads"
+    )
+
+
+def parse_pdf_job(pdf_bytes: bytes, file_name: str = "", deadline=None):
+    """
+    Parse a PDF resume in a worker process, returning the response and its StageTrace.
+
+    The deadline of the request, if given, keeps counting the time spent waiting for a
+    worker, `time.monotonic()` being shared by the processes of a machine.
+    """
+    return run_traced(
+        _resume_parser.parse_pdf, pdf_bytes, file_name=file_name, deadline=deadline
+    )
+
+
+def parse_pdfs_job(documents: list[tuple[str, bytes]]) -> list:
+    """
+    Parse several PDF resumes in a worker process, their headlines batched through the
+    NER model, returning the responses and their StageTraces in input order.
+    """
+    from batch import BatchParser
+
+    return list(BatchParser(_resume_parser).parse_traced(documents))
+
+
+def create_worker_pool(
+    workers: int | None = Config.WORKER_PROCESSES,
+    pin_cpus: bool = Config.WORKER_CPU_AFFINITY,
+) -> ProcessPoolExecutor:
+    """
+    Create a pool of worker processes, each loading the models once.
+
+    Args:
+        workers (int, optional): The number of workers. Defaults to the number of physical cores.
+        pin_cpus (bool, optional): Whether to pin each worker to its share of the cores.
+
+    Returns:
+        ProcessPoolExecutor: The worker pool, to submit `parse_pdf_job` to.
+    """
+    cpus = physical_core_cpus()
+    workers = workers or len(cpus)
+    # spawn, as forking a process with loaded ONNX Runtime sessions is unsafe
+    context = multiprocessing.get_context("spawn")
+    logging.info(f"Starting {workers} worker processes over {len(cpus)} cores")
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(cpus, workers, context.Value("i", 0), pin_cpus),
+    )
+
+
+def iter_parsed(
+    executor: Executor,
+    parse_pdfs,
+    documents: list[tuple[str, bytes]],
+    chunk_size: int,
+    window: int,
+) -> Iterator:
+    """
+    Parse chunks of documents concurrently in an executor, yielding the responses in
+    input order.
+
+    Args:
+        executor (Executor): The executor running the parsing jobs.
+        parse_pdfs (Callable): The parsing job, taking a list of file names and PDF
+            contents, and returning the responses and their StageTraces.
+        documents (list[tuple[str, bytes]]): File names and PDF contents.
+        chunk_size (int): Maximum number of documents parsed by a single job.
+        window (int): Maximum number of jobs submitted ahead of the yielded one.
+
+    Yields:
+        tuple[ResumeParsingResponse, StageTrace]: The parsed resumes and their traces, in input order.
+    """
+    pending = deque()
+    for start in range(0, len(documents), chunk_size):
+        pending.append(
+            executor.submit(parse_pdfs, documents[start : start + chunk_size])
+        )
+        if len(pending) > window:
+            yield from pending.popleft().result()
+
+    while pending:
+        yield from pending.popleft().result()